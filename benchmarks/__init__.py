@@ -0,0 +1,5 @@
+"""
+Rough benchmarks, run from the repo root with e.g.
+
+    python -m benchmarks.bench_fingerprints
+"""
@@ -0,0 +1,37 @@
+from __future__ import annotations
+from dataclasses import make_dataclass
+from time import perf_counter
+from typing import Any, Callable, Collection
+
+from tracer import PathsOf, Tracer, _, copy, disjunction
+
+
+def wide_record(fields: int) -> type[Any]:
+    """`Flat` from `tests/test_flat_to_tree.py`, but with `fields` fields"""
+    return make_dataclass(
+        f"Wide{fields}", [(f"f{n}", str) for n in range(fields)], frozen=True
+    )
+
+
+def wide_flat_to_flat(fields: int) -> tuple[type[Any], Tracer[Any, Any]]:
+    """
+    A `flat_to_tree`-style `disjunction` with one `copy` member per field,
+    each copying field `n` of every element to field `n + 1`
+    """
+    record = wide_record(fields)
+    return record, disjunction(
+        *(
+            copy(
+                PathsOf(Collection[record]).eg([_, f"f{n}"]),
+                PathsOf(Collection[record]).eg([_, f"f{(n + 1) % fields}"]),
+            )
+            for n in range(fields)
+        )
+    )
+
+
+def timed[T](f: Callable[[], T], repeat: int = 1) -> tuple[T, float]:
+    start = perf_counter()
+    for __ in range(repeat):
+        result = f()
+    return result, (perf_counter() - start) / repeat
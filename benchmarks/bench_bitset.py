@@ -0,0 +1,80 @@
+"""
+`covers`, `extends`, `merge` and `extract` between thousands of selections
+of `flat_to_tree`'s `A`, as trees and as `Bitset`s (converted once, up
+front)
+"""
+
+from __future__ import annotations
+import random
+import sys
+from typing import Any
+
+from tracer import PathsOf, _
+from tracer.cache import clear_caches
+
+from tests.test_flat_to_tree import A
+
+from ._workloads import timed
+
+PATHS = [
+    ["a", _, "key"],
+    ["a", _, "value", "b", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "value", "d", _],
+]
+
+
+def main(selections: int = 300):
+    random.seed(0)
+
+    def selection() -> PathsOf[Any]:
+        return PathsOf(A).merge(
+            *(
+                PathsOf(A).eg(path[: random.randint(1, len(path))])
+                for path in random.sample(PATHS, random.randint(1, len(PATHS)))
+            ),
+            merge_wildcards=True,
+        )
+
+    trees = [selection() for __ in range(selections)]
+    bitsets, seconds = timed(lambda: [tree.bitset for tree in trees])
+    print(f"{selections:,} selections to Bitsets: {seconds * 1000:.1f}ms")
+    pairs = [(a, b) for a in trees for b in trees]
+    bit_pairs = [(a, b) for a in bitsets for b in bitsets]
+    print(f"  {len(pairs):,} pairs of them:")
+
+    clear_caches()
+    expected, seconds = timed(lambda: [a.covers(b) for a, b in pairs])
+    print(f"    covers, trees: {seconds * 1000:.1f}ms")
+    found, seconds = timed(lambda: [a.covers(b) for a, b in bit_pairs])
+    print(f"    covers, Bitsets: {seconds * 1000:.1f}ms")
+    assert found == expected
+
+    clear_caches()
+    expected, seconds = timed(lambda: [a.extends(b) for a, b in pairs])
+    print(f"    extends, trees: {seconds * 1000:.1f}ms")
+    found, seconds = timed(lambda: [a.extends(b) for a, b in bit_pairs])
+    print(f"    extends, Bitsets: {seconds * 1000:.1f}ms")
+    assert found == expected
+
+    clear_caches()
+    expected, seconds = timed(
+        lambda: [a.extract(b, must_match_all=False) for a, b in pairs]
+    )
+    print(f"    extract, trees: {seconds * 1000:.1f}ms")
+    found, seconds = timed(
+        lambda: [a.extract(b, must_match_all=False) for a, b in bit_pairs]
+    )
+    print(f"    extract, Bitsets: {seconds * 1000:.1f}ms")
+    assert [s.to_paths() for s in found] == expected
+
+    clear_caches()
+    merged, seconds = timed(lambda: PathsOf(A).merge(*trees, merge_wildcards=True))
+    print(f"  merge, trees: {seconds * 1000:.1f}ms")
+    merged_bits, seconds = timed(lambda: bitsets[0].merge(*bitsets[1:]))
+    print(f"  merge, Bitsets: {seconds * 1000:.1f}ms")
+    assert merged_bits.to_paths() == merged
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,39 @@
+"""
+Building a wide node a child at a time, as `extract` does when it merges
+each single wildcard subtree into what it has so far, with `Children`
+against copying a `frozendict` every time (the threshold out of reach)
+"""
+
+from __future__ import annotations
+import gc
+import sys
+from typing import Collection
+
+from tracer import PathsOf, _
+from tracer.pathsof import children
+
+from ._workloads import timed
+
+
+def main(*widths: int):
+    threshold = children.CHILDREN_THRESHOLD
+    selection = PathsOf(Collection[str]).eg([_])
+
+    for width in widths or (1_000, 2_000, 4_000):
+        for name, children.CHILDREN_THRESHOLD in [
+            ("frozendict", sys.maxsize),
+            ("Children", threshold),
+        ]:
+            paths = PathsOf(Collection[str]).specifically(
+                tuple(f"{name}{n}" for n in range(width))
+            )
+            gc.collect()
+            extracted, seconds = timed(lambda: paths.extract(selection))
+            assert extracted == paths
+            print(f"{width:,} children, {name}: extract {seconds:.3f}s")
+
+    children.CHILDREN_THRESHOLD = threshold
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
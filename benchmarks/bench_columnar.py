@@ -0,0 +1,86 @@
+"""
+`Collection[Flat]` trees kept as `Columns` against a node per record (the
+threshold turned up out of reach): memory, live nodes, and the time to
+disassemble, extract a field, check coverage (of a selection and of
+another big collection), get the first single wildcard subtree and
+assemble
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import gc
+import sys
+import tracemalloc
+from typing import Collection
+
+from tracer import PathsOf, _
+from tracer.pathsof import columnar
+from tracer.pathsof._interning import interned_count
+from tracer.pathsof.tree_maths.single_wildcard_subtrees import (
+    single_wildcard_subtrees,
+)
+
+from ._workloads import timed
+
+
+@dataclass(frozen=True)
+class Flat:
+    a: str
+    b: str
+    c: str
+    d: str
+
+
+def main(records: int = 20_000):
+    threshold = columnar.COLUMNAR_THRESHOLD
+    selection = PathsOf(Collection[Flat]).eg([_, "c"])
+
+    for name, columnar.COLUMNAR_THRESHOLD in [
+        ("node per record", sys.maxsize),
+        ("columnar", threshold),
+    ]:
+
+        def fresh_records(run: str) -> tuple[Flat, ...]:
+            return tuple(
+                Flat(f"{name}{run}a{n}", f"{name}{run}b{n}", f"c{n % 100}", "d")
+                for n in range(records)
+            )
+
+        flats = fresh_records("memory")
+        gc.collect()
+        nodes_before = interned_count()
+        tracemalloc.start()
+        paths = PathsOf(Collection[Flat]).specifically(flats)
+        memory, __ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        nodes = interned_count() - nodes_before
+
+        flats = fresh_records("time")
+        gc.collect()
+        paths, disassembly = timed(
+            lambda: PathsOf(Collection[Flat]).specifically(flats)
+        )
+
+        __, extraction = timed(lambda: paths.extract(selection))
+        __, covering = timed(
+            lambda: paths.covers(
+                PathsOf(Collection[Flat]).eg([_, "c"], PathsOf.a("c99"))
+            )
+        )
+        some = PathsOf(Collection[Flat]).specifically(flats[: records // 2])
+        __, covering_columns = timed(lambda: paths.covers(some))
+        __, first_subtree = timed(lambda: next(single_wildcard_subtrees(paths)))
+        __, assembly = timed(lambda: PathsOf.assembled.fget(paths))
+
+        print(
+            f"{name}: {memory / records:,.0f} B/record, {nodes:,} nodes,"
+            f" disassemble {disassembly:.3f}s, extract {extraction:.3f}s,"
+            f" covers {covering:.4f}s, covers another {covering_columns:.3f}s,"
+            f" first subtree {first_subtree:.4f}s, assemble {assembly:.3f}s"
+        )
+
+    columnar.COLUMNAR_THRESHOLD = threshold
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,32 @@
+"""
+`consolidate_mapping_tree` on `flat_to_tree`'s output (already consolidated
+once, on the way out of the `disjunction`), and on it with more merged in
+"""
+
+from __future__ import annotations
+import sys
+
+from tracer import PathsOf
+from tracer.cache import clear_caches
+from tracer.pathsof.mapping import consolidate_mapping_tree
+
+from tests.test_flat_to_tree import A, Flat, flat_to_tree
+
+from ._workloads import timed
+
+
+def main(records: int = 500, repeats: int = 20):
+    flats = tuple(
+        Flat(a=f"a{n % 50}", b=f"b{n % 7}", c=f"c{n % 3}", d=f"d{n}")
+        for n in range(records)
+    )
+    tree = flat_to_tree.trace(PathsOf.an(flats))
+    more = tree.merge(PathsOf(A).eg(["a", "extra"]))
+    clear_caches()
+    for description, paths in [("as traced", tree), ("merged into", more)]:
+        __, seconds = timed(lambda: consolidate_mapping_tree(paths), repeats)
+        print(f"{records:,} records, {description}: {seconds * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,70 @@
+"""
+The recursive tree functions on deep, narrow trees: a linked list of
+`Chain`s (no wildcards) and one of `Nest`s (a wildcard every other level),
+at depths way past the recursion limit
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import sys
+from typing import Any, Callable, Collection
+
+from tracer import PathsOf
+from tracer.cache import clear_caches
+from tracer.pathsof.mapping import consolidate_mapping_tree
+
+from ._workloads import timed
+
+
+@dataclass(frozen=True)
+class Chain:
+    value: int
+    next: Chain | None
+
+
+@dataclass(frozen=True)
+class Nest:
+    value: int
+    nested: Collection[Nest]
+
+
+def chain(depth: int) -> Chain | None:
+    linked = None
+    for n in range(depth):
+        linked = Chain(n, linked)
+    return linked
+
+
+def nest(depth: int) -> Nest:
+    nested = Nest(0, ())
+    for n in range(1, depth):
+        nested = Nest(n, (nested,))
+    return nested
+
+
+def main(*depths: int):
+    for depth in depths or (100, 1_000, 10_000):
+        for t, instance in [(Chain, chain(depth)), (Nest, nest(depth))]:
+            clear_caches()
+            tree, seconds = timed(lambda: PathsOf(t).specifically(instance))
+            lower = tree.remove_lowest_level()
+            runs: list[tuple[str, Callable[[], Any]]] = [
+                ("assembled", lambda: PathsOf(t).specifically(instance).assembled),
+                ("covers", lambda: tree.covers(lower)),
+                ("merge", lambda: tree.merge(lower)),
+                ("extract", lambda: tree.extract(lower)),
+                ("remove_lowest_level", lambda: tree.remove_lowest_level()),
+                ("consolidate_mapping_tree", lambda: consolidate_mapping_tree(tree)),
+                ("eg", lambda: PathsOf(t).eg(tree.paths)),
+            ]
+            print(f"{t.__name__}, depth {depth:,}:")
+            print(f"  specifically: {seconds * 1000:.1f}ms")
+            for name, f in runs:
+                # Nothing left from the last run to look up
+                clear_caches()
+                __, seconds = timed(f)
+                print(f"  {name}: {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
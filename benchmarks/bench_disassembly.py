@@ -0,0 +1,51 @@
+"""
+Records per second through `PathsOf.an` (compiled per-type plans) against
+`interpreted` (introspecting every value, as `paths_from_object` did)
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import gc
+import sys
+from typing import Any, Callable, Collection
+
+from tracer import PathsOf
+from tracer.pathsof._disassembly import interpreted
+
+from ._workloads import timed
+
+
+@dataclass(frozen=True)
+class Flat:
+    a: str
+    b: str
+    c: str
+    d: str
+
+
+def main(records: int = 20_000, repeats: int = 3):
+    def fresh_records(run: int) -> tuple[Flat, ...]:
+        # Different values every run, so interning doesn't flatter anyone
+        return tuple(
+            Flat(f"{run}a{n}", f"{run}b{n}", f"{run}c{n % 100}", "d")
+            for n in range(records)
+        )
+
+    runs: list[tuple[str, Callable[[tuple[Flat, ...]], Any]]] = [
+        ("interpreted", lambda flats: interpreted(Collection[Flat], flats)),
+        ("compiled", lambda flats: PathsOf(Collection[Flat]).specifically(flats)),
+    ]
+    best: dict[str, float] = {}
+    for repeat in range(repeats):
+        for run, (name, disassemble) in enumerate(runs):
+            flats = fresh_records(repeat * len(runs) + run)
+            gc.collect()
+            __, seconds = timed(lambda: disassemble(flats))
+            best[name] = min(best.get(name, seconds), seconds)
+
+    for name, seconds in best.items():
+        print(f"{name}: {records / seconds:,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
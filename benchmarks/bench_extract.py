@@ -0,0 +1,63 @@
+"""
+`extract` of a narrow query from a big concrete source, as `Tracer.loop`
+does with a resource's result: most of the source is branches the query
+doesn't go down, and repeated subtrees
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import sys
+from typing import Collection, Mapping
+
+from frozendict import frozendict
+
+from tracer import PathsOf, _
+from tracer.cache import clear_caches
+
+from ._workloads import timed
+
+
+@dataclass(frozen=True)
+class Item:
+    values: Mapping[str, int]
+    notes: Collection[str]
+
+
+@dataclass(frozen=True)
+class Resource:
+    items: Mapping[str, Item]
+    tags: Collection[str]
+
+
+def main(items: int = 40, width: int = 5):
+    source = PathsOf(Resource).specifically(
+        Resource(
+            items=frozendict(
+                {
+                    f"i{n}": Item(
+                        values=frozendict({f"v{m}": m for m in range(width)}),
+                        notes=tuple(f"n{m}" for m in range(width)),
+                    )
+                    for n in range(items)
+                }
+            ),
+            tags=tuple(f"t{n}" for n in range(width)),
+        )
+    )
+    for description, query in [
+        ("values", PathsOf(Resource).eg(["items", _, "value", "values", _])),
+        ("keys", PathsOf(Resource).eg(["items", _, "key"])),
+    ]:
+        for must_match_all in [True, False]:
+            clear_caches()
+            __, seconds = timed(
+                lambda: source.extract(query, must_match_all=must_match_all)
+            )
+            print(
+                f"{items} items of {width}, {description},"
+                f" must_match_all={must_match_all}: {seconds * 1000:.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""
+Nodes visited by `covers` while tracing through a wide `flat_to_tree`-style
+`disjunction`, with and without the `_summary` early rejection
+
+The `covers` memo is turned off for this so the counts are of actual
+traversal
+"""
+
+from __future__ import annotations
+from importlib import import_module
+import sys
+from typing import Any, Collection
+
+from tracer import PathsOf, _
+from tracer.cache import clear_caches, set_cache_limit
+
+from ._workloads import timed, wide_flat_to_flat
+
+# The package re-exports functions of the same names
+covers_module = import_module("tracer.pathsof.tree_maths.covers")
+extract_module = import_module("tracer.pathsof.tree_maths.extract")
+
+
+def main(members: int = 300):
+    record, tracer = wide_flat_to_flat(members)
+    selection = PathsOf(Collection[record]).eg([_, "f0"], PathsOf.a("x"))
+
+    cached_covers = covers_module._covers
+    cannot_cover = covers_module.cannot_cover
+    cannot_extract_all = extract_module.cannot_extract_all
+    set_cache_limit(cached_covers, 0)
+
+    visited = 0
+
+    def counting_covers(*args: Any) -> bool:
+        nonlocal visited
+        visited += 1
+        return cached_covers(*args)
+
+    covers_module._covers = counting_covers
+    try:
+        for early_rejection in (False, True):
+            if early_rejection:
+                covers_module.cannot_cover = cannot_cover
+                extract_module.cannot_extract_all = cannot_extract_all
+            else:
+                covers_module.cannot_cover = lambda *_: False
+                extract_module.cannot_extract_all = lambda *_: False
+            clear_caches()
+            visited = 0
+            __, seconds = timed(lambda: tracer.trace(selection))
+            print(
+                f"{members} members, early rejection {early_rejection}:"
+                f" {visited} covers nodes visited, {seconds * 1000:.1f}ms"
+            )
+    finally:
+        covers_module._covers = cached_covers
+        covers_module.cannot_cover = cannot_cover
+        extract_module.cannot_extract_all = cannot_extract_all
+        set_cache_limit(cached_covers, 2**14)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
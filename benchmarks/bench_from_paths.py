@@ -0,0 +1,49 @@
+"""
+A selection of thousands of key paths (as generated link definitions
+have), built with `eg` and `merge` and with `PathsOf.from_paths`
+"""
+
+from __future__ import annotations
+import random
+import sys
+from typing import Any
+
+from tracer import PathsOf, _
+from tracer.cache import clear_caches
+
+from tests.test_flat_to_tree import A
+
+from ._workloads import timed
+
+PATHS = [
+    ["a", _, "key"],
+    ["a", _, "value", "b", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "value", "d", _],
+]
+
+
+def main(paths: int = 5_000):
+    random.seed(0)
+
+    def path() -> list[Any]:
+        path = random.choice(PATHS)
+        return [*path, f"k{random.randrange(paths)}"] if path[-1] == "key" else path
+
+    key_paths = [path() for __ in range(paths)]
+    print(f"{paths:,} paths:")
+    clear_caches()
+    expected, seconds = timed(
+        lambda: PathsOf(A).merge(
+            *(PathsOf(A).eg(path) for path in key_paths), merge_wildcards=True
+        )
+    )
+    print(f"  eg + merge: {seconds * 1000:.1f}ms")
+    clear_caches()
+    found, seconds = timed(lambda: PathsOf(A).from_paths(key_paths))
+    print(f"  from_paths: {seconds * 1000:.1f}ms")
+    assert found == expected
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
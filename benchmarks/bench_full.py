@@ -0,0 +1,57 @@
+"""
+`full` of a wide schema as a query, against a source that only has a few
+of its fields, both lazily and made all the way first (as `full` used to
+be), and `Tracer.loop` with `full` of a recursive type
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, make_dataclass
+import sys
+from typing import Any, Collection
+
+from tracer import PathsOf, copy
+from tracer.cache import clear_caches
+
+from ._workloads import timed, wide_record
+
+
+@dataclass(frozen=True)
+class Nest:
+    value: int
+    nested: Collection[Nest]
+
+
+def nest(depth: int, width: int) -> Nest:
+    if depth == 0:
+        return Nest(0, ())
+    return Nest(depth, tuple(nest(depth - 1, width) for __ in range(width)))
+
+
+def main(fields: int = 300, records: int = 30, depth: int = 6, width: int = 3):
+    model = make_dataclass(
+        "Model",
+        [(f"r{n}", Collection[wide_record(fields)]) for n in range(records)],
+        frozen=True,
+    )
+    source = PathsOf(model).eg(["r0"])
+
+    def lazily() -> PathsOf[Any]:
+        return source.extract(PathsOf(model).full, must_match_all=False)
+
+    def materialised() -> PathsOf[Any]:
+        return source.extract(PathsOf(model).full.materialised, must_match_all=False)
+
+    for name, extract in (("lazily", lazily), ("materialised", materialised)):
+        clear_caches()
+        __, seconds = timed(extract)
+        print(f"{records} x {fields} fields, extract {name}: {seconds * 1000:.1f}ms")
+
+    tracer = copy(PathsOf(Nest), PathsOf(Nest))
+    data = PathsOf.an(nest(depth, width))
+    clear_caches()
+    __, seconds = timed(lambda: tracer.loop(PathsOf(Nest).full, lambda __: data))
+    print(f"loop with full of recursive, depth {depth}: {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
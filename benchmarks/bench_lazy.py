@@ -0,0 +1,66 @@
+"""
+A record with a big collection in, queried for a couple of small fields
+(`Tracer.loop`'s `resource(s_query).extract(s_query)`), eagerly and lazily,
+and wide records disassembled for one field (`PathsOf.an(..., only=...)`)
+"""
+
+from __future__ import annotations
+import sys
+from dataclasses import dataclass
+from typing import Collection
+
+from tracer import PathsOf, _
+from tracer.cache import clear_caches
+
+from tests.test_flat_to_tree import Flat
+
+from ._workloads import timed, wide_record
+
+
+@dataclass(frozen=True)
+class Record:
+    name: str
+    owner: str
+    rows: Collection[Flat]
+
+
+def main(rows: int = 20_000):
+    record = Record(
+        name="record",
+        owner="someone",
+        rows=tuple(Flat(a=f"a{n}", b=f"b{n % 100}", c="c", d="d") for n in range(rows)),
+    )
+    queries = {
+        "name, owner": PathsOf(Record)
+        .eg(["name"])
+        .merge(PathsOf(Record).eg(["owner"])),
+        "one row field": PathsOf(Record).eg(["rows", _, "c"]),
+    }
+    print(f"Record with {rows:,} rows:")
+    for description, query in queries.items():
+        clear_caches()
+        expected, seconds = timed(lambda: PathsOf.an(record).extract(query))
+        print(f"  {description}, eager: {seconds * 1000:.1f}ms")
+        clear_caches()
+        found, seconds = timed(lambda: PathsOf(Record).lazily(record).extract(query))
+        print(f"  {description}, lazy: {seconds * 1000:.1f}ms")
+        assert found == expected
+
+    record_type = wide_record(100)
+    records = tuple(
+        record_type(**{f"f{n}": f"{row}-{n}" for n in range(100)})
+        for row in range(rows // 10)
+    )
+    only = PathsOf(Collection[record_type]).eg([_, "f0"])
+    print(f"{len(records):,} records with 100 fields, one field:")
+    clear_caches()
+    expected, seconds = timed(lambda: PathsOf.an(records).extract(only))
+    print(f"  an(...).extract(...): {seconds * 1000:.1f}ms")
+    clear_caches()
+    found, seconds = timed(lambda: PathsOf.an(records, only=only))
+    print(f"  an(..., only=...): {seconds * 1000:.1f}ms")
+    assert found == expected
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
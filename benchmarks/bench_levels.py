@@ -0,0 +1,49 @@
+"""
+Every level-truncated tree of a wide tree with a few deep branches, as
+`Tracer._check_coherence` goes through them, and the coherence checking
+`flat_to_tree.trace` does
+"""
+
+from __future__ import annotations
+import sys
+
+from frozendict import deepfreeze
+
+from tracer import PathsOf
+from tracer.cache import clear_caches
+
+from tests.test_flat_to_tree import Flat, flat_to_tree
+
+from ._workloads import timed
+
+
+def deep(depth: int) -> dict[str, object]:
+    nested: dict[str, object] = {}
+    for n in range(depth):
+        nested = {str(n): nested}
+    return nested
+
+
+def main(width: int = 2_000, depth: int = 50, records: int = 200):
+    tree = PathsOf.a(
+        deepfreeze({**{f"w{n}": n for n in range(width)}, "deep": deep(depth)})
+    )
+
+    def all_levels() -> int:
+        return sum(1 for __ in tree.lowest_levels_removed())
+
+    clear_caches()
+    levels, seconds = timed(all_levels)
+    print(f"width {width:,}, depth {depth}: {levels} levels in {seconds * 1000:.0f}ms")
+
+    flats = tuple(
+        Flat(a=f"a{n % 20}", b=f"b{n % 7}", c=f"c{n % 3}", d=f"d{n}")
+        for n in range(records)
+    )
+    clear_caches()
+    __, seconds = timed(lambda: flat_to_tree.trace(PathsOf.an(flats)))
+    print(f"flat_to_tree.trace of {records} records: {seconds * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,33 @@
+"""
+Looking up, and `extract`ing, a few keys' items of a `Mapping` with lots
+of them, which goes through the item index rather than every item
+"""
+
+from __future__ import annotations
+import sys
+from typing import Mapping
+
+from frozendict import frozendict
+
+from tracer import PathsOf, _
+
+from ._workloads import timed
+
+
+def main(keys: int = 20_000, lookups: int = 100):
+    t = Mapping[str, int]
+    paths = PathsOf(t).specifically(frozendict({f"k{n}": n for n in range(keys)}))
+    wanted = [f"k{n * (keys // lookups)}" for n in range(lookups)]
+
+    __, seconds = timed(lambda: paths.item_index)
+    print(f"{keys:,} keys, indexing: {seconds * 1000:.1f}ms")
+    __, seconds = timed(lambda: [paths.mapping_item(key) for key in wanted])
+    print(f"{keys:,} keys, {lookups} lookups: {seconds * 1000:.2f}ms")
+
+    queries = [PathsOf(t).from_paths([[_, "key", key], [_, "value"]]) for key in wanted]
+    __, seconds = timed(lambda: [paths.extract(query) for query in queries])
+    print(f"{keys:,} keys, {lookups} extracts by key: {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,41 @@
+"""
+Merging 10k single-wildcard subtrees back together, folding `merge` over
+them one at a time against `merge_all` of them at once
+"""
+
+from __future__ import annotations
+from functools import reduce
+import sys
+from typing import Mapping
+
+from frozendict import frozendict
+
+from tracer import PathsOf
+from tracer.pathsof.tree_maths import merge_all
+from tracer.pathsof.tree_maths.single_wildcard_subtrees import (
+    single_wildcard_subtrees,
+)
+
+from ._workloads import timed
+
+
+def main(subtrees: int = 10_000):
+    t = Mapping[str, Mapping[int, str]]
+    instance = frozendict(
+        {f"k{n}": frozendict({n: str(n), subtrees + n: "x"}) for n in range(subtrees // 2)}
+    )
+    pieces = list(single_wildcard_subtrees(PathsOf(t).specifically(instance)))
+    print(f"{len(pieces):,} subtrees")
+
+    folded, seconds = timed(lambda: reduce(lambda a, b: a.merge(b), pieces))
+    print(f"folding merge: {seconds * 1000:.0f}ms")
+    merged, seconds = timed(lambda: merge_all(pieces))
+    print(f"merge_all: {seconds * 1000:.0f}ms")
+    assert merged == folded
+
+    __, seconds = timed(lambda: merge_all(pieces, merge_wildcards=True))
+    print(f"merge_all, merging wildcards: {seconds * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,55 @@
+"""
+Memory per interned node, and the test suite's tracers on bigger inputs:
+`flat_to_tree` from `tests/test_flat_to_tree.py` both ways, and
+`deep_int_to_str` from `tests/test_opaque.py`
+"""
+
+from __future__ import annotations
+import gc
+import sys
+import tracemalloc
+
+from tracer import PathsOf
+from tracer.cache import clear_caches
+from tracer.pathsof._interning import interned_count
+
+from tests.test_flat_to_tree import A, Flat, flat_to_tree
+from tests.test_opaque import deep_int_to_str
+
+from ._workloads import timed
+
+
+def main(records: int = 200, width: int = 10):
+    flats = tuple(
+        Flat(f"a{n % 5}", f"b{n % 7}", f"c{n % 11}", f"d{n}") for n in range(records)
+    )
+    tree, seconds = timed(lambda: flat_to_tree(flats))
+    print(f"flat_to_tree, {records} records: forward {seconds:.2f}s")
+    __, seconds = timed(lambda: flat_to_tree.reverse(tree))
+    print(f"flat_to_tree, {records} records: backward {seconds:.2f}s")
+
+    mapping = {
+        str(i): {j: {str(k): k for k in range(width)} for j in range(width)}
+        for i in range(width)
+    }
+    __, seconds = timed(lambda: deep_int_to_str(mapping))
+    print(f"deep_int_to_str, {width ** 3} leaves: {seconds:.2f}s")
+
+    # Different values, and nothing of the tracing hanging around in caches,
+    # so every node is new
+    fresh = flat_to_tree(tuple(Flat(f"x{f.a}", f.b, f.c, f.d) for f in flats))
+    clear_caches()
+    gc.collect()
+    nodes = interned_count()
+    tracemalloc.start()
+    paths = PathsOf(A).specifically(fresh)
+    gc.collect()
+    allocated, __ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = interned_count() - nodes
+    print(f"PathsOf(A) of that: {nodes:,} new nodes, {allocated / nodes:.0f} B/node")
+    del paths
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,69 @@
+"""
+A link source checked against (and extracted from by) thousands of
+selections, and the selections merged, as trees and as `PathSet`s
+(converted once, up front)
+"""
+
+from __future__ import annotations
+import random
+import sys
+from typing import Any
+
+from tracer import PathsOf, _
+from tracer.cache import clear_caches
+
+from tests.test_flat_to_tree import A, d_end
+
+from ._workloads import timed
+
+PATHS = [
+    ["a", _, "key"],
+    ["a", _, "value", "b", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "value", "d", _],
+]
+
+
+def main(selections: int = 2_000):
+    random.seed(0)
+
+    def selection() -> PathsOf[Any]:
+        path = random.choice(PATHS)
+        key = f"k{random.randrange(10_000)}"
+        prefix = [key if k is _ and random.random() < 0.3 else k for k in path]
+        return PathsOf(A).eg(prefix[: random.randint(1, len(prefix))])
+
+    trees = [selection() for __ in range(selections)]
+    source = d_end.merge(*(PathsOf(A).eg(path) for path in PATHS), merge_wildcards=True)
+    path_sets, seconds = timed(lambda: [tree.path_set for tree in trees])
+    print(f"{selections:,} selections to PathSets: {seconds * 1000:.1f}ms")
+    source_set = source.path_set
+
+    clear_caches()
+    expected, seconds = timed(lambda: [source.covers(tree) for tree in trees])
+    print(f"  covers, trees: {seconds * 1000:.1f}ms")
+    found, seconds = timed(lambda: [source_set.covers(s) for s in path_sets])
+    print(f"  covers, PathSets: {seconds * 1000:.1f}ms")
+    assert found == expected
+
+    clear_caches()
+    expected, seconds = timed(
+        lambda: [source.extract(tree, must_match_all=False) for tree in trees]
+    )
+    print(f"  extract, trees: {seconds * 1000:.1f}ms")
+    found, seconds = timed(
+        lambda: [source_set.extract(s, must_match_all=False) for s in path_sets]
+    )
+    print(f"  extract, PathSets: {seconds * 1000:.1f}ms")
+    assert [s.to_paths() for s in found] == expected
+
+    clear_caches()
+    merged, seconds = timed(lambda: PathsOf(A).merge(*trees, merge_wildcards=True))
+    print(f"  merge, trees: {seconds * 1000:.1f}ms")
+    merged_set, seconds = timed(lambda: path_sets[0].merge(*path_sets[1:]))
+    print(f"  merge, PathSets: {seconds * 1000:.1f}ms")
+    assert merged_set.to_paths() == merged
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
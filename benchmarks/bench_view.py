@@ -0,0 +1,55 @@
+"""
+Reading the top level keys of what thousands of selections extract from a
+link source, through `extract` and through `View.extracting`
+"""
+
+from __future__ import annotations
+import random
+import sys
+from typing import Any
+
+from tracer import PathsOf, _
+from tracer.cache import clear_caches
+
+from tests.test_flat_to_tree import A, d_end
+
+from ._workloads import timed
+
+PATHS = [
+    ["a", _, "key"],
+    ["a", _, "value", "b", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "value", "d", _],
+]
+
+
+def main(selections: int = 2_000):
+    random.seed(0)
+
+    def selection() -> PathsOf[Any]:
+        path = random.choice(PATHS)
+        return PathsOf(A).eg(path[: random.randint(1, len(path))])
+
+    trees = [selection() for __ in range(selections)]
+    source = d_end.merge(*(PathsOf(A).eg(path) for path in PATHS), merge_wildcards=True)
+
+    def wildcard_keys(tree: Any) -> int:
+        return sum(1 for item in tree["a"].values() for __ in item.get("value", ()))
+
+    clear_caches()
+    expected, seconds = timed(
+        lambda: [
+            wildcard_keys(source.extract(tree, must_match_all=False)) for tree in trees
+        ]
+    )
+    print(f"{selections:,} selections, extract: {seconds * 1000:.1f}ms")
+    clear_caches()
+    found, seconds = timed(
+        lambda: [wildcard_keys(source.view.extracting(tree)) for tree in trees]
+    )
+    print(f"{selections:,} selections, View: {seconds * 1000:.1f}ms")
+    assert found == expected
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,76 @@
+"""
+`Wildcard` keys in the nested `Mapping` types from `tests/test_opaque.py`
+and the nested `A`/`B`/`C`/`D` dataclasses of `Mapping`s from
+`tests/test_flat_to_tree.py`: the key operations themselves, and the tree
+maths that does them on every node
+"""
+
+from __future__ import annotations
+import sys
+from timeit import timeit
+
+from tracer import PathsOf, _
+from tracer.cache import clear_caches
+from tracer.pathsof.wildcard import Wildcard
+
+from tests.test_flat_to_tree import Flat, d_end, flat_to_tree
+
+from ._workloads import timed
+
+A = dict[str, dict[int, dict[str, int]]]
+B = dict[int, dict[str, dict[int, str]]]
+
+
+def main(width: int = 12):
+    a = {
+        str(i): {j: {str(k): k for k in range(width)} for j in range(width)}
+        for i in range(width)
+    }
+    b = {
+        int(i): {str(j): {k: str(v) for k, v in d.items()} for j, d in c.items()}
+        for i, c in a.items()
+    }
+
+    for t, instance in ((A, a), (B, b)):
+        paths, seconds = timed(lambda: PathsOf(t).specifically(instance))
+        print(f"{t}: specifically {seconds * 1000:.1f}ms")
+
+        (key, subpaths), *__ = paths.items()
+        other_key = Wildcard(subpaths)
+        children = dict(paths.items())
+        for name, op in [
+            ("hash", lambda: hash(key)),
+            ("==", lambda: key == other_key),
+            ("lookup", lambda: children[other_key]),
+        ]:
+            print(f"  key {name}: {timeit(op, number=10**6) * 1000:.0f}ns")
+
+        halves = [
+            PathsOf(t).specifically(dict(list(instance.items())[n::2])) for n in (0, 1)
+        ]
+        clear_caches()
+        __, seconds = timed(lambda: halves[0].merge(halves[1]))
+        print(f"  merge halves {seconds * 1000:.1f}ms")
+
+        clear_caches()
+        selection = PathsOf(t).eg([_, "value", _, "value", _, "value"])
+        __, seconds = timed(lambda: paths.extract(selection, must_match_all=False))
+        print(f"  extract {seconds * 1000:.1f}ms")
+
+    flats = tuple(
+        Flat(f"a{n % 5}", f"b{n % 7}", f"c{n % 11}", f"d{n}") for n in range(width**2)
+    )
+    tree = flat_to_tree(flats)
+    clear_caches()
+    paths, seconds = timed(lambda: PathsOf(type(tree)).specifically(tree))
+    print(
+        f"flat_to_tree's A, {len(flats)} records: specifically {seconds * 1000:.1f}ms"
+    )
+    __, seconds = timed(lambda: paths.extract(d_end))
+    print(f"  extract(d_end) {seconds * 1000:.1f}ms")
+    __, seconds = timed(lambda: flat_to_tree.reverse.trace(paths))
+    print(f"  trace backwards {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
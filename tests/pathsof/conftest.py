@@ -0,0 +1,32 @@
+from __future__ import annotations
+import random
+from typing import Any, Callable
+
+import pytest
+
+from tracer.pathsof import PathsOf
+
+
+@pytest.fixture
+def random_selections() -> Callable[..., list[PathsOf[Any]]]:
+    """
+    `(t, paths, n)` to `n` trees of `t`, each merged from one to three
+    random prefixes of `paths`. The same ones every time, whatever else has
+    been using `random`
+    """
+    rng = random.Random(0)
+
+    def selections(t: type[Any], paths: list[list[Any]], n: int) -> list[PathsOf[Any]]:
+        def random_prefix() -> list[Any]:
+            path = rng.choice(paths)
+            return path[: rng.randint(1, len(path))]
+
+        return [
+            PathsOf(t).merge(
+                *(PathsOf(t).eg(random_prefix()) for __ in range(rng.randint(1, 3))),
+                merge_wildcards=True,
+            )
+            for __ in range(n)
+        ]
+
+    return selections
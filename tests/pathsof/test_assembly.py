@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from typing import Collection, Mapping
+
+from frozendict import frozendict
+
+from tracer import MappingItem, PathsOf, _
+from tracer.pathsof.hole import Hole
+from tracer.pathsof.mapping import consolidate_mapping_tree
+
+
+@dataclass(frozen=True)
+class Pair:
+    a: str
+    b: Mapping[str, Collection[int]]
+
+
+def test_round_trip():
+    for instance in [
+        Pair("x", frozendict({"y": (1, 2), "z": ()})),
+        (Pair("x", frozendict()), Pair("y", frozendict({"z": (3,)}))),
+        frozendict({1: "one", "two": (Pair("x", frozendict()),)}),
+    ]:
+        assert PathsOf.a(instance).assembled == instance
+
+
+def test_holes():
+    assert PathsOf(Pair).eg(["a"], PathsOf.a("x")).assembled == Pair("x", Hole())
+    assert PathsOf(Pair).eg(["b", _, "value", _]).assembled == Pair(
+        Hole(), frozendict({Hole(): (Hole(),)})
+    )
+
+
+def test_unconsolidated_mapping():
+    def b(value: Mapping[str, Collection[int]]) -> PathsOf[Pair]:
+        return PathsOf(Pair).eg(
+            {"b": PathsOf(Mapping[str, Collection[int]]).specifically(value)}
+        )
+
+    paths = b(frozendict({"y": (1,)})).merge(b(frozendict({"y": (2,)})))
+    assert not paths._consolidated
+    assert paths.assembled == Pair(Hole(), frozendict({"y": (1, 2)}))
+
+
+def test_consolidation_is_incremental():
+    def b(value: Mapping[str, Collection[int]]) -> PathsOf[Pair]:
+        return PathsOf(Pair).eg(
+            {"b": PathsOf(Mapping[str, Collection[int]]).specifically(value)}
+        )
+
+    # Nor can leaves
+    assert PathsOf.a("x")._consolidated
+    assert PathsOf.a(1)._consolidated
+    assert PathsOf(int).eg([_])._consolidated
+    # One item can't need merging with anything, nor can different fields
+    one = b(frozendict({"y": (1,)}))
+    assert one.merge(PathsOf(Pair).eg(["a"]))._consolidated
+
+    consolidated = consolidate_mapping_tree(
+        b(frozendict({"y": (1,)})).merge(b(frozendict({"z": (2,)})))
+    )
+    assert consolidated._consolidated
+    assert consolidate_mapping_tree(consolidated) is consolidated
+    # And merging in more that can't clash with it keeps it that way
+    merged = consolidated.merge(PathsOf(Pair).eg(["a", "x"]))
+    assert consolidate_mapping_tree(merged) is merged
+
+
+def test_items_with_keys_first():
+    t = Mapping[str, int]
+    paths = PathsOf(t).eg([_, "value"]).merge(PathsOf(t).eg([_, "key", "y"]))
+    # Nothing to merge, but still not in order
+    assert consolidate_mapping_tree(paths) is not paths
+    assert list(paths.assembled) == ["y", Hole()]
+
+
+def test_stale_wildcard_keys():
+    @dataclass(frozen=True)
+    class Inner:
+        d: Collection[str]
+
+    @dataclass(frozen=True)
+    class Outer:
+        c: Mapping[str, Inner]
+
+    # Taking off the strings leaves the two elements' keys pointing at the
+    # old subtrees, so they're the same element only once that's sorted out
+    paths = PathsOf.an(Outer(frozendict({"k": Inner(("ww", "xx"))})))
+    removed = paths.remove_lowest_level()
+    assert not removed._consolidated
+    assert removed.assembled == Outer(frozendict({"k": Inner((Hole(),))}))
+
+
+def test_item_index():
+    from tracer.pathsof.tree_maths.extract import _extract_single_wildcards
+    from tracer.pathsof.tree_maths.single_wildcard_subtrees import (
+        single_wildcard_subtrees,
+    )
+
+    def b(value: Mapping[str, Collection[int]]) -> PathsOf[Pair]:
+        return PathsOf(Pair).eg(
+            {"b": PathsOf(Mapping[str, Collection[int]]).specifically(value)}
+        )
+
+    paths = b(frozendict({"y": (1,), "z": (2,)}))
+    mapping = paths["b"]
+    assert mapping.mapping_item("y").assembled == MappingItem(key="y", value=(1,))
+    assert mapping.mapping_item("x") is None
+
+    # Kept up to date through `merge` (the index comes along, then has more
+    # put in it) and consolidation
+    mapping.item_index
+    merged = paths.merge(b(frozendict({"y": (3,), "x": ()})))["b"]
+    assert set(merged.item_index.items) == {"x", "y", "z"}
+    assert len(merged.item_index.items["y"]) == 2
+    assert merged.mapping_item("y").assembled.value == (1, 3)
+    consolidated = consolidate_mapping_tree(merged)
+    assert len(consolidated.item_index.items["y"]) == 1
+
+    # Extracting items by key goes straight to them, with the same result
+    for key in ["x", "y", "w"]:
+        query = PathsOf(Pair).from_paths([["b", _, "key", key], ["b", _, "value", _]])
+        source = paths.merge(b(frozendict({"x": (4, 5)})))
+        expected = PathsOf(Pair)
+        for subtree in single_wildcard_subtrees(source):
+            if (
+                extracted := _extract_single_wildcards(
+                    subtree, query, must_match_all=True
+                )
+            ) is not None:
+                expected = expected.merge(extracted)
+        assert source.extract(query) == expected
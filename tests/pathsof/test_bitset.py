@@ -0,0 +1,82 @@
+from __future__ import annotations
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Mapping
+
+import pytest
+
+from tracer.pathsof import PathsOf
+from tracer.pathsof.wildcard import _
+
+
+@dataclass(frozen=True)
+class Flat:
+    a: str
+    b: int | None
+    c: str
+
+
+@dataclass(frozen=True)
+class A:
+    a: Mapping[str, B]
+    flats: Collection[Flat]
+
+
+@dataclass(frozen=True)
+class B:
+    b: Mapping[str, Collection[str]]
+
+
+A_PATHS = [
+    ["a", _, "key"],
+    ["a", _, "value", "b", _, "key"],
+    ["a", _, "value", "b", _, "value", _],
+    ["flats", _, "a"],
+    ["flats", _, "b"],
+    ["flats", _, "c"],
+]
+
+
+def test_same_as_trees(random_selections: Callable[..., list[PathsOf[A]]]):
+    trees = [PathsOf(A), PathsOf(A).full, *random_selections(A, A_PATHS, 30)]
+    for tree in trees:
+        assert tree.bitset.to_paths() == tree
+
+    for tree in trees:
+        for other in trees:
+            bits, other_bits = tree.bitset, other.bitset
+            for all_the_way in (True, False):
+                assert bits.covers(
+                    other_bits, all_the_way_to_the_leaves=all_the_way
+                ) == tree.covers(other, all_the_way_to_the_leaves=all_the_way)
+            assert bits.extends(other_bits) == tree.extends(other)
+            assert bits.merge(other_bits).to_paths() == tree.merge(
+                other, merge_wildcards=True
+            )
+            for must_match_all in (True, False):
+                assert bits.extract(
+                    other_bits, must_match_all=must_match_all
+                ).to_paths() == tree.extract(other, must_match_all=must_match_all)
+
+
+def test_only_parts_of_full():
+    assert PathsOf(A).full.bitset.bits == (1 << len(PathsOf(A).full.bitset.layout)) - 1
+    with pytest.raises(ValueError):
+        PathsOf(A).eg(["a", "x"]).bitset
+    with pytest.raises(ValueError):
+        PathsOf(Collection[Flat]).eg([_, "a"], PathsOf.a("1")).bitset
+
+
+def test_deeper_than_the_recursion_limit():
+    from dataclasses import make_dataclass
+
+    depth = sys.getrecursionlimit() + 100
+    t: type[Any] = make_dataclass("Level0", [("value", int)], frozen=True)
+    for n in range(1, depth):
+        t = make_dataclass(f"Level{n}", [("inner", t)], frozen=True)
+
+    full = PathsOf(t).full.materialised
+    tree = full.remove_lowest_level()
+    bits = tree.bitset
+    assert bits.to_paths() == tree
+    assert full.bitset.covers(bits) and not bits.extends(full.bitset)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import random
+from typing import Any, Collection
+
+from tracer.pathsof import PathsOf, children
+from tracer.pathsof.children import Children
+from tracer.pathsof.wildcard import _
+
+
+class Colliding:
+    """Keys with a hash that's the same for lots of them"""
+
+    def __init__(self, value: int):
+        self.value = value
+
+    def __hash__(self) -> int:
+        return self.value % 3
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Colliding) and other.value == self.value
+
+
+def test_like_a_dict():
+    rng = random.Random(0)
+    leaves = [PathsOf.a(n) for n in range(10)]
+    versions: list[tuple[Children, dict[Any, Any]]] = []
+    model: dict[Any, Any] = {}
+    current = Children.from_items(())
+    for __ in range(2_000):
+        if model and rng.random() < 0.25:
+            key = rng.choice(list(model))
+            current = current.delete(key)
+            del model[key]
+        else:
+            key = rng.choice([rng.randrange(500), Colliding(rng.randrange(50))])
+            value = rng.choice(leaves)
+            current = current.set(key, value)
+            model[key] = value
+        versions.append((current, dict(model)))
+
+    # Old versions are still intact
+    for version, expected in versions[::50]:
+        assert list(version.items()) == list(expected.items())
+        assert all(version[key] is value for key, value in expected.items())
+        rebuilt = Children.from_items(expected.items())
+        assert rebuilt == version and hash(rebuilt) == hash(version)
+        assert rebuilt.is_exactly(version)
+
+
+def test_wide_nodes(monkeypatch: Any):
+    def results() -> list[Any]:
+        paths = PathsOf(Collection[str]).specifically(tuple(map(str, range(100))))
+        selection = PathsOf(Collection[str]).eg([_, "7"])
+        return [
+            paths.extract(PathsOf(Collection[str]).eg([_])) is paths,
+            str(paths.extract(selection)),
+            paths.covers(selection),
+            paths._summary.key_fingerprints,
+            paths._summary.leaf_count,
+            paths.assembled,
+        ]
+
+    wide = PathsOf(Collection[str]).specifically(tuple(map(str, range(100))))
+    assert isinstance(wide.paths, Children)
+    expected = results()
+    monkeypatch.setattr(children, "CHILDREN_THRESHOLD", 10**9)
+    assert results() == expected
@@ -0,0 +1,118 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Collection
+
+import pytest
+
+from tracer.pathsof import PathsOf, columnar
+from tracer.pathsof._disassembly import interpreted
+from tracer.pathsof.columnar import Columns
+from tracer.pathsof.tree_maths.single_wildcard_subtrees import (
+    single_wildcard_subtrees,
+)
+from tracer.pathsof.wildcard import is_wildcard, _
+
+
+@dataclass(frozen=True)
+class Flat:
+    a: int
+    b: str
+
+
+@dataclass(frozen=True)
+class Nested:
+    a: int
+    c: Collection[int]
+
+
+flats = tuple(Flat(n % 7, str(n % 11)) for n in range(100))
+nesteds = tuple(Nested(n, tuple(range(n % 3))) for n in range(100))
+
+
+def structure(paths: PathsOf[Any]) -> Any:
+    """What `==` looks at, spelled out, so nodes from different runs compare"""
+    return (
+        paths.type,
+        paths.sequence_length,
+        frozenset(
+            ("*" if is_wildcard(key) else key, structure(subpaths))
+            for key, subpaths in paths.items()
+        ),
+    )
+
+
+def test_canonical():
+    paths = PathsOf(Collection[Flat]).specifically(flats)
+    assert isinstance(paths.paths, Columns)
+    assert interpreted(Collection[Flat], flats) is paths
+    assert len(paths) == len(set(flats))
+    assert paths.assembled == tuple(dict.fromkeys(flats))
+
+    (key, row), *__ = paths.items()
+    assert key in paths and paths[key] == row
+
+    few = PathsOf(Collection[Flat]).specifically(flats[:3])
+    assert not isinstance(few.paths, Columns)
+    assert not isinstance(paths.extract(few).paths, Columns)
+
+
+@pytest.mark.parametrize("records", [flats, nesteds])
+def test_same_as_node_per_row(records: tuple[Any, ...], monkeypatch: Any):
+    t = Collection[type(records[0])]
+    selections = [
+        PathsOf(t),
+        PathsOf(t).eg([_]),
+        PathsOf(t).eg([_, "a"]),
+        PathsOf(t).eg([_, "a", 3]),
+        PathsOf(t)
+        .eg([_, "a"])
+        .merge(PathsOf(t).eg([_, "b" if records is flats else "c"])),
+    ]
+
+    def results() -> list[Any]:
+        paths = PathsOf(t).specifically(records)
+        split = (
+            PathsOf(t)
+            .specifically(records[:50])
+            .merge(PathsOf(t).specifically(records[50:]))
+        )
+        most = PathsOf(t).specifically(records[:90])
+        return [
+            *(
+                structure(paths.extract(selection, must_match_all=must_match_all))
+                for selection in selections
+                for must_match_all in (True, False)
+            ),
+            *(
+                paths.covers(selection, all_the_way_to_the_leaves=all_the_way)
+                for selection in selections
+                for all_the_way in (True, False)
+            ),
+            paths.covers(most),
+            most.covers(paths),
+            most.extends(paths.extract(selections[2])),
+            structure(split),
+            structure(PathsOf(t).merge(paths, merge_wildcards=True)),
+            sorted(map(str, single_wildcard_subtrees(paths))),
+            paths.assembled,
+            paths._summary.key_fingerprints,
+            paths._summary.depth,
+            paths._summary.leaf_count,
+        ]
+
+    assert isinstance(PathsOf(t).specifically(records).paths, Columns)
+    columnar_results = results()
+    monkeypatch.setattr(columnar, "COLUMNAR_THRESHOLD", 10**9)
+    assert results() == columnar_results
+
+
+def test_single_wildcard_subtrees_make_rows_as_they_go(monkeypatch: Any):
+    paths = PathsOf(Collection[Flat]).specifically(flats)
+    made = []
+    row = Columns.row
+    monkeypatch.setattr(
+        Columns, "row", lambda self, cells: made.append(cells) or row(self, cells)
+    )
+    subtrees = single_wildcard_subtrees(paths)
+    (first,) = next(subtrees).values()
+    assert len(made) == 1 and first.assembled == flats[0]
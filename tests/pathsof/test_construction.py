@@ -0,0 +1,64 @@
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from typing import Any, Collection, Mapping
+
+from tracer import MappingKey, PathsOf, _
+from tracer.pathsof.mapping import mapping_path
+
+
+@dataclass(frozen=True)
+class Flat:
+    a: str
+    b: int | None
+
+
+@dataclass(frozen=True)
+class A:
+    a: Mapping[str, B]
+    flats: Collection[Flat]
+
+
+@dataclass(frozen=True)
+class B:
+    b: Mapping[int, Collection[str]]
+
+
+A_PATHS = [
+    ["a", _, "key", "k"],
+    ["a", _, "value", "b", _, "key", 1],
+    ["a", _, "value", "b", _, "value", _, "x"],
+    ["flats", _, "a"],
+    ["flats", _, "b", int, 2],
+    ["flats", _, "b", type(None)],
+]
+
+
+def test_from_paths_same_as_eg_and_merge():
+    rng = random.Random(0)
+    for __ in range(30):
+        paths: list[list[Any]] = []
+        for __ in range(rng.randint(1, 10)):
+            path = rng.choice(A_PATHS)
+            paths.append(path[: rng.randint(1, len(path))])
+        assert PathsOf(A).from_paths(paths) == PathsOf(A).merge(
+            *(PathsOf(A).eg(path) for path in paths), merge_wildcards=True
+        )
+
+
+def test_mapping_keys():
+    assert PathsOf(A).from_paths([["a", MappingKey("k"), "b", MappingKey(1)]]) == (
+        PathsOf(A).merge(
+            PathsOf(A).eg(["a", _, "key", "k"]),
+            PathsOf(A).eg(["a", _, "value", "b", _, "key", 1]),
+            PathsOf(A).eg(["a", _, "value", "b", _, "value"]),
+            merge_wildcards=True,
+        )
+    )
+    t = Mapping[str, Mapping[int, str]]
+    assert mapping_path(t, ["k", 1]) == PathsOf(t).merge(
+        PathsOf(t).eg([_, "key", "k"]),
+        PathsOf(t).eg([_, "value", _, "key", 1]),
+        PathsOf(t).eg([_, "value", _, "value"]),
+        merge_wildcards=True,
+    )
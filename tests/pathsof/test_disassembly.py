@@ -0,0 +1,52 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Collection, Mapping, Sequence
+
+from frozendict import frozendict
+
+from tracer.pathsof import PathsOf
+from tracer.pathsof._disassembly import interpreted
+from tracer.pathsof.wildcard import _
+
+
+@dataclass(frozen=True)
+class Record:
+    name: str
+    when: datetime
+    tags: Collection[str]
+    counts: Mapping[str, int]
+    children: Sequence[Record]
+
+
+record = Record(
+    "parent",
+    datetime(2024, 5, 12),
+    ("a", "b"),
+    frozendict({"x": 1, "y": 2}),
+    (Record("child", datetime(2024, 5, 13), (), frozendict(), ()),),
+)
+
+
+def test_compiled_matches_interpreted():
+    for t, instance in [
+        (Record, record),
+        (Collection[Record], (record, record.children[0])),
+        (Mapping[str, Record], frozendict({"r": record})),
+        (frozendict, frozendict({1: "one", "two": (2,)})),
+        (str, "leaf"),
+    ]:
+        compiled = PathsOf(t).specifically(instance)
+        assert compiled is interpreted(t, instance)
+        assert compiled.sequence_length == interpreted(t, instance).sequence_length
+
+
+def test_only():
+    for only in [
+        PathsOf(Record).eg(["name"]),
+        PathsOf(Record).eg(["children", _, "tags"]),
+        PathsOf(Record).eg(["counts", _, "value"]),
+        PathsOf(Record).eg(["counts", _, "key", "x"]),
+        PathsOf(Record).eg(["when"]),
+    ]:
+        assert PathsOf.an(record, only=only) == PathsOf.an(record).extract(only)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Collection, Mapping
+
+import pytest
+
+from tracer import Tracer, copy
+from tracer.pathsof import PathsOf
+from tracer.pathsof.lazy import eager
+from tracer.pathsof.wildcard import _
+
+
+@dataclass(frozen=True)
+class Nest:
+    value: int
+    nested: Collection[Nest]
+
+
+@dataclass(frozen=True)
+class Wide:
+    nests: Mapping[str, Nest]
+    name: str
+
+
+NEST = Nest(1, (Nest(2, ()), Nest(3, (Nest(4, ()),))))
+
+
+def test_recursive_full_is_back_referenced():
+    full = PathsOf(Nest).full
+    assert full.recursive
+    assert full["nested"][_] is full
+    assert PathsOf(Wide).full.recursive
+    with pytest.raises(ValueError):
+        full.materialised
+
+
+def test_recursive_full_as_all_paths():
+    full = PathsOf(Nest).full
+    source = PathsOf.an(NEST)
+    assert source.extract(full) == source
+    assert source.extract(full, must_match_all=False) == source
+    assert full.covers(source)
+
+    selection = PathsOf(Nest).eg(["nested", _, "value"])
+    assert full.covers(selection)
+    assert full.merge(selection) is full
+    assert selection.merge(full) is full
+    assert full.extract(full) is full
+    assert full.extract(selection) == selection
+
+
+def test_non_recursive_full_matches_materialised():
+    @dataclass(frozen=True)
+    class Flat:
+        a: str
+        b: Collection[int]
+
+    full = PathsOf(Flat).full
+    materialised = full.materialised
+    assert not full.recursive
+    assert full == materialised
+    assert hash(full) == hash(materialised)
+
+    source = PathsOf.an(Flat("a", (1, 2)))
+    for selection in (
+        PathsOf(Flat),
+        PathsOf(Flat).eg(["a"]),
+        PathsOf(Flat).eg(["b", _]),
+        source,
+    ):
+        assert full.covers(selection) == materialised.covers(selection)
+        assert selection.covers(full) == selection.covers(materialised)
+        assert eager(full.merge(selection)) == materialised.merge(selection)
+    assert source.extract(full) == source.extract(materialised)
+
+
+def test_loop_with_recursive_full():
+    tracer: Tracer[Nest, Nest] = copy(PathsOf(Nest), PathsOf(Nest))
+    resource = lambda query: PathsOf.an(NEST)
+    assert tracer.loop(PathsOf(Nest).full, resource) == PathsOf.an(NEST)
+
+
+def test_trace_recursive_full_checks_coherence():
+    unrolled = PathsOf(Nest).full.unrolled
+    assert list(unrolled["nested"].values()) == [PathsOf(Nest)]
+
+    copy(PathsOf(Nest), PathsOf(Nest)).trace(PathsOf(Nest).full)
+    forgetful: Tracer[Nest, Nest] = Tracer(
+        forward=lambda s: s, backward=lambda t: PathsOf(Nest)
+    )
+    with pytest.raises(AssertionError):
+        forgetful.trace(PathsOf(Nest).full)
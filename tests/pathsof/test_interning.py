@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Collection
+
+from tracer.pathsof import PathsOf
+from tracer.pathsof.wildcard import _
+
+
+@dataclass(frozen=True)
+class Pair:
+    a: str
+    b: str
+
+
+def test_identical_trees_are_the_same_node():
+    assert PathsOf.a(Pair("x", "y")) is PathsOf.a(Pair("x", "y"))
+    assert PathsOf(Pair).eg(["a"]) is PathsOf(Pair).eg(["a"])
+    assert PathsOf(Pair).eg(["a"]).merge(PathsOf(Pair).eg(["b"])) is PathsOf(Pair).eg(
+        ["a"]
+    ).merge(PathsOf(Pair).eg(["b"]))
+
+
+def test_repeated_subtrees_are_shared():
+    pairs = PathsOf.a((Pair("x", "x"), Pair("x", "y")))
+    first, second = pairs.values()
+    assert first["a"] is second["a"] is first["b"]
+
+
+def test_equality_ignores_child_order():
+    ab = PathsOf(Pair).eg(["a"]).merge(PathsOf(Pair).eg(["b"]))
+    ba = PathsOf(Pair).eg(["b"]).merge(PathsOf(Pair).eg(["a"]))
+    assert ab is not ba
+    assert ab == ba
+    assert hash(ab) == hash(ba)
+    assert tuple(ab) == ("a", "b")
+    assert tuple(ba) == ("b", "a")
+
+
+def test_child_order_is_kept():
+    forwards = (Pair("x", "x"), Pair("y", "y"))
+    backwards = forwards[::-1]
+    forwards_paths = PathsOf(Collection[Pair]).specifically(forwards)
+    backwards_paths = PathsOf(Collection[Pair]).specifically(backwards)
+    assert forwards_paths == backwards_paths
+    assert tuple(paths.assembled for paths in forwards_paths.values()) == forwards
+    assert tuple(paths.assembled for paths in backwards_paths.values()) == backwards
+
+
+def test_wildcard_keys():
+    assert PathsOf(Collection[Pair]).eg({_: PathsOf(Pair).eg(["a"])}) == PathsOf(
+        Collection[Pair]
+    ).eg([_, "a"])
+
+
+def test_equal_but_different_leaves_are_not_merged():
+    from datetime import datetime, timedelta, timezone
+
+    utc = datetime(2024, 5, 12, 12, tzinfo=timezone.utc)
+    plus_one = datetime(2024, 5, 12, 13, tzinfo=timezone(timedelta(hours=1)))
+    assert utc == plus_one
+
+    assert PathsOf.a(utc) == PathsOf.a(plus_one)
+    assert PathsOf.a(utc) is not PathsOf.a(plus_one)
+    assert PathsOf.a(plus_one).assembled.tzinfo == plus_one.tzinfo
+
+
+def test_leaves_are_compact():
+    from types import EllipsisType
+    from frozendict import frozendict
+    from tracer.pathsof.leaf import Leaf
+
+    leaf = PathsOf.a(5)
+    assert isinstance(leaf.paths, Leaf)
+    assert leaf is PathsOf(int, paths=frozendict({5: PathsOf(EllipsisType)}))
+    assert leaf is PathsOf(int).eg([5])
+    assert dict(leaf.paths) == {5: PathsOf(EllipsisType)}
+    assert leaf._summary is PathsOf.a(5 + 64 * 64)._summary
+    assert PathsOf(int).eg([5]).merge(PathsOf(int).eg([6])).covers(leaf)
+    assert PathsOf.a(1).assembled is not True and PathsOf.a(True).assembled is True
+
+
+def test_explicit_and_wildcard_children_apart():
+    wildcards = PathsOf(Collection[Pair]).eg([_, "a"])
+    explicit = PathsOf(Collection[Pair]).eg([0, "b"])
+    mixed = wildcards.merge(explicit)
+    assert dict(mixed._explicit) == dict(explicit)
+    assert dict(mixed._wildcards) == dict(wildcards)
+    assert wildcards._wildcards is wildcards.paths and not wildcards._explicit
+    assert explicit._explicit is explicit.paths and not explicit._wildcards
@@ -0,0 +1,112 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Collection, Mapping
+
+from tracer.pathsof import PathsOf
+from tracer.pathsof._interning import interned_count
+from tracer.pathsof.lazy import LazyPathsOf
+from tracer.pathsof.wildcard import _
+
+
+@dataclass(frozen=True)
+class Flat:
+    a: str
+    b: int | None
+    c: str
+
+
+@dataclass(frozen=True)
+class A:
+    a: Mapping[str, B]
+    flats: Collection[Flat]
+    name: str
+
+
+@dataclass(frozen=True)
+class B:
+    b: Mapping[str, Collection[str]]
+
+
+A_PATHS = [
+    ["a", _, "key"],
+    ["a", _, "value", "b", _, "key"],
+    ["a", _, "value", "b", _, "value", _],
+    ["flats", _, "a"],
+    ["flats", _, "b"],
+    ["flats", _, "c"],
+    ["name"],
+]
+
+
+def instance(items: int, flats: int) -> A:
+    return A(
+        a={
+            f"k{i}": B(b={f"j{j}": (f"v{i}", f"w{j}") for j in range(3)})
+            for i in range(items)
+        },
+        flats=tuple(Flat(a=f"a{i % 4}", b=i or None, c="c") for i in range(flats)),
+        name="a",
+    )
+
+
+def with_data(shapes: list[PathsOf[A]], eager: PathsOf[A] | None) -> list[PathsOf[A]]:
+    if eager is None:
+        return shapes
+    # And some with data in, some of it not in the instance
+    return [
+        *shapes,
+        *(eager.extract(shape) for shape in shapes[:5]),
+        PathsOf(A).eg(["name", "b"]),
+        PathsOf(A).eg(["flats", _, "a", "a9"]),
+    ]
+
+
+def test_same_as_eager(random_selections: Callable[..., list[PathsOf[A]]]):
+    # 70 is over `columnar.COLUMNAR_THRESHOLD`, and too many for extracting
+    # selections with data in to be quick
+    for size in ((0, 0), (2, 3), (0, 70)):
+        eager = PathsOf.an(instance(*size))
+        shapes = random_selections(A, A_PATHS, 20)
+        for selection in with_data(shapes, eager if sum(size) < 10 else None):
+            lazy = PathsOf(A).lazily(instance(*size))
+            assert isinstance(lazy, LazyPathsOf)
+            for all_the_way_to_the_leaves in (False, True):
+                assert lazy.covers(
+                    selection, all_the_way_to_the_leaves=all_the_way_to_the_leaves
+                ) == eager.covers(
+                    selection, all_the_way_to_the_leaves=all_the_way_to_the_leaves
+                )
+            for must_match_all in (False, True):
+                assert lazy.extract(
+                    selection, must_match_all=must_match_all
+                ) == eager.extract(selection, must_match_all=must_match_all)
+            assert lazy.merge(selection) == eager.merge(selection)
+            assert selection.merge(lazy) == selection.merge(eager)
+            assert eager.covers(lazy) and lazy.covers(eager)
+            assert lazy == eager and eager == lazy and hash(lazy) == hash(eager)
+
+
+def test_only_disassembles_what_is_looked_at():
+    big = instance(2_000, 2_000)
+    selection = PathsOf(A).eg(["name"])
+    before = interned_count()
+    lazy = PathsOf(A).lazily(big)
+    assert lazy.covers(selection)
+    assert lazy.extract(selection)["name"] == PathsOf.a("a")
+    assert interned_count() - before < 10
+
+
+def test_tracers_take_instances_lazily():
+    from dataclasses import replace
+
+    from tracer import copy
+    from tracer.pathsof.hole import Hole
+
+    # (The coherence checks would go through all of it)
+    name_to_c = replace(
+        copy(PathsOf(A).eg(["name"]), PathsOf(Flat).eg(["c"])), fully_specified=False
+    )
+    big = instance(2_000, 2_000)
+    before = interned_count()
+    assert name_to_c(big) == Flat(Hole(), Hole(), "a")
+    assert interned_count() - before < 20
@@ -0,0 +1,146 @@
+from __future__ import annotations
+import gc
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Mapping
+
+import pytest
+from frozendict import frozendict
+
+from tracer.pathsof import PathsOf
+from tracer.pathsof.wildcard import _
+
+
+
+@dataclass(frozen=True)
+class Flat:
+    a: str
+    b: str
+    c: str
+    d: str
+
+
+@dataclass(frozen=True)
+class A:
+    a: Mapping[str, B]
+
+
+@dataclass(frozen=True)
+class B:
+    b: Mapping[str, C]
+
+
+@dataclass(frozen=True)
+class C:
+    c: Mapping[str, D]
+
+
+@dataclass(frozen=True)
+class D:
+    d: Collection[str]
+
+
+A_PATHS = [
+    ["a", _, "key"],
+    ["a", _, "value", "b", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "key"],
+    ["a", _, "value", "b", _, "value", "c", _, "value", "d", _],
+    ["a", "x", "value", "b", _, "key"],
+    ["a", "x", "value", "b", "y", "value", "c"],
+]
+FLAT_PATHS = [[_, "a"], [_, "b"], [_, "c"], [_, "d"], [_], [3, "a"]]
+
+
+@pytest.mark.parametrize("t, paths", [(A, A_PATHS), (Collection[Flat], FLAT_PATHS)])
+def test_same_as_trees(
+    t: type[Any],
+    paths: list[list[Any]],
+    random_selections: Callable[..., list[PathsOf[Any]]],
+):
+    trees = random_selections(t, paths, 25)
+    for tree in trees:
+        assert tree.path_set.to_paths() == tree
+
+    for tree in trees:
+        for other in trees:
+            path_set, other_set = tree.path_set, other.path_set
+            for all_the_way in (True, False):
+                assert path_set.covers(
+                    other_set, all_the_way_to_the_leaves=all_the_way
+                ) == tree.covers(other, all_the_way_to_the_leaves=all_the_way)
+            assert path_set.merge(other_set).to_paths() == tree.merge(
+                other, merge_wildcards=True
+            )
+            if not any(
+                node._explicit and node._wildcards
+                for node in (*nodes(tree), *nodes(other))
+            ):
+                for must_match_all in (True, False):
+                    assert path_set.extract(
+                        other_set, must_match_all=must_match_all
+                    ).to_paths() == tree.extract(other, must_match_all=must_match_all)
+
+
+def nodes(tree: PathsOf[Any]) -> list[PathsOf[Any]]:
+    return [tree, *(node for child in tree.values() for node in nodes(child))]
+
+
+def test_values_and_lengths():
+    tree = PathsOf(Collection[Flat]).eg([_, "a"], PathsOf.a("1"))
+    assert tree.path_set.to_paths() == tree
+    assert list(tree.path_set) == [(_, "a", "1")]
+
+    with pytest.raises(ValueError):
+        PathsOf(Collection[Flat]).specifically(
+            (Flat("1", "2", "3", "4"), Flat("5", "6", "7", "8"))
+        ).path_set
+
+
+def test_key_ids_go_with_the_sets():
+    from tracer.pathsof.path_set import _key_ids
+
+    def keyed(n: int) -> PathsOf[Any]:
+        return PathsOf(Mapping[str, int]).eg([_, "key", f"only here {n}"])
+
+    path_set = keyed(0).path_set
+    before = len(_key_ids)
+    for n in range(1, 100):
+        keyed(n).path_set.merge(path_set)
+    gc.collect()
+    keyed(100).path_set
+    assert len(_key_ids) <= before + 1
+    assert list(path_set) == [(_, "key", "only here 0")]
+
+
+@dataclass(frozen=True)
+class Deep:
+    deeper: Mapping[str, Deep]
+
+
+def test_deeper_than_the_recursion_limit():
+    deep = Deep(frozendict())
+    # (Three keys a level)
+    for __ in range(sys.getrecursionlimit() // 2):
+        deep = Deep(frozendict({"k": deep}))
+    tree = PathsOf.an(deep)
+    lower = tree.remove_lowest_level()
+    path_set, lower_set = tree.path_set, lower.path_set
+
+    assert path_set.to_paths() == tree
+    assert path_set.extends(lower_set) and not lower_set.extends(path_set)
+    assert path_set.covers(lower_set.merge(lower_set))
+    assert path_set.extract(lower_set).to_paths() == tree
+
+
+def test_nested_wildcards_that_dont_match():
+    def deep(innermost: str) -> PathsOf[Deep]:
+        deep = Deep(frozendict({innermost: Deep(frozendict())}))
+        for __ in range(20):
+            deep = Deep(frozendict({"k": deep}))
+        return PathsOf.an(deep)
+
+    k, j = deep("k"), deep("j")
+    # Each wildcard only tried the once, or this is 2 ** 20 tries
+    assert not k.path_set.extends(j.path_set)
+    assert not k.path_set.covers(j.path_set.merge(k.path_set))
+    assert k.extends(j) == k.path_set.extends(j.path_set)
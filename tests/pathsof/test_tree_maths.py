@@ -1,3 +1,8 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import sys
+from typing import Collection, Mapping
+
 from frozendict import deepfreeze
 
 from tracer.pathsof import PathsOf
@@ -36,3 +41,204 @@ def test_remove_lowest_level():
     assert paths is not None and paths.assembled == {}
     paths = paths.remove_lowest_level_or_none()
     assert paths is None
+
+
+def test_covers_memoised():
+    from tracer.cache import cache_info
+
+    name = "tracer.pathsof.tree_maths.covers._covers"
+    paths = PathsOf.a(deepfreeze({"a": {"b": {}}, "c": {}}))
+    selection = paths.remove_lowest_level()
+
+    assert paths.covers(selection)
+    before = cache_info(name)[name]
+    assert paths.covers(selection)
+    after = cache_info(name)[name]
+
+    assert after.hits == before.hits + 1
+    assert after.misses == before.misses
+
+
+def test_summary_never_rejects_a_real_cover():
+    from tracer.pathsof._summary import cannot_cover, cannot_extract_all
+
+    paths = PathsOf.a(
+        deepfreeze({"a": {"a": {"a": {}, "b": {}}, "b": {"a": {"a": {}}}}}),
+    )
+    truncations = [paths]
+    while (truncated := truncations[-1].remove_lowest_level_or_none()) is not None:
+        truncations.append(truncated)
+
+    for bigger_n, bigger in enumerate(truncations):
+        assert not cannot_cover(bigger, bigger, True)
+        assert bigger.extends(bigger)
+        for smaller in truncations[bigger_n:]:
+            assert not cannot_cover(bigger, smaller, False)
+            assert bigger.covers(smaller)
+            assert not cannot_extract_all(bigger, smaller)
+
+
+def test_summary_rejects_missing_keys():
+    from tracer.pathsof._summary import cannot_cover
+
+    ab = PathsOf.a(deepfreeze({"a": {"b": {}}}))
+    ac = PathsOf.a(deepfreeze({"a": {"c": {}}}))
+
+    # The inner mapping keys differ, under wildcards
+    assert cannot_cover(ab, ac, True)
+    assert not ab.covers(ac)
+    assert ab.covers(ab.remove_lowest_level())
+
+
+@dataclass(frozen=True)
+class Nest:
+    value: int
+    nested: Collection[Nest]
+
+
+def test_deeper_than_the_recursion_limit():
+    depth = sys.getrecursionlimit() * 5
+    instance = Nest(0, ())
+    for n in range(1, depth):
+        instance = Nest(n, (instance,))
+
+    paths = PathsOf(Nest).specifically(instance)
+    lower = paths.remove_lowest_level()
+    assert paths.extends(lower) and not lower.extends(paths)
+    assert paths.merge(lower) is paths
+    assert paths.extract(lower) is paths
+    assert PathsOf(Nest).eg(paths.paths) is paths
+
+    assembled = paths.assembled
+    for n in reversed(range(depth)):
+        assert assembled.value == n
+        (assembled,) = assembled.nested or (None,)
+
+
+def test_merge_all():
+    from functools import reduce
+
+    from tracer.pathsof.tree_maths import merge_all
+    from tracer.pathsof.tree_maths.single_wildcard_subtrees import (
+        single_wildcard_subtrees,
+    )
+
+    paths = PathsOf.a(
+        deepfreeze({"a": {"a": {"a": {}, "b": {}}, "b": {"a": {"a": {}}}}, "b": {}})
+    )
+    pieces = list(single_wildcard_subtrees(paths))
+    assert len(pieces) > 2
+    for merge_wildcards in [False, True]:
+        assert merge_all(pieces, merge_wildcards=merge_wildcards) == reduce(
+            lambda a, b: a.merge(b, merge_wildcards=merge_wildcards), pieces
+        )
+    assert merge_all(pieces) == paths
+    assert merge_all([paths]) == paths
+
+
+def test_str_deeper_than_the_recursion_limit():
+    # (Not as deep as above, the indents make it quadratic)
+    depth = sys.getrecursionlimit() + 100
+    instance = Nest(0, ())
+    for n in range(1, depth):
+        instance = Nest(n, (instance,))
+
+    assert str(PathsOf.an(instance)).count("nested") == depth
+
+
+def test_single_wildcard_subtrees_one_at_a_time():
+    from itertools import islice, product
+
+    from tracer.pathsof.tree_maths.single_wildcard_subtrees import (
+        single_wildcard_subtrees,
+    )
+
+    @dataclass(frozen=True)
+    class Wide:
+        a: Collection[int]
+        b: Collection[int]
+        c: Collection[int]
+
+    values = tuple(range(50))
+    # 125,000 of them, but only the first few get made
+    paths = PathsOf.a(Wide(values, values, values))
+    assert [
+        subtree.assembled for subtree in islice(single_wildcard_subtrees(paths), 3)
+    ] == [Wide((0,), (0,), (a,)) for a in range(3)]
+
+    small = PathsOf.a(Wide((1, 2), (3,), (4, 5)))
+    assert [subtree.assembled for subtree in single_wildcard_subtrees(small)] == [
+        Wide((a,), (b,), (c,)) for a, b, c in product((1, 2), (3,), (4, 5))
+    ]
+
+
+@dataclass(frozen=True)
+class Item:
+    values: Mapping[str, int]
+    notes: Collection[str]
+
+
+@dataclass(frozen=True)
+class Resource:
+    items: Mapping[str, Item]
+    tags: Collection[str]
+
+
+def test_extract_matches_extracting_single_wildcard_subtrees():
+    from dataclasses import replace
+
+    from frozendict import frozendict
+
+    from tracer import _
+    from tracer.pathsof.tree_maths.extract import _extract_single_wildcards
+    from tracer.pathsof.tree_maths.single_wildcard_subtrees import (
+        single_wildcard_subtrees,
+    )
+
+    def item(n: int) -> Item:
+        return Item(
+            frozendict({f"v{m}": m for m in range(n)}), tuple(map(str, range(n)))
+        )
+
+    source = (
+        PathsOf(Resource)
+        .specifically(Resource(frozendict({"a": item(2), "b": item(0)}), ("x", "y")))
+        .merge(PathsOf(Resource).specifically(Resource(frozendict({"a": item(3)}), ())))
+    )
+    for query_paths in [
+        [["items", _, "value", "values", _]],
+        [["items", _, "key"], ["tags", _]],
+        [["items", _, "key", "b"], ["items", _, "value", "notes", _]],
+        [["items", _, "value", "values", _, "key", "v2"]],
+        [["tags", _, "y"]],
+        [["items"]],
+    ]:
+        query = PathsOf(Resource).from_paths(query_paths)
+        for must_match_all in [True, False]:
+            expected = replace(source, paths=frozendict())
+            for subtree in single_wildcard_subtrees(source):
+                if (
+                    extracted := _extract_single_wildcards(
+                        subtree, query, must_match_all=must_match_all
+                    )
+                ) is not None:
+                    expected = expected.merge(extracted)
+            assert source.extract(query, must_match_all=must_match_all) == expected
+
+
+def test_lowest_levels_removed():
+    paths = PathsOf.a(
+        deepfreeze({"a": {"a": {"a": {}, "b": {}}, "b": {"a": {"a": {}}}}, "b": 1})
+    )
+    one_at_a_time = []
+    lower = paths.remove_lowest_level_or_none()
+    while lower is not None:
+        one_at_a_time.append(lower)
+        lower = lower.remove_lowest_level_or_none()
+
+    levels = list(paths.lowest_levels_removed())
+    assert levels == one_at_a_time
+    assert not levels[-1]
+    # What doesn't go as deep as the lowest level is shared
+    ((__, b),) = paths.item_index.items["b"]
+    assert levels[0].item_index.items["b"][0][1] is b
@@ -0,0 +1,75 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Collection, Mapping
+
+import pytest
+
+from tracer.pathsof import PathsOf
+from tracer.pathsof.wildcard import _
+
+
+@dataclass(frozen=True)
+class Flat:
+    a: str
+    b: int | None
+    c: str
+
+
+@dataclass(frozen=True)
+class A:
+    a: Mapping[str, B]
+    flats: Collection[Flat]
+
+
+@dataclass(frozen=True)
+class B:
+    b: Mapping[str, Collection[str]]
+
+
+A_PATHS = [
+    ["a", _, "key"],
+    ["a", _, "value", "b", _, "key"],
+    ["a", _, "value", "b", _, "value", _],
+    ["flats", _, "a"],
+    ["flats", _, "b"],
+    ["flats", _, "c"],
+]
+
+
+def test_extracting_and_snipping_same_as_trees(
+    random_selections: Callable[..., list[PathsOf[A]]],
+):
+    sources = [PathsOf(A).full, *random_selections(A, A_PATHS, 10)]
+    for source in sources:
+        assert source.view.materialised() is source
+        for query in random_selections(A, A_PATHS, 10):
+            assert source.view.extracting(query).materialised() == source.extract(
+                query, must_match_all=False
+            )
+        for path in (["a"], ["flats", _, "b"], ["a", _, "value", "b"]):
+            assert source.view.snipping(path).materialised() == source.snip_off(path)
+            query = PathsOf(A).eg(["a", _, "value", "b", _])
+            assert source.view.extracting(query).snipping(
+                path
+            ).materialised() == source.extract(query, must_match_all=False).snip_off(
+                path
+            )
+
+
+def test_navigation():
+    tree = PathsOf.an(A(a={"k": B(b={"j": ("x", "y")})}, flats=(Flat("a", 1, "c"),)))
+    view = tree.view.extracting(PathsOf(A).eg(["a", _, "value", "b"]))
+    assert list(view) == ["a"]
+    (item,) = view["a"].wildcards()
+    assert list(item) == ["value"]
+    assert (
+        item.at(["value", "b"]).tree
+        is tree["a"].get(next(iter(tree["a"])))["value"]["b"]
+    )
+    assert not list(view["a"].wildcards(where=lambda item: "key" in item))
+    assert "flats" not in view and "flats" in tree.view
+
+
+def test_no_must_match_all():
+    with pytest.raises(ValueError):
+        PathsOf(A).full.view.extracting(PathsOf(A).eg(["a"]), must_match_all=True)
@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+import gc
+import weakref
+
+from tracer.cache import cache, cache_info, set_cache_limit
+from tracer.pathsof import PathsOf
+from tracer.stack import Steps
+
+
+def test_exact_keys():
+    calls: list[object] = []
+
+    @cache
+    def identity(x: object) -> object:
+        calls.append(x)
+        return x
+
+    # -1 and -2 have the same hash
+    assert hash(-1) == hash(-2)
+    assert identity(-1) == -1
+    assert identity(-2) == -2
+    assert identity(-1) == -1
+    assert calls == [-1, -2]
+
+
+def test_lru_eviction_and_counters():
+    @cache(maxsize=2)
+    def double(x: int) -> int:
+        return x * 2
+
+    for x in (1, 2, 1, 3, 2):
+        double(x)
+
+    ((_, info),) = cache_info(double).items()
+    assert (info.hits, info.misses, info.evictions) == (1, 4, 2)
+    assert info.currsize == 2
+
+    set_cache_limit(double, 1)
+    ((_, info),) = cache_info(double).items()
+    assert (info.evictions, info.maxsize, info.currsize) == (3, 1, 1)
+
+
+@dataclass(frozen=True)
+class Pair:
+    a: str
+    b: str
+
+
+def test_per_instance_cache_dies_with_instance():
+    paths = PathsOf.a(Pair("x", "y"))
+    assembled = paths.assembled
+    assert paths.assembled is assembled
+    assembled_ref = weakref.ref(assembled)
+
+    del paths, assembled
+    gc.collect()
+    assert assembled_ref() is None
+
+
+def test_equal_but_differently_ordered_trees_assemble_separately():
+    forwards = (Pair("x", "x"), Pair("y", "y"))
+    backwards = forwards[::-1]
+    assert PathsOf.a(forwards) == PathsOf.a(backwards)
+    assert PathsOf.a(forwards).assembled == forwards
+    assert PathsOf.a(backwards).assembled == backwards
+
+
+def test_steps_recurse_through_the_cache():
+    calls: list[int] = []
+
+    @cache(maxsize=None, steps=True)
+    def triangle(n: int) -> Steps[int]:
+        calls.append(n)
+        return n + (yield triangle.steps(n - 1)) if n else 0
+
+    # Way past the recursion limit, on the explicit stack
+    assert triangle(10_000) == 10_000 * 10_001 // 2
+    assert len(calls) == 10_001
+    assert triangle(10_001) == 10_001 * 10_002 // 2
+    assert len(calls) == 10_002
@@ -11,7 +11,7 @@ from .pathsof import (
     PathKey as PathKey,
 )
 from .pathsof.hole import hole as hole, is_hole as is_hole
-from .pathsof.mapping import MappingItem as MappingItem
+from .pathsof.mapping import MappingItem as MappingItem, MappingKey as MappingKey
 from .pathsof.wildcard import _ as _
 from .comprehension_idioms import (
     assert_isinstance as assert_isinstance,
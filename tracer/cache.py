@@ -1,8 +1,10 @@
+from collections import OrderedDict
 from functools import wraps
 from typing import (
     Any,
     Callable,
-    MutableMapping,
+    Hashable,
+    NamedTuple,
     Optional,
     TypeVar,
     Union,
@@ -10,47 +12,260 @@ from typing import (
     overload,
 )
 
+from .stack import Steps, run
+
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+DEFAULT_MAXSIZE = 1024
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: Optional[int]
+    """`None` for `per_instance` caches, which aren't tracked centrally"""
+
+
+_MISSING = object()
+_KWARGS_MARK = object()
+
+
+def _make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+    """
+    The arguments themselves, so a lookup is a real `==` comparison
+    and not just a hash that could collide
+    """
+    if not kwargs:
+        return args
+    return (*args, _KWARGS_MARK, *kwargs.items())
+
+
+class LRUCache:
+    """Least recently used entries are evicted beyond `maxsize` (`None` is unbounded)"""
+
+    __slots__ = ("_entries", "_stats", "generation")
+
+    def __init__(self, stats: "CacheStats"):
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._stats = stats
+        self.generation = stats.generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        """`get` without it counting as a use"""
+        return self._entries.get(key, _MISSING)
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = value
+        self.shrink()
+
+    def shrink(self):
+        maxsize = self._stats.maxsize
+        if maxsize is None:
+            return
+        while len(self._entries) > maxsize:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+
+class CacheStats:
+    """Counters and limit shared by everything caching one function"""
+
+    __slots__ = ("hits", "misses", "evictions", "maxsize", "generation")
+
+    def __init__(self, maxsize: Optional[int]):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.maxsize = maxsize
+        self.generation = 0
+        """Bumped to invalidate `per_instance` caches we can't reach directly"""
+
+
+class CachedFunction:
+    """Bookkeeping for a function wrapped by `cache`, see `cache_info`"""
+
+    def __init__(self, name: str, *, maxsize: Optional[int], per_instance: bool):
+        self.name = name
+        self.per_instance = per_instance
+        self.stats = CacheStats(maxsize)
+        self.shared = None if per_instance else LRUCache(self.stats)
+
+    def instance_cache(self, instance: Any) -> LRUCache:
+        try:
+            caches: dict[str, LRUCache] = instance._caches
+        except AttributeError:
+            caches = {}
+            # Instances are typically frozen
+            object.__setattr__(instance, "_caches", caches)
+
+        lru = caches.get(self.name)
+        if lru is None or lru.generation != self.stats.generation:
+            lru = caches[self.name] = LRUCache(self.stats)
+        return lru
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.stats.hits,
+            misses=self.stats.misses,
+            evictions=self.stats.evictions,
+            maxsize=self.stats.maxsize,
+            currsize=None if self.shared is None else len(self.shared),
+        )
+
+    def clear(self):
+        self.stats.generation += 1
+        if self.shared is not None:
+            self.shared.clear()
+
+    def set_maxsize(self, maxsize: Optional[int]):
+        self.stats.maxsize = maxsize
+        if self.shared is not None:
+            self.shared.shrink()
+
+
+_registry: dict[str, CachedFunction] = {}
+
 
 @overload
 def cache(
-    fn: None = None, *, cache_obj: Optional[MutableMapping[str, Any]] = None
+    fn: None = None,
+    *,
+    maxsize: Optional[int] = DEFAULT_MAXSIZE,
+    per_instance: bool = False,
+    steps: bool = False,
 ) -> Callable[[F], F]: ...
 
 
 @overload
 def cache(
-    fn: F, *, cache_obj: Optional[MutableMapping[str, Any]] = None
+    fn: F,
+    *,
+    maxsize: Optional[int] = DEFAULT_MAXSIZE,
+    per_instance: bool = False,
+    steps: bool = False,
 ) -> F: ...
 
 
 def cache(
     fn: Optional[F] = None,
     *,
-    cache_obj: Optional[MutableMapping[str, Any]] = None,
+    maxsize: Optional[int] = DEFAULT_MAXSIZE,
+    per_instance: bool = False,
+    steps: bool = False,
 ) -> Union[Callable[[F], F], F]:
     """
-    Really basic unlimited cache (i.e. it's a dict), only use for fixed small
-    known input set
+    LRU cache keyed on the exact arguments
+
+    `per_instance` is for methods: the entries live on the instance
+    (first argument) rather than in here, so they go when it does, and
+    only the rest of the arguments make up the key. `maxsize` is then a
+    limit per instance. It's also what you want for `PathsOf`s, where
+    `==` ignores the order of children but some results (assembling a
+    `Collection`) don't
+
+    `steps` is for recursive functions written as `stack.Steps`
+    generators: calling it runs them (on an explicit stack), and its
+    `steps` attribute is what to `yield` for a recursive call, the cached
+    value if there is one
+
+    Limits can be changed after the fact with `set_cache_limit`, and
+    counters read with `cache_info`. `per_instance` ones also have `peek`
+    (the cached value if there is one, else `None`, without working it
+    out) and `prime` (for values already known some other way)
 
     Using this instead of functools because functools has some sort of type
     weirdness when used with properties (IIRC)
     """
 
-    _cache_obj: MutableMapping[str, Any] = (
-        {} if cache_obj is None else cache_obj
-    )
-
     def accepts_fn(fn: F) -> F:
-        @wraps(fn)
-        def cached(*args: Any, **kwargs: Any) -> Any:
-            key = str(hash((args, tuple((k, v) for k, v in kwargs.items()))))
-            if key not in _cache_obj:
-                _cache_obj[key] = fn(*args, **kwargs)
+        cached_function = CachedFunction(
+            f"{fn.__module__}.{fn.__qualname__}",
+            maxsize=maxsize,
+            per_instance=per_instance,
+        )
+        _registry[cached_function.name] = cached_function
+
+        if per_instance:
+
+            @wraps(fn)
+            def cached(instance: Any, *args: Any, **kwargs: Any) -> Any:
+                lru = cached_function.instance_cache(instance)
+                key = _make_key(args, kwargs)
+                value = lru.get(key)
+                if value is _MISSING:
+                    value = fn(instance, *args, **kwargs)
+                    if steps:
+                        value = run(value)
+                    lru.put(key, value)
+                return value
+
+            def cached_steps(instance: Any, *args: Any, **kwargs: Any) -> Any:
+                lru = cached_function.instance_cache(instance)
+                key = _make_key(args, kwargs)
+                value = lru.get(key)
+                if value is _MISSING:
+                    return _stored(lru, key, fn(instance, *args, **kwargs))
+                return value
+
+            def peek(instance: Any, *args: Any, **kwargs: Any) -> Any:
+                value = cached_function.instance_cache(instance).peek(
+                    _make_key(args, kwargs)
+                )
+                return None if value is _MISSING else value
+
+            def prime(instance: Any, value: Any, *args: Any, **kwargs: Any):
+                cached_function.instance_cache(instance).put(
+                    _make_key(args, kwargs), value
+                )
+
+            setattr(cached, "peek", peek)
+            setattr(cached, "prime", prime)
+
+        else:
+            shared = cast(LRUCache, cached_function.shared)
 
-            return _cache_obj[key]
+            @wraps(fn)
+            def cached(*args: Any, **kwargs: Any) -> Any:
+                key = _make_key(args, kwargs)
+                value = shared.get(key)
+                if value is _MISSING:
+                    value = fn(*args, **kwargs)
+                    if steps:
+                        value = run(value)
+                    shared.put(key, value)
+                return value
+
+            def cached_steps(*args: Any, **kwargs: Any) -> Any:
+                key = _make_key(args, kwargs)
+                value = shared.get(key)
+                if value is _MISSING:
+                    return _stored(shared, key, fn(*args, **kwargs))
+                return value
+
+        if steps:
+            setattr(cached, "steps", cached_steps)
+
+        setattr(cached, "cache_info", cached_function.info)
+        setattr(cached, "cache_clear", cached_function.clear)
+        setattr(cached, "set_cache_limit", cached_function.set_maxsize)
 
         return cast(F, cached)
 
@@ -58,3 +273,39 @@ def cache(
         return accepts_fn(fn)
     else:
         return accepts_fn
+
+
+def _stored(lru: LRUCache, key: Hashable, steps: Steps[Any]) -> Steps[Any]:
+    value = yield steps
+    lru.put(key, value)
+    return value
+
+
+def _cached_function(fn_or_name: Callable[..., Any] | str) -> CachedFunction:
+    if isinstance(fn_or_name, str):
+        return _registry[fn_or_name]
+    if isinstance(fn_or_name, property) and fn_or_name.fget is not None:
+        fn_or_name = fn_or_name.fget
+    return _registry[f"{fn_or_name.__module__}.{fn_or_name.__qualname__}"]
+
+
+def cache_info(
+    fn_or_name: Callable[..., Any] | str | None = None,
+) -> dict[str, CacheInfo]:
+    """
+    Counters for one cached function (or cached `property`, or its dotted
+    name), or for all of them
+    """
+    if fn_or_name is None:
+        return {name: cached.info() for name, cached in _registry.items()}
+    cached = _cached_function(fn_or_name)
+    return {cached.name: cached.info()}
+
+
+def set_cache_limit(fn_or_name: Callable[..., Any] | str, maxsize: Optional[int]):
+    _cached_function(fn_or_name).set_maxsize(maxsize)
+
+
+def clear_caches():
+    for cached in _registry.values():
+        cached.clear()
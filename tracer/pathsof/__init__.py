@@ -1,43 +1,111 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Any, Hashable, Iterator, Mapping
+from typing import (
+    Any,
+    Hashable,
+    ItemsView,
+    Iterator,
+    KeysView,
+    Mapping,
+    ValuesView,
+)
 
 from frozendict import frozendict
 
 from ..cache import cache
 
+from ._interning import EqClass, Interning
+from ._summary import Summary
+from .children import Children
+from .columnar import Columns
+from .leaf import Leaf
+
 
 PathKey = Hashable
 # Just a forward reference for the Mapping inherit
 type PathValue = PathsOf[Any]
 
 
-@dataclass(frozen=True, kw_only=True)
-class PathsOf[T](Mapping[PathKey, PathValue]):
+@dataclass(frozen=True, kw_only=True, eq=False, slots=True, weakref_slot=True)
+class PathsOf[T](Mapping[PathKey, PathValue], metaclass=Interning):
+    """
+    Interned: structurally identical trees are the same object (see
+    `_interning`), so `==` and `hash` are O(1)
+    """
+
     type: type[T] = field(kw_only=False)
-    paths: frozendict[PathKey, PathsOf[Any]] = frozendict()
+    paths: frozendict[PathKey, PathsOf[Any]] | Leaf | Children | Columns = frozendict()
+    """`Leaf` for a single value, `Children` for wide nodes, `Columns` for big
+    collections of dataclasses"""
     sequence_length: int | None = None
     """If `T` is a `Sequence` of some kind"""
 
+    # Not set by `__init__`: by `Interning` on construction, and `_caches`
+    # by `cache` on first use
+    _eq_class: EqClass = field(init=False, repr=False)
+    _hash: int = field(init=False, repr=False)
+    _summary: Summary = field(init=False, repr=False)
+    _consolidated: bool = field(init=False, repr=False)
+    _explicit: Mapping[PathKey, PathsOf[Any]] = field(init=False, repr=False)
+    """The children that aren't under wildcard keys (`paths` if that's all)"""
+    _wildcards: Mapping[PathKey, PathsOf[Any]] = field(init=False, repr=False)
+    """The children that are (`paths` if that's all)"""
+    _caches: dict[str, Any] = field(init=False, repr=False)
+
     def __post_init__(self): ...
 
     """FIXME Validation of `paths` (and other fields) based on `prototype`"""
 
-    @cache
+    @cache(per_instance=True)
     def __str__(self) -> str:
         return self._as_indent_tree()
 
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, PathsOf):
+            # E.g. `lazy.LazyPathsOf`s know how to compare themselves
+            return NotImplemented
+        return self._eq_class is other._eq_class
+
+    def __hash__(self) -> int:
+        return self._hash
+
     def __getitem__(self, key: PathKey) -> PathsOf[Any]:
         return self.paths[key]
 
+    def __contains__(self, key: object) -> bool:
+        return key in self.paths
+
+    def get(self, key: PathKey, default: Any = None) -> Any:
+        return self.paths.get(key, default)
+
+    def keys(self) -> KeysView[PathKey]:
+        return self.paths.keys()
+
+    def items(self) -> ItemsView[PathKey, PathsOf[Any]]:
+        return self.paths.items()
+
+    def values(self) -> ValuesView[PathsOf[Any]]:
+        return self.paths.values()
+
     def __iter__(self) -> Iterator[PathKey]:
         return iter(self.paths)
 
-    @cache
+    @cache(per_instance=True)
     def __len__(self) -> int:
         return len(self.paths)
 
-    from ._construction import a, an, specifically, eg, full, snip_off
+    from ._construction import (
+        a,
+        an,
+        specifically,
+        lazily,
+        eg,
+        from_paths,
+        full,
+        snip_off,
+    )
     from ._serialisation import (
         as_indent_tree as _as_indent_tree,
         as_key_str as _as_key_str,
@@ -45,12 +113,17 @@ class PathsOf[T](Mapping[PathKey, PathValue]):
     from ._type_checking import type_at_key as _type_at_key
     from ._assembly import assembled
     from ._disassembly import paths_from_object as _paths_from_object
+    from .bitset import bitset
+    from .mapping import item_index, mapping_item
+    from .path_set import path_set
+    from .view import view
 
     from .tree_maths import (
         extends,
         extract,
         covers,
         merge,
+        lowest_levels_removed,
         remove_lowest_level,
         remove_lowest_level_or_none,
     )
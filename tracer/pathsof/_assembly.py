@@ -1,85 +1,200 @@
 from __future__ import annotations
-import builtins
-from dataclasses import fields, is_dataclass
-import datetime
-import types
+from collections import abc
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
-    Collection,
-    Mapping,
-    Sequence,
     cast,
-    get_origin,
+    get_args,
 )
 
 from frozendict import frozendict
 
 
 from ..cache import cache
-from ..type_manipulation import annotation_type
+from ..stack import Steps, run
 
+from ._schema import Kind, schema_of
+from .columnar import Columns
 from .hole import Hole
+from .leaf import Leaf
 from .mapping import consolidate_mapping_tree
 
 if TYPE_CHECKING:
     from . import PathsOf
 
 
+type Assembler[T] = Callable[[PathsOf[T]], Steps[T] | T]
+"""
+Returns the steps (see `stack`) that assemble the value, or just the value
+when there's nothing underneath to recurse into
+"""
+
+
 @property
-@cache
+@cache(per_instance=True)
 def assembled[T](self: PathsOf[T]) -> T:
-    # Importing properly seems to have inevitable loop
-    from . import PathsOf
+    return run(assembler(self.type)(self))
+
+
+def _child_assembler(t: type[Any]) -> Assembler[Any]:
+    """
+    Assembles children expected to be `PathsOf[t]`, which they nearly always
+    are, but children keep their own type (e.g. `PathsOf.a` under an
+    untyped `Mapping`) and that's the one to go by
+    """
+    plan: Assembler[Any] | None = None
+
+    def assemble_child(paths: PathsOf[Any]) -> Any:
+        nonlocal plan
+        if paths.type is not t:
+            return assembler(paths.type)(paths)
+        if plan is None:
+            plan = assembler(t)
+        return plan(paths)
+
+    return assemble_child
+
+
+def _assemble_any(paths: PathsOf[Any]) -> Steps[Any] | Any:
+    return assembler(paths.type)(paths)
+
+
+@cache(maxsize=None)
+def assembler[T](t: type[T]) -> Assembler[T]:
+    """
+    Compiled `PathsOf[t]` -> `t` (with `Hole`s for anything missing)
+
+    Works straight off the tree in one pass; `Mapping`s are only
+    consolidated first if they aren't known to be already. Recursive calls
+    are yielded rather than made, so trees can be any depth
+    """
+    t_schema = schema_of(t)
+
+    match t_schema.kind:
+        case Kind.LEAF:
+
+            def leaf_plan(paths: PathsOf[T]) -> T:
+                if isinstance(paths.paths, Leaf):
+                    return cast(T, paths.paths.key)
+                match tuple(paths.paths):
+                    case (key,):
+                        return cast(T, key)
+                    case ():
+                        return cast(T, Hole())
+                    case _:
+                        raise Exception("Can't assemble multiple sum branches")
+
+            return leaf_plan
+
+        case Kind.UNION:
 
-    match self.type:
-        case (
-            datetime.datetime
-            | builtins.str
-            | builtins.int
-            | builtins.bool
-            | types.NoneType
-        ):
-            match tuple(self.keys()):
-                case (key,):
-                    return cast(T, key)
-                case ():
-                    return cast(T, Hole())
+            def union_plan(paths: PathsOf[T]) -> Steps[T] | T:
+                match tuple(paths.values()):
+                    case (member_paths,):
+                        return _assemble_any(member_paths)
+                    case ():
+                        return cast(T, Hole())
+                    case _:
+                        raise Exception("Can't assemble multiple sum branches")
+
+            return union_plan
+
+        case Kind.DATACLASS:
+            field_plans: tuple[tuple[str, Assembler[Any]], ...] = tuple(
+                (name, _child_assembler(t_schema.field_type(name)))
+                for name in t_schema.keys
+                if isinstance(name, str)
+            )
+
+            def dataclass_plan(paths: PathsOf[T]) -> Steps[T]:
+                children = paths.paths
+                values: dict[str, Any] = {}
+                for name, plan in field_plans:
+                    values[name] = (
+                        (yield plan(children[name])) if name in children else Hole()
+                    )
+                return t(**values)
+
+            return dataclass_plan
+
+        case Kind.MAPPING:
+            constructor = cast(
+                Callable[[Any], T],
+                frozendict if t_schema.origin is abc.Mapping else t_schema.origin,
+            )
+            match get_args(t):
+                case (key_type, value_type):
+                    assemble_key = _child_assembler(key_type)
+                    assemble_value = _child_assembler(value_type)
                 case _:
-                    raise Exception("Can't assemble multiple sum branches")
+                    assemble_key = assemble_value = _assemble_any
+
+            def mapping_plan(paths: PathsOf[T]) -> Steps[T]:
+                if not paths._consolidated:
+                    paths = consolidate_mapping_tree(paths)
+                items: dict[Any, Any] = {}
+                for item in paths.paths.values():
+                    key = (yield assemble_key(item["key"])) if "key" in item else Hole()
+                    items[key] = (
+                        (yield assemble_value(item["value"]))
+                        if "value" in item
+                        else Hole()
+                    )
+                return constructor(items)
+
+            return mapping_plan
+
+        case Kind.COLLECTION:
+            constructor = cast(
+                Callable[[Any], T],
+                (
+                    tuple
+                    if t_schema.origin in (abc.Collection, abc.Sequence)
+                    else t_schema.origin
+                ),
+            )
+            assemble_element = (
+                _child_assembler(t_schema.element_type)
+                if t_schema.element_type is not None
+                else _assemble_any
+            )
+
+            # TODO Sequence
+
+            def collection_plan(paths: PathsOf[T]) -> Steps[T]:
+                if isinstance(paths.paths, Columns):
+                    return constructor((yield _assembled_rows(paths.paths)))
+                elements: list[Any] = []
+                for element in paths.paths.values():
+                    elements.append((yield assemble_element(element)))
+                return constructor(elements)
+
+            return collection_plan
+
         case _:
-            pass
-
-    if is_dataclass(self.type):
-        return self.type(
-            **{
-                f.name: self[f.name].assembled if f.name in self else Hole()
-                for f in fields(self.type)
-            }
-        )
-
-    origin = get_origin(self.type) or self.type
-
-    if issubclass(origin, Mapping):
-        if origin == get_origin(Mapping[Any, Any]):
-            origin = frozendict
-        return cast(Callable[[Any], T], origin)(
-            {
-                paths["key"].assembled if "key" in paths else Hole(): (
-                    paths["value"].assembled if "value" in paths else Hole()
-                )
-                for paths in consolidate_mapping_tree(self).values()
-            }
-        )
-
-    # TODO Sequence
-
-    if issubclass(origin, Collection):
-        if origin in map(get_origin, [Collection[Any], Sequence[Any]]):
-            origin = tuple
-        return cast(Callable[[Any], T], origin)(
-            paths.assembled for paths in self.values()
-        )
-
-    return cast(T, Hole())
+            return lambda paths: cast(T, Hole())
+
+
+def _assembled_rows(columns: Columns) -> Steps[list[Any]]:
+    """Each distinct field value is only assembled once"""
+    element_schema = schema_of(columns.element_type)
+    field_values: list[list[Any]] = []
+    for name, column in zip(columns.names, columns.columns):
+        assemble = _child_assembler(element_schema.field_type(name))
+        # By identity, `==` cells can still assemble differently (order)
+        assembled_cells: dict[int, Any] = {}
+        values: list[Any] = []
+        for cell in column:
+            if cell is None:
+                values.append(Hole())
+                continue
+            if id(cell) not in assembled_cells:
+                assembled_cells[id(cell)] = yield assemble(cell)
+            values.append(assembled_cells[id(cell)])
+        field_values.append(values)
+
+    return [
+        columns.element_type(**dict(zip(columns.names, values)))
+        for values in zip(*field_values)
+    ]
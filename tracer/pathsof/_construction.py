@@ -1,56 +1,72 @@
 from __future__ import annotations
-from dataclasses import fields, is_dataclass, replace
+from dataclasses import replace
 from typing import (
     TYPE_CHECKING,
     Any,
     Collection,
+    Iterable,
     Mapping,
     Sequence,
-    cast,
-    get_origin,
     overload,
 )
 
 from frozendict import frozendict
 
-from tracer.pathsof._type_checking import union
-
 
 if TYPE_CHECKING:
     from . import PathsOf
 
-from ._disassembly import paths_from_object
-from .mapping import consolidate_mapping_tree
-from .wildcard import Wildcard, is_wildcard, populate_wildcards
+from ..stack import Steps, run
+
+from ._disassembly import disassembler
+from ._schema import Kind, schema_of
+from .full import FullPathsOf, full_paths_of
+from .lazy import LazyPathsOf
+from .children import with_child, without_child
+from .mapping import MappingKey, consolidate_mapping_tree
+from .wildcard import Wildcard, is_wildcard, populate_wildcards, _
 
 from . import PathKey, PathValue
 
 
 @staticmethod
-def a[T](instance: T) -> PathsOf[T]:
+def a[T](instance: T, *, only: PathsOf[T] | None = None) -> PathsOf[T]:
     from . import PathsOf
 
-    return PathsOf.an(instance)
+    return PathsOf.an(instance, only=only)
 
 
 @staticmethod
-def an[T](instance: T) -> PathsOf[T]:
+def an[T](instance: T, *, only: PathsOf[T] | None = None) -> PathsOf[T]:
+    """
+    `only` is the same as `.extract(only)` afterwards, but without
+    disassembling any of `instance` that `only` doesn't reach
+    """
     from . import PathsOf
 
-    return PathsOf(type(instance)).specifically(instance)
+    if only is None:
+        return PathsOf(type(instance)).specifically(instance)
+    return PathsOf(type(instance)).lazily(instance).extract(only)
 
 
 def specifically[T](self: PathsOf[T], instance: T) -> PathsOf[T]:
     assert not self.paths
-    origin = get_origin(self.type) or self.type
-    assert isinstance(instance, origin)
-    return replace(
-        self,
-        paths=paths_from_object(self.type, instance),
-        sequence_length=(
-            len(cast(Sequence[Any], instance)) if issubclass(origin, Sequence) else None
-        ),
-    )
+    schema = schema_of(self.type)
+    if schema.kind is not Kind.UNION:
+        assert isinstance(instance, schema.origin)
+    return run(disassembler(self.type)(instance))
+
+
+def lazily[T](self: PathsOf[T], instance: T) -> LazyPathsOf[T]:
+    """
+    `specifically`, but only disassembling as much of `instance` as gets
+    looked at (see `lazy`)
+    """
+    assert not self.paths
+    schema = schema_of(self.type)
+    if schema.kind is not Kind.UNION:
+        assert isinstance(instance, schema.origin)
+    return LazyPathsOf(self.type, instance)
 
 
 @overload
@@ -116,42 +132,70 @@ def eg[T](
         return pathsof
 
 
-def all_keys[T](t: type[T]) -> Collection[PathKey]:
-    if t_union := union(t):
-        return t_union
-
-    origin = get_origin(t) or t
+def from_paths[T](self: PathsOf[T], paths: Iterable[Sequence[PathKey]]) -> PathsOf[T]:
+    """
+    `merge(*(eg(path) for path in paths), merge_wildcards=True)`, as one
+    trie, with a type lookup per node rather than per path per node
 
-    if is_dataclass(origin):
-        return tuple(f.name for f in fields(origin))
+    Paths can go through `Mapping`s by key with `mapping.MappingKey`
+    segments
+    """
+    if self.paths:
+        raise Exception("Not building on nonempty trees yet")
+
+    root = _Node(self.type)
+    for path in paths:
+        pending = [(root, path)]
+        while pending:
+            node, path = pending.pop()
+            for key in path:
+                if isinstance(key, MappingKey):
+                    item = node.child(_)
+                    pending.append((item, ("key", key.key)))
+                    node = item.child("value")
+                else:
+                    node = node.child(key)
+    return replace(self, paths=run(_built(root)).paths)
+
+
+class _Node:
+    """`from_paths`'s trie, one node per distinct prefix (wildcards as `_`)"""
+
+    __slots__ = ("type", "children")
+
+    def __init__(self, t: type[Any]):
+        self.type = t
+        self.children: dict[PathKey, _Node] = {}
+
+    def child(self, key: PathKey) -> _Node:
+        if is_wildcard(key):
+            key = _
+        if (child := self.children.get(key)) is None:
+            child = self.children[key] = _Node(schema_of(self.type).type_at_key(key))
+        return child
+
+
+def _built(node: _Node) -> Steps[PathsOf[Any]]:
+    from . import PathsOf
 
-    # str is a Collection but damned if I'll treat it as one
-    if t is str:
-        return ()
+    children: dict[PathKey, PathValue] = {}
+    for key, child in node.children.items():
+        subpaths = yield _built(child)
+        children[Wildcard(subpaths) if key is _ else key] = subpaths
+    return PathsOf(node.type, paths=frozendict(children))
 
-    if issubclass(origin, Collection):
-        return (Wildcard(),)
 
-    return ()
+def all_keys[T](t: type[T]) -> Collection[PathKey]:
+    # (str is a Collection but damned if I'll treat it as one)
+    return schema_of(t).keys
 
 
 @property
-def full[T](self: PathsOf[T]) -> PathsOf[T]:
+def full[T](self: PathsOf[T]) -> FullPathsOf[T]:
+    """Every path there is, expanded as it's looked at (see `full`)"""
     if self.paths or self.sequence_length is not None:
         raise Exception("`full` is only allowed on an empty tree")
-
-    from . import PathsOf
-
-    return replace(
-        self,
-        paths=frozendict(
-            {
-                Wildcard(full_at_key) if is_wildcard(key) else key: full_at_key
-                for key in all_keys(self.type)
-                for full_at_key in (PathsOf(self._type_at_key(key)).full,)
-            }
-        ),
-    )
+    return full_paths_of(self.type)
 
 
 def snip_off[T](self: PathsOf[T], path: Sequence[PathKey]) -> PathsOf[T]:
@@ -163,6 +207,16 @@ def snip_off[T](self: PathsOf[T], path: Sequence[PathKey]) -> PathsOf[T]:
     """
     first, *rest = path
 
+    if not is_wildcard(first):
+        # Only the one child changes
+        if first not in self.paths:
+            return self
+        if rest:
+            return replace(
+                self, paths=with_child(self.paths, first, self[first].snip_off(rest))
+            )
+        return replace(self, paths=without_child(self.paths, first))
+
     if rest:
         return replace(
             self,
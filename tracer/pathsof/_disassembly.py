@@ -3,35 +3,265 @@ from dataclasses import fields, is_dataclass
 from datetime import datetime
 from types import EllipsisType
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Callable,
     Collection,
     Mapping,
-    # Sequence,
+    Sequence,
     cast,
     get_args,
     get_origin,
 )
+from weakref import WeakValueDictionary
 
 from frozendict import frozendict
 
 
-from ..type_manipulation import annotation_type, instance_union_member
+from ..cache import cache
+from ..stack import Steps, run
+from ..type_manipulation import annotation_type
 
-from ._type_checking import union
-from .mapping import MappingItem
+from ._interning import exact_key_token
+from ._schema import Kind, schema_of
+from . import columnar
+from .columnar import Columns
+from .leaf import Leaf
+from .mapping import MappingItem, mark_consolidated
 from .wildcard import Wildcard
 
+if TYPE_CHECKING:
+    from . import PathsOf
+
 from . import PathKey, PathValue
 
 
+type Disassembler[T] = Callable[[T], Steps[PathsOf[T]] | PathsOf[T]]
+"""
+Returns the steps (see `stack`) that make the tree, or just the tree when
+there's nothing underneath to recurse into
+"""
+
+_PLAIN_LEAVES = (str, int)
+
+
+@cache(maxsize=None)
+def disassembler[T](t: type[T]) -> Disassembler[T]:
+    """
+    Compiled equivalent of `PathsOf(t).specifically`, without the type
+    introspection (or `isinstance` checks) per value
+
+    Plans for the types underneath are looked up the first time they're
+    needed, so recursive types are fine, and recursive calls are yielded
+    rather than made, so instances can be any depth. Trees of real
+    instances have nothing to consolidate, so they're marked as such
+    """
+    from . import PathsOf
+
+    t_schema = schema_of(t)
+    sequence = t_schema.is_sequence
+
+    match t_schema.kind:
+        case Kind.UNION:
+
+            def union_plan(instance: Any) -> Steps[PathsOf[T]]:
+                member = t_schema.union_member(instance)
+                member_paths = yield disassembler(member)(instance)
+                return mark_consolidated(
+                    PathsOf(t, paths=frozendict({member: member_paths}))
+                )
+
+            return union_plan
+
+        case Kind.LEAF:
+            terminal = PathsOf(EllipsisType)
+            # Saves building a node just to have it interned away again
+            leaves: WeakValueDictionary[Any, PathsOf[T]] = WeakValueDictionary()
+
+            def leaf_plan(instance: Any) -> PathsOf[T]:
+                # Plain `str`s and `int`s are only `==` to themselves among
+                # these keys, so can skip the token (and its allocation)
+                key = (
+                    instance
+                    if type(instance) in _PLAIN_LEAVES
+                    else exact_key_token(instance)
+                )
+                if (leaf := leaves.get(key)) is None:
+                    leaf = leaves[key] = PathsOf(
+                        t,
+                        paths=Leaf(instance, terminal),
+                        sequence_length=len(instance) if sequence else None,
+                    )
+                return leaf
+
+            return leaf_plan
+
+        case Kind.DATACLASS:
+            origin = t_schema.origin
+            field_plans: tuple[tuple[str, Disassembler[Any]], ...] | None = None
+
+            def dataclass_plan(instance: Any) -> Steps[PathsOf[T]]:
+                nonlocal field_plans
+                if type(instance) is not origin:
+                    # Subclass instances can have more fields
+                    return (yield _interpreted(t, instance))
+                if field_plans is None:
+                    field_plans = tuple(
+                        (name, disassembler(t_schema.field_type(name)))
+                        for name in t_schema.keys
+                        if isinstance(name, str)
+                    )
+                children: dict[PathKey, PathValue] = {}
+                for name, plan in field_plans:
+                    children[name] = yield plan(getattr(instance, name))
+                return mark_consolidated(
+                    PathsOf(
+                        t,
+                        paths=frozendict(children),
+                        sequence_length=len(instance) if sequence else None,
+                    )
+                )
+
+            return dataclass_plan
+
+        case Kind.MAPPING if t_schema.element_type is not None:
+            item_type = t_schema.element_type
+            match get_args(t):
+                case (key_type, value_type):
+                    key_value_plans = None
+                case _:
+                    key_type = value_type = key_value_plans = None
+
+            def mapping_plan(instance: Any) -> Steps[PathsOf[T]]:
+                nonlocal key_value_plans
+                if key_value_plans is None and key_type is not None:
+                    key_value_plans = disassembler(key_type), disassembler(value_type)
+                key_plan, value_plan = key_value_plans or (_by_type, _by_type)
+                items: dict[PathKey, PathValue] = {}
+                for key, value in cast(Mapping[Any, Any], instance).items():
+                    key_paths = yield key_plan(key)
+                    value_paths = yield value_plan(value)
+                    item = mark_consolidated(
+                        PathsOf(
+                            item_type,
+                            paths=frozendict({"key": key_paths, "value": value_paths}),
+                        )
+                    )
+                    items[Wildcard(item)] = item
+                # Different keys, so nothing to consolidate
+                return mark_consolidated(PathsOf(t, paths=frozendict(items)))
+
+            return mapping_plan
+
+        case Kind.COLLECTION if t_schema.element_type is not None:
+            element_type = t_schema.element_type
+            element_plan = (
+                _by_type if element_type is object and not get_args(t) else None
+            )
+            element_schema = schema_of(element_type)
+            # Big collections of these go straight into columns (see
+            # `columnar`), without a node per element on the way
+            columns_fit = (
+                element_schema.kind is Kind.DATACLASS and not element_schema.is_sequence
+            )
+            field_plans: tuple[tuple[str, Disassembler[Any]], ...] | None = None
+
+            def columns(instance: Collection[Any]) -> Steps[Columns]:
+                nonlocal field_plans
+                if field_plans is None:
+                    field_plans = tuple(
+                        (name, disassembler(element_schema.field_type(name)))
+                        for name in element_schema.keys
+                        if isinstance(name, str)
+                    )
+                rows: list[tuple[PathsOf[Any], ...]] = []
+                for element in instance:
+                    row: list[PathsOf[Any]] = []
+                    for name, plan in field_plans:
+                        row.append((yield plan(getattr(element, name))))
+                    rows.append(tuple(row))
+                return Columns.from_rows(
+                    element_type, tuple(name for name, _ in field_plans), rows
+                )
+
+            def collection_plan(instance: Any) -> Steps[PathsOf[T]]:
+                nonlocal element_plan
+                if element_plan is None:
+                    element_plan = disassembler(element_type)
+                if (
+                    columns_fit
+                    and len(instance) >= columnar.COLUMNAR_THRESHOLD
+                    and all(
+                        type(element) is element_schema.origin for element in instance
+                    )
+                ):
+                    children: Mapping[PathKey, PathValue] = yield columns(instance)
+                else:
+                    elements: dict[PathKey, PathValue] = {}
+                    for element in instance:
+                        item_paths = yield element_plan(element)
+                        elements[Wildcard(item_paths)] = item_paths
+                    children = frozendict(elements)
+                return mark_consolidated(
+                    PathsOf(
+                        t,
+                        paths=children,
+                        sequence_length=len(instance) if sequence else None,
+                    )
+                )
+
+            return collection_plan
+
+        case _:
+            return lambda instance: _interpreted(t, instance)
+
+
+def _by_type(instance: Any) -> Steps[PathsOf[Any]] | PathsOf[Any]:
+    """`PathsOf.a`, for where there are no type args"""
+    return disassembler(type(instance))(instance)
+
+
+def interpreted[T](t: type[T], instance: T) -> PathsOf[T]:
+    """
+    `PathsOf(t).specifically(instance)` the long way round, working
+    everything out from `t` and `instance` at every level
+
+    The reference for `disassembler`, which uses it for anything it
+    hasn't got a plan for
+    """
+    return run(_interpreted(t, instance))
+
+
+def _interpreted[T](t: type[T], instance: T) -> Steps[PathsOf[T]]:
+    from . import PathsOf
+
+    origin = get_origin(t) or t
+    assert isinstance(instance, origin)
+    return PathsOf(
+        t,
+        paths=(yield _paths_from_object(t, instance)),
+        sequence_length=(
+            len(cast(Sequence[Any], instance)) if issubclass(origin, Sequence) else None
+        ),
+    )
+
+
 def paths_from_object[T](t: type[T], instance: T) -> frozendict[PathKey, PathValue]:
+    return run(_paths_from_object(t, instance))
+
+
+def _paths_from_object[T](
+    t: type[T], instance: T
+) -> Steps[frozendict[PathKey, PathValue]]:
+    t_schema = schema_of(t)
+
+    if t_schema.union_members:
+        union_member = t_schema.union_member(instance)
+        return frozendict({union_member: (yield _interpreted(union_member, instance))})
+
     # Importing properly seems to have inevitable loop
     from . import PathsOf
 
-    if t_union := union(t):
-        union_member = instance_union_member(instance, t_union)
-        return frozendict({union_member: PathsOf(union_member).specifically(instance)})
-
     match instance:
         case EllipsisType():
             return frozendict()
@@ -41,14 +271,18 @@ def paths_from_object[T](t: type[T], instance: T) -> frozendict[PathKey, PathVal
             pass
 
     if is_dataclass(instance):
-        return frozendict(
-            {
-                f.name: PathsOf(
-                    annotation_type(f.type, ctx_class=t),
-                ).specifically(getattr(instance, f.name))
-                for f in fields(instance)
-            }
-        )
+        # (Subclass instances can have more fields than `t` says, or other
+        # types for them)
+        own_fields = type(instance) is t_schema.origin
+        children: dict[PathKey, PathValue] = {}
+        for f in fields(instance):
+            field_type = (
+                t_schema.field_type(f.name)
+                if own_fields
+                else annotation_type(f.type, ctx_class=t)
+            )
+            children[f.name] = yield _interpreted(field_type, getattr(instance, f.name))
+        return frozendict(children)
 
     type_origin = get_origin(t) or t
 
@@ -56,48 +290,25 @@ def paths_from_object[T](t: type[T], instance: T) -> frozendict[PathKey, PathVal
         mapping_instance = cast(Mapping[Any, Any], instance)
         match get_args(t):
             case (key_type, value_type):
-                return frozendict(
-                    {
-                        Wildcard(item): item
-                        for key, value in mapping_instance.items()
-                        for item in (
-                            PathsOf(
-                                MappingItem[key_type, value_type],
-                                paths=frozendict(
-                                    {
-                                        "key": PathsOf(key_type).specifically(key),
-                                        "value": PathsOf(value_type).specifically(
-                                            value
-                                        ),
-                                    }
-                                ),
-                            ),
-                        )
-                    }
-                )
+                item_type = MappingItem[key_type, value_type]
             case ():
-                return frozendict(
-                    {
-                        Wildcard(item): item
-                        for key, value in mapping_instance.items()
-                        for item in (
-                            PathsOf(
-                                MappingItem[Any, Any],
-                                paths=frozendict(
-                                    {
-                                        "key": PathsOf.a(key),
-                                        "value": PathsOf.a(value),
-                                    }
-                                ),
-                            ),
-                        )
-                    }
-                )
+                key_type = value_type = None
+                item_type = MappingItem[Any, Any]
             case args:
                 raise Exception(
                     "Expected 0 or 2 (really, just 2 but `PathsOf(value)` is nice)"
                     f" type args to a `Mapping` subclass but got {args}"
                 )
+        items: dict[PathKey, PathValue] = {}
+        for key, value in mapping_instance.items():
+            key_paths = yield _interpreted(key_type or type(key), key)
+            value_paths = yield _interpreted(value_type or type(value), value)
+            item = PathsOf(
+                item_type,
+                paths=frozendict({"key": key_paths, "value": value_paths}),
+            )
+            items[Wildcard(item)] = item
+        return frozendict(items)
 
     # FIXME having numbers on sequences doesn't work with wildcardy
     #       `link`s. But whose problem is that, links not showing
@@ -126,25 +337,17 @@ def paths_from_object[T](t: type[T], instance: T) -> frozendict[PathKey, PathVal
         collection_instance = cast(Collection[Any], instance)
         match get_args(t):
             case collection_type,:
-                return frozendict(
-                    {
-                        Wildcard(item_paths): item_paths
-                        for item_paths in map(
-                            lambda item: PathsOf(collection_type).specifically(item),
-                            collection_instance,
-                        )
-                    }
-                )
+                pass
             case ():
-                return frozendict(
-                    {
-                        Wildcard(item_paths): item_paths
-                        for item_paths in map(PathsOf.a, collection_instance)
-                    }
-                )
+                collection_type = None
             case args:
                 raise Exception(
                     f"Expected 1 type arg to a `Collection` subclass but got {args}"
                 )
+        elements: dict[PathKey, PathValue] = {}
+        for item in collection_instance:
+            item_paths = yield _interpreted(collection_type or type(item), item)
+            elements[Wildcard(item_paths)] = item_paths
+        return frozendict(elements)
 
     raise Exception(f"Don't know how to make paths out of {instance}, type {t}.")
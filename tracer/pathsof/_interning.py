@@ -0,0 +1,225 @@
+"""
+Hash-consing for `PathsOf`
+
+Every `PathsOf` is built through `Interning.__call__`, which hands back the
+already-existing node if there is a live one with the same type, sequence
+length and children (the same child objects, in the same order). Children
+are interned before their parents, so this makes structurally identical
+trees the same object all the way down. New nodes also get their
+`_summary` (see `_summary`) worked out here, from their children's, their
+explicit and wildcard children told apart once and for all, and whether
+their children show they're already consolidated (see
+`mapping.consolidate_mapping_tree`).
+
+Equality is a bit looser than that: it has never cared about the order of
+children, and `Collection` assembly does care about order, so the two can't
+be the same thing. Each node is therefore also given an equality class,
+shared by every live node that compares equal, and `==` / `hash` just look
+at that. Both are worked out once, when the node is made.
+
+Both tables only hold weak references to what they intern, so a tree is
+forgotten as soon as nobody else is using it.
+
+Before any of that, wide nodes have their children switched to
+`children.Children` or `columnar.Columns`, which bring their own hashing.
+"""
+
+from __future__ import annotations
+from abc import ABCMeta
+from typing import TYPE_CHECKING, Any, Mapping, get_origin
+from weakref import WeakValueDictionary
+
+from frozendict import frozendict
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+from ..cache import cache
+
+from ._summary import Summary, summarise
+from .children import Children, exact_key_token, represent_canonically
+from .columnar import Columns
+from .leaf import Leaf
+from .wildcard import is_wildcard
+
+
+class EqClass:
+    """Token shared by all live `PathsOf`s that are equal to each other"""
+
+    __slots__ = ("__weakref__",)
+
+
+class _ExactKey:
+    """Same type, sequence length, and same children objects in same order"""
+
+    __slots__ = ("type", "sequence_length", "paths", "_hash")
+
+    def __init__(self, paths: PathsOf[Any]):
+        self.type = paths.type
+        self.sequence_length = paths.sequence_length
+        self.paths = paths.paths
+        self._hash = hash(
+            (
+                self.type,
+                self.sequence_length,
+                (
+                    self.paths.exact_hash()
+                    if isinstance(self.paths, (Children, Columns))
+                    else tuple(
+                        (exact_key_token(key), id(subpaths))
+                        for key, subpaths in self.paths.items()
+                    )
+                ),
+            )
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, _ExactKey):
+            return NotImplemented
+        if isinstance(self.paths, (Children, Columns)):
+            return (
+                self._hash == other._hash
+                and self.type == other.type
+                and self.sequence_length == other.sequence_length
+                and type(self.paths) is type(other.paths)
+                and self.paths.is_exactly(other.paths)  # type: ignore[arg-type]
+            )
+        return (
+            self._hash == other._hash
+            and self.type == other.type
+            and self.sequence_length == other.sequence_length
+            and len(self.paths) == len(other.paths)
+            and all(
+                exact_key_token(key) == exact_key_token(other_key)
+                and subpaths is other_subpaths
+                for (key, subpaths), (other_key, other_subpaths) in zip(
+                    self.paths.items(), other.paths.items()
+                )
+            )
+        )
+
+
+class _EqKey:
+    """What `PathsOf` equality has always meant, for already interned children"""
+
+    __slots__ = ("type", "sequence_length", "paths", "_hash")
+
+    def __init__(self, paths: PathsOf[Any]):
+        self.type = paths.type
+        self.sequence_length = paths.sequence_length
+        self.paths = paths.paths
+        self._hash = hash((self.type, self.sequence_length, self.paths))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, _EqKey):
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.type == other.type
+            and self.sequence_length == other.sequence_length
+            and self.paths == other.paths
+        )
+
+
+_canonical_nodes: WeakValueDictionary[_ExactKey, PathsOf[Any]] = WeakValueDictionary()
+_eq_classes: WeakValueDictionary[_EqKey, EqClass] = WeakValueDictionary()
+
+
+_NO_CHILDREN: frozendict[PathKey, PathsOf[Any]] = frozendict()
+
+
+def _split(
+    children: Mapping[PathKey, PathsOf[Any]], summary: Summary
+) -> tuple[Mapping[PathKey, PathsOf[Any]], Mapping[PathKey, PathsOf[Any]]]:
+    """
+    Explicit and wildcard children apart, sharing `children` itself when
+    they're all one or the other (nearly always). The summary already knows
+    which
+    """
+    if not summary.wildcard_levels & 1:
+        return children, _NO_CHILDREN
+    if not summary.explicit_key_fingerprints[0]:
+        return _NO_CHILDREN, children
+    return (
+        frozendict(
+            (key, child) for key, child in children.items() if not is_wildcard(key)
+        ),
+        frozendict((key, child) for key, child in children.items() if is_wildcard(key)),
+    )
+
+
+@cache(maxsize=None)
+def is_mapping_type(t: Any) -> bool:
+    origin = get_origin(t) or t
+    return isinstance(origin, type) and issubclass(origin, Mapping)
+
+
+def _provably_consolidated(paths: PathsOf[Any]) -> bool:
+    """
+    Nothing for `consolidate_mapping_tree` to do, as far as the children can
+    tell: they're all consolidated, there aren't two `Mapping` items that
+    could have the same key, and wildcard keys are for the subtree they're
+    the key of (`remove_lowest_level` and `snip_off` leave them as they
+    were, and consolidating re-keys them, which can make them the same
+    key). Empty and leaf nodes always are. (Wide nodes aren't worth going
+    through)
+    """
+    children = paths.paths
+    if not children or isinstance(children, Leaf):
+        return True
+    if not isinstance(children, frozendict):
+        return False
+    if len(children) > 1 and is_mapping_type(paths.type):
+        return False
+    return all(
+        child._consolidated and (not is_wildcard(key) or key.subtree is child)
+        for key, child in children.items()
+    )
+
+
+def intern[T](paths: PathsOf[T]) -> PathsOf[T]:
+    exact_key = _ExactKey(paths)
+    if (canonical := _canonical_nodes.get(exact_key)) is not None:
+        return canonical
+
+    eq_key = _EqKey(paths)
+    if (eq_class := _eq_classes.get(eq_key)) is None:
+        eq_class = _eq_classes[eq_key] = EqClass()
+
+    summary = summarise(paths)
+    explicit, wildcards = _split(paths.paths, summary)
+    object.__setattr__(paths, "_eq_class", eq_class)
+    object.__setattr__(paths, "_hash", hash(eq_key))
+    object.__setattr__(paths, "_summary", summary)
+    # See `mapping.mark_consolidated`
+    object.__setattr__(paths, "_consolidated", _provably_consolidated(paths))
+    object.__setattr__(paths, "_explicit", explicit)
+    object.__setattr__(paths, "_wildcards", wildcards)
+
+    _canonical_nodes[exact_key] = paths
+    return paths
+
+
+def interned_count() -> int:
+    """How many distinct `PathsOf` nodes are currently alive"""
+    return len(_canonical_nodes)
+
+
+class Interning(ABCMeta):
+    """
+    Metaclass for `PathsOf` (`ABCMeta` because of the `Mapping` base)
+
+    Any way of making a `PathsOf`, including `dataclasses.replace`,
+    goes through here
+    """
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        paths = super().__call__(*args, **kwargs)
+        represent_canonically(paths)
+        return intern(paths)
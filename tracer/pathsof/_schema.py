@@ -0,0 +1,178 @@
+"""
+Per-type facts the tree code keeps asking about, compiled once per type
+
+`schema_of(t)` is the only place that should need to look at `t` with
+`get_origin`, `fields`, `issubclass` and friends.
+"""
+
+from __future__ import annotations
+import builtins
+from dataclasses import fields, is_dataclass
+import datetime
+from enum import Enum, auto
+import types
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Collection,
+    Mapping,
+    Sequence,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from ..cache import cache
+from ..type_manipulation import annotation_type, instance_union_member
+
+from .mapping import MappingItem
+from .wildcard import Wildcard
+
+if TYPE_CHECKING:
+    from . import PathKey
+
+
+LEAF_TYPES = (
+    datetime.datetime,
+    builtins.str,
+    builtins.int,
+    builtins.bool,
+    types.NoneType,
+)
+
+
+class Kind(Enum):
+    UNION = auto()
+    LEAF = auto()
+    """Leaf data types, the values are the keys"""
+    DATACLASS = auto()
+    MAPPING = auto()
+    COLLECTION = auto()
+    OBJECT = auto()
+    OTHER = auto()
+    """Nothing known about what's under it"""
+
+
+class Schema:
+    __slots__ = (
+        "type",
+        "origin",
+        "kind",
+        "keys",
+        "union_members",
+        "is_sequence",
+        "element_type",
+        "_error",
+        "_field_annotations",
+        "_field_types",
+        "_union_dispatch",
+    )
+
+    type: type[Any]
+    origin: Any
+    kind: Kind
+    keys: tuple[PathKey, ...]
+    """What `PathsOf(t).full` would have at the top level"""
+    union_members: tuple[type[Any], ...] | None
+    is_sequence: bool
+    """Whether `PathsOf.specifically` should record a `sequence_length`"""
+    element_type: type[Any] | None
+    """What's under each key if it's the same for all keys (`MappingItem` for
+    mappings, the item type for other collections, leaves' `EllipsisType`)"""
+    _error: str | None
+    """Raised when asking for a key's type if `element_type` couldn't be made"""
+
+    def __init__(self, t: type[Any]):
+        self.type = t
+        self.origin = get_origin(t) or t
+        self.union_members = None
+        self.element_type = None
+        self._error = None
+        self._field_annotations: dict[str, Any] = {}
+        self._field_types: dict[str, type[Any]] = {}
+        self._union_dispatch: dict[type[Any], type[Any]] = {}
+
+        origin = self.origin
+        is_class = isinstance(origin, type)
+        self.is_sequence = is_class and issubclass(origin, Sequence)
+
+        if origin in (Union, types.UnionType):
+            self.kind = Kind.UNION
+            self.union_members = self.keys = tuple(get_args(t))
+        elif t in LEAF_TYPES:
+            self.kind = Kind.LEAF
+            self.keys = ()
+            self.element_type = types.EllipsisType
+        elif is_dataclass(origin):
+            self.kind = Kind.DATACLASS
+            self._field_annotations = {f.name: f.type for f in fields(origin)}
+            self.keys = tuple(self._field_annotations)
+        elif is_class and issubclass(origin, Mapping):
+            self.kind = Kind.MAPPING
+            self.keys = (Wildcard(),)
+            match get_args(t):
+                case (key_type, value_type):
+                    self.element_type = MappingItem[key_type, value_type]
+                case ():
+                    self.element_type = MappingItem[Any, Any]
+                case _:
+                    self._error = "Expected Mapping subclass to have 0 or 2 type args"
+        elif is_class and issubclass(origin, Collection):
+            self.kind = Kind.COLLECTION
+            match get_args(t):
+                case (type_arg,):
+                    self.element_type = type_arg
+                case ():
+                    self.element_type = object
+                case _:
+                    self._error = (
+                        "Expected Collection subclass to have 0 or 1 type args"
+                    )
+            self.keys = (Wildcard(),)
+        elif t is object:
+            self.kind = Kind.OBJECT
+            self.keys = ()
+            self.element_type = object
+        else:
+            self.kind = Kind.OTHER
+            self.keys = ()
+
+    def field_type(self, name: str) -> type[Any]:
+        """Resolved on first use, forward references can be to later classes"""
+        if (field_type := self._field_types.get(name)) is None:
+            field_type = self._field_types[name] = annotation_type(
+                self._field_annotations[name], ctx_class=self.type
+            )
+        return field_type
+
+    def type_at_key(self, key: PathKey) -> type[Any]:
+        match self.kind:
+            case Kind.UNION:
+                assert self.union_members is not None
+                assert isinstance(key, type)
+                assert key in self.union_members
+                return key
+            case Kind.DATACLASS:
+                assert isinstance(key, str)
+                return self.field_type(key)
+            case _ if self.element_type is not None:
+                return self.element_type
+            case _ if self._error is not None:
+                raise Exception(self._error)
+            case _:
+                raise Exception(f"Can't get type at {repr(key)} for {repr(self.type)}")
+
+    def union_member(self, instance: Any) -> type[Any]:
+        assert self.union_members is not None
+        cls = type(instance)
+        if (member := self._union_dispatch.get(cls)) is None:
+            member = self._union_dispatch[cls] = instance_union_member(
+                instance, self.union_members
+            )
+        return member
+
+
+# Types are a fixed, smallish set
+@cache(maxsize=None)
+def schema_of[T](t: type[T]) -> Schema:
+    return Schema(t)
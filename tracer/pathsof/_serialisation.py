@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 
 
 from ..cache import cache
+from ..stack import Steps, run
 
 if TYPE_CHECKING:
     from . import PathsOf
@@ -11,13 +12,20 @@ from .wildcard import is_wildcard
 
 
 @property
-@cache
+@cache(per_instance=True)
 def as_key_str[T](self: PathsOf[T]) -> str:
     return f"PathsOf[{self.type.__name__}]"
 
 
 def as_indent_tree[T](self: PathsOf[T], level: int = 0) -> str:
-    s = "\n"
+    pieces: list[str] = []
+    run(_indent_tree(self, level, pieces))
+    return "".join(pieces)
+
+
+def _indent_tree[T](self: PathsOf[T], level: int, pieces: list[str]) -> Steps[None]:
+    """On an explicit stack (see `stack`), so any depth can be printed"""
+    pieces.append("\n")
     if self.paths:
         # origin = get_origin(self.type) or self.type
         for key, paths in self.paths.items():
@@ -33,9 +41,7 @@ def as_indent_tree[T](self: PathsOf[T], level: int = 0) -> str:
                 key_str = "*"
             else:
                 key_str = str(key)
-            s += ("  " * level) + key_str
-            s += paths._as_indent_tree(level + 1)
+            pieces.append(("  " * level) + key_str)
+            yield _indent_tree(paths, level + 1, pieces)
     else:
-        s += ("  " * level) + "◌" + "\n"
-
-    return s
+        pieces.append(("  " * level) + "◌" + "\n")
@@ -0,0 +1,309 @@
+"""
+Cheap precomputed facts about everything under a `PathsOf` node, used to
+say "no" to tree maths questions without walking the trees
+
+Keys are summarised per level (level 0 being the node's own keys) as small
+bloom filters, for the first `FINGERPRINT_LEVELS` levels. Wildcard keys
+aren't in the filters, as they don't match by key; instead there's a
+bitmask of which levels have any.
+
+`columnar.Columns` children are summarised from the columns, without
+making the rows, and `children.Children` a block at a time (see
+`Children.aggregate`). `leaf.Leaf` nodes only differ by their key's
+fingerprint, so they share a `Summary` per fingerprint.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+from .children import Children
+from .columnar import Columns
+from .leaf import Leaf
+from .wildcard import is_wildcard
+
+
+FINGERPRINT_LEVELS = 8
+_FINGERPRINT_BITS = 64
+
+
+def _key_bits(key: PathKey) -> int:
+    h = hash(key)
+    return (1 << (h % _FINGERPRINT_BITS)) | (
+        1 << ((h // _FINGERPRINT_BITS) % _FINGERPRINT_BITS)
+    )
+
+
+class Summary:
+    __slots__ = (
+        "key_fingerprints",
+        "explicit_key_fingerprints",
+        "wildcard_levels",
+        "deepest_wildcard",
+        "depth",
+        "min_leaf_depth",
+        "leaf_count",
+    )
+
+    key_fingerprints: tuple[int, ...]
+    """Keys at each level, under any key"""
+    explicit_key_fingerprints: tuple[int, ...]
+    """Keys at each level, only under non-wildcard keys"""
+    wildcard_levels: int
+    """Bit `n` is set if there are wildcard keys at level `n`"""
+    deepest_wildcard: int
+    """Deepest level with wildcard keys (not limited to `FINGERPRINT_LEVELS`),
+    -1 if none"""
+    depth: int
+    """Longest path length"""
+    min_leaf_depth: int
+    """Shortest path length"""
+    leaf_count: int
+
+
+def _merge_levels(own: int, children: list[tuple[int, ...]]) -> tuple[int, ...]:
+    levels = [own]
+    for child_levels in children:
+        for level, fingerprint in enumerate(
+            child_levels[: FINGERPRINT_LEVELS - 1], start=1
+        ):
+            if level == len(levels):
+                levels.append(fingerprint)
+            else:
+                levels[level] |= fingerprint
+    return tuple(levels)
+
+
+def summarise(paths: PathsOf[Any]) -> Summary:
+    if isinstance(paths.paths, Leaf):
+        return _leaf_summary(_key_bits(paths.paths.key))
+
+    summary = Summary()
+
+    if not paths.paths:
+        summary.key_fingerprints = summary.explicit_key_fingerprints = ()
+        summary.wildcard_levels = summary.depth = summary.min_leaf_depth = 0
+        summary.deepest_wildcard = -1
+        summary.leaf_count = 1
+        return summary
+
+    if isinstance(paths.paths, Columns):
+        return _summarise_columns(summary, paths.paths)
+
+    if isinstance(paths.paths, Children):
+        partial = paths.paths.aggregate(_partial, _combine)
+    else:
+        partial = _partial(paths.paths.items())
+    assert partial is not None
+
+    (
+        own_fingerprint,
+        child_fingerprints,
+        explicit_child_fingerprints,
+        wildcard_levels,
+        deepest_wildcard,
+        depth,
+        min_leaf_depth,
+        leaf_count,
+    ) = partial
+    summary.key_fingerprints = (own_fingerprint, *child_fingerprints)
+    summary.explicit_key_fingerprints = (
+        own_fingerprint,
+        *explicit_child_fingerprints,
+    )
+    summary.wildcard_levels = wildcard_levels & ((1 << FINGERPRINT_LEVELS) - 1)
+    summary.deepest_wildcard = deepest_wildcard
+    summary.depth = depth + 1
+    summary.min_leaf_depth = min_leaf_depth + 1
+    summary.leaf_count = leaf_count
+    return summary
+
+
+_leaf_summaries: dict[int, Summary] = {}
+
+
+def _leaf_summary(fingerprint: int) -> Summary:
+    if (summary := _leaf_summaries.get(fingerprint)) is None:
+        summary = _leaf_summaries[fingerprint] = Summary()
+        summary.key_fingerprints = summary.explicit_key_fingerprints = (fingerprint,)
+        summary.wildcard_levels = 0
+        summary.deepest_wildcard = -1
+        summary.depth = summary.min_leaf_depth = summary.leaf_count = 1
+    return summary
+
+
+type _Partial = tuple[int, tuple[int, ...], tuple[int, ...], int, int, int, int, int]
+"""
+What some (at least one) of a node's children add up to: own key
+fingerprint, children's fingerprints, explicit children's fingerprints
+(both from level 1), then wildcard levels, deepest wildcard, depth, min
+leaf depth and leaf count before counting the node itself
+"""
+
+
+def _partial(items: Iterable[tuple[PathKey, PathsOf[Any]]]) -> _Partial:
+    own_fingerprint = 0
+    wildcard_levels = 0
+    deepest_wildcard = -1
+    child_fingerprints: list[tuple[int, ...]] = []
+    explicit_child_fingerprints: list[tuple[int, ...]] = []
+    depth = 0
+    min_leaf_depth = None
+    leaf_count = 0
+
+    for key, subpaths in items:
+        child = subpaths._summary
+        if is_wildcard(key):
+            wildcard_levels |= 1
+            deepest_wildcard = max(deepest_wildcard, 0)
+        else:
+            own_fingerprint |= _key_bits(key)
+            explicit_child_fingerprints.append(child.explicit_key_fingerprints)
+        child_fingerprints.append(child.key_fingerprints)
+        wildcard_levels |= child.wildcard_levels << 1
+        if child.deepest_wildcard >= 0:
+            deepest_wildcard = max(deepest_wildcard, child.deepest_wildcard + 1)
+        depth = max(depth, child.depth)
+        if min_leaf_depth is None or child.min_leaf_depth < min_leaf_depth:
+            min_leaf_depth = child.min_leaf_depth
+        leaf_count += child.leaf_count
+
+    assert min_leaf_depth is not None
+    return (
+        own_fingerprint,
+        _merge_levels(0, child_fingerprints)[1:],
+        _merge_levels(0, explicit_child_fingerprints)[1:],
+        wildcard_levels,
+        deepest_wildcard,
+        depth,
+        min_leaf_depth,
+        leaf_count,
+    )
+
+
+def _or_levels(a: tuple[int, ...], b: tuple[int, ...]) -> tuple[int, ...]:
+    if a == b:
+        # Children are mostly shaped alike
+        return a
+    if len(a) < len(b):
+        a, b = b, a
+    return (*(x | y for x, y in zip(a, b)), *a[len(b) :])
+
+
+def _combine(a: _Partial, b: _Partial) -> _Partial:
+    return (
+        a[0] | b[0],
+        _or_levels(a[1], b[1]),
+        _or_levels(a[2], b[2]),
+        a[3] | b[3],
+        max(a[4], b[4]),
+        max(a[5], b[5]),
+        min(a[6], b[6]),
+        a[7] + b[7],
+    )
+
+
+def _summarise_columns(summary: Summary, columns: Columns) -> Summary:
+    """
+    Same as summarising the rows one by one: every key at the top is a
+    wildcard, every key under those is a field name
+    """
+    field_fingerprint = 0
+    cell_fingerprints: list[tuple[int, ...]] = []
+    cell_wildcard_levels = 0
+    cell_deepest_wildcard = -1
+    for name, column in zip(columns.names, columns.columns):
+        cells = set(column)
+        cells.discard(None)
+        if cells:
+            field_fingerprint |= _key_bits(name)
+        for cell in cells:
+            child = cell._summary
+            cell_fingerprints.append(child.key_fingerprints)
+            cell_wildcard_levels |= child.wildcard_levels
+            cell_deepest_wildcard = max(cell_deepest_wildcard, child.deepest_wildcard)
+
+    depth = 0
+    min_leaf_depth = None
+    leaf_count = 0
+    for cells in columns.cells():
+        present = [cell._summary for cell in cells if cell is not None]
+        if present:
+            row_depth = 1 + max(child.depth for child in present)
+            row_min_leaf_depth = 1 + min(child.min_leaf_depth for child in present)
+            leaf_count += sum(child.leaf_count for child in present)
+        else:
+            row_depth = row_min_leaf_depth = 0
+            leaf_count += 1
+        depth = max(depth, row_depth)
+        if min_leaf_depth is None or row_min_leaf_depth < min_leaf_depth:
+            min_leaf_depth = row_min_leaf_depth
+
+    summary.key_fingerprints = _merge_levels(
+        0,
+        (
+            [_merge_levels(field_fingerprint, cell_fingerprints)]
+            if field_fingerprint
+            else []
+        ),
+    )
+    summary.explicit_key_fingerprints = (0,)
+    summary.wildcard_levels = (1 | cell_wildcard_levels << 2) & (
+        (1 << FINGERPRINT_LEVELS) - 1
+    )
+    summary.deepest_wildcard = (
+        cell_deepest_wildcard + 2 if cell_deepest_wildcard >= 0 else 0
+    )
+    summary.depth = depth + 1
+    summary.min_leaf_depth = (min_leaf_depth or 0) + 1
+    summary.leaf_count = leaf_count
+    return summary
+
+
+def cannot_cover(
+    self: PathsOf[Any], other: PathsOf[Any], all_the_way_to_the_leaves: bool
+) -> bool:
+    """
+    `True` means `self.covers(other, ...)` is definitely `False`
+
+    Down to `self`'s shallowest leaf (or all the way, if asked), every key
+    of `other` needs the same key or a wildcard at the same level in `self`
+    """
+    s = self._summary
+    o = other._summary
+
+    if all_the_way_to_the_leaves:
+        if o.depth > s.depth:
+            return True
+        levels = len(o.key_fingerprints)
+    else:
+        levels = min(len(o.key_fingerprints), s.min_leaf_depth)
+
+    for level in range(levels):
+        if s.wildcard_levels >> level & 1:
+            continue
+        if o.wildcard_levels >> level & 1:
+            return True
+        if o.key_fingerprints[level] & ~s.key_fingerprints[level]:
+            return True
+
+    return False
+
+
+def cannot_extract_all(source: PathsOf[Any], paths: PathsOf[Any]) -> bool:
+    """
+    `True` means extracting `paths` from `source` with `must_match_all`
+    definitely fails
+
+    Keys reached only through non-wildcard keys of `paths` have to be in
+    `source` at exactly the same place
+    """
+    source_fingerprints = source._summary.explicit_key_fingerprints
+    for level, fingerprint in enumerate(paths._summary.explicit_key_fingerprints):
+        if level == len(source_fingerprints):
+            return fingerprint != 0
+        if fingerprint & ~source_fingerprints[level]:
+            return True
+    return False
@@ -1,24 +1,8 @@
 from __future__ import annotations
-import builtins
-from dataclasses import fields, is_dataclass
-import datetime
-from types import UnionType
-import types
-from typing import (
-    TYPE_CHECKING,
-    Any,
-    Collection,
-    Mapping,
-    Union,
-    get_args,
-    get_origin,
-)
+from typing import TYPE_CHECKING, Any, Collection
 
 
-from ..cache import cache
-from ..type_manipulation import annotation_type
-
-from .mapping import MappingItem
+from ._schema import schema_of
 
 if TYPE_CHECKING:
     from . import PathsOf
@@ -26,62 +10,9 @@ if TYPE_CHECKING:
 from . import PathKey
 
 
-@cache
 def union[T](t: type[T]) -> Collection[type[Any]] | None:
-    if get_origin(t) in [Union, UnionType]:
-        return get_args(t)
-    else:
-        return None
+    return schema_of(t).union_members
 
 
 def type_at_key[T](self: PathsOf[T], key: PathKey) -> type[Any]:
-    if t_union := union(self.type):
-        assert isinstance(key, type)
-        assert key in t_union
-        return key
-
-    match self.type:
-        case (
-            datetime.datetime
-            | builtins.str
-            | builtins.int
-            | builtins.bool
-            | types.NoneType
-        ):
-            return types.EllipsisType
-        case _:
-            pass
-
-    origin = get_origin(self.type) or self.type
-
-    if is_dataclass(origin):
-        assert isinstance(key, str)
-        (key_type,) = (
-            annotation_type(f.type, ctx_class=self.type)
-            for f in fields(origin)
-            if f.name == key
-        )
-        return key_type
-
-    if issubclass(origin, Mapping):
-        match get_args(self.type):
-            case (key_type, value_type):
-                return MappingItem[key_type, value_type]
-            case ():
-                return MappingItem[Any, Any]
-            case _:
-                raise Exception("Expected Mapping subclass to have 0 or 2 type args")
-
-    if issubclass(origin, Collection):
-        match get_args(self.type):
-            case (type_arg,):
-                return type_arg
-            case ():
-                return object
-            case _:
-                raise Exception("Expected Mapping subclass to have 0 or 2 type args")
-
-    if self.type is object:
-        return object
-
-    raise Exception(f"Can't get type at {repr(key)} for {repr(self.type)}")
+    return schema_of(self.type).type_at_key(key)
@@ -0,0 +1,216 @@
+"""
+Selections over a type as bitsets over the nodes of the type's `full` tree
+
+A selection (`PathsOf(T).eg(...)`, or anything cut out of
+`PathsOf(T).full`) is just which of `full`'s nodes it has, so given a
+numbering of those nodes (`Layout`, worked out once per type) it's an
+`int` with a bit set per node. Nodes are numbered depth first, so a node's
+subtree is a contiguous run of bits, and `covers` / `extends` come down to
+subset tests, `merge` to OR and `extract` to AND (give or take what
+`extract` does around leaves and missing keys), on word sized integers.
+
+Only trees that are part of `full` have a `Bitset`: no data (keys `full`
+hasn't got), no sequence lengths and at most one wildcard per node. As
+with `path_set.PathSet`, that makes `merge` the `merge_wildcards=True`
+one. Types whose `full` doesn't end (recursive ones) haven't got a
+`Layout`.
+
+Walks over trees and layouts recurse on an explicit stack (see `stack`).
+
+`Tracer` doesn't use it. What goes through a tracer is mostly data (an
+instance's paths, or links keyed by particular mapping keys), none of
+which is part of `full`, and the query-only trees it does get are each
+compared a couple of times, which wouldn't pay for laying them out.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterator
+
+from frozendict import frozendict
+
+from ..cache import cache
+from ..stack import Steps, run
+
+from .wildcard import Wildcard, is_wildcard, _
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+
+class Layout:
+    """Numbering of `PathsOf(t).full`'s nodes, depth first"""
+
+    __slots__ = ("type", "types", "keys", "children", "subtrees", "wildcards", "_index")
+
+    def __init__(self, t: type[Any]):
+        from . import PathsOf
+
+        self.type = t
+        self.types: list[type[Any]] = []
+        self.keys: list[PathKey] = []
+        """Key each node is under in its parent (`_` for wildcards)"""
+        self.children: list[tuple[int, ...]] = []
+        self.subtrees: list[int] = []
+        """Mask of each node and everything under it"""
+        self.wildcards = 0
+        """Mask of the nodes under wildcard keys"""
+        self._index: dict[tuple[int, PathKey], int] = {}
+
+        def number(node: PathsOf[Any], key: PathKey) -> Steps[int]:
+            bit = len(self.types)
+            self.types.append(node.type)
+            self.keys.append(key)
+            self.children.append(())
+            self.subtrees.append(0)
+            if is_wildcard(key):
+                self.wildcards |= 1 << bit
+            children = []
+            for child_key, child in node.items():
+                child_key = _ if is_wildcard(child_key) else child_key
+                child_bit = yield number(child, child_key)
+                self._index[bit, child_key] = child_bit
+                children.append(child_bit)
+            self.children[bit] = tuple(children)
+            self.subtrees[bit] = ((1 << (len(self.types) - bit)) - 1) << bit
+            return bit
+
+        run(number(PathsOf(t).full.materialised, None))
+
+    def child(self, bit: int, key: PathKey) -> int | None:
+        return self._index.get((bit, _ if is_wildcard(key) else key))
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+
+@cache(maxsize=None)
+def layout[T](t: type[T]) -> Layout:
+    return Layout(t)
+
+
+def _bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _leaves(layout: Layout, mask: int) -> int:
+    """The nodes of `mask` with nothing under them in `mask`"""
+    leaves = 0
+    for bit in _bits(mask):
+        if not mask & layout.subtrees[bit] & ~(1 << bit):
+            leaves |= 1 << bit
+    return leaves
+
+
+def _under(layout: Layout, mask: int) -> int:
+    """Everything at or under the nodes of `mask`"""
+    under = 0
+    for bit in _bits(mask):
+        under |= layout.subtrees[bit]
+    return under
+
+
+@dataclass(frozen=True, slots=True)
+class Bitset:
+    type: type[Any]
+    bits: int
+    """Bit `n` is node `n` of `layout(type)`. Always has the root, bit 0"""
+    _under_leaves: int | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def under_leaves(self) -> int:
+        """Mask of everything at or under our leaves (worked out once)"""
+        if self._under_leaves is None:
+            layout = self.layout
+            under = _under(layout, _leaves(layout, self.bits))
+            object.__setattr__(self, "_under_leaves", under)
+            return under
+        return self._under_leaves
+
+    @property
+    def layout(self) -> Layout:
+        return layout(self.type)
+
+    def to_paths(self) -> PathsOf[Any]:
+        from . import PathsOf
+
+        layout = self.layout
+        bits = self.bits
+
+        def build(bit: int) -> Steps[PathsOf[Any]]:
+            children: dict[PathKey, PathsOf[Any]] = {}
+            for child_bit in layout.children[bit]:
+                if bits >> child_bit & 1:
+                    child = yield build(child_bit)
+                    key = layout.keys[child_bit]
+                    children[Wildcard(child) if key is _ else key] = child
+            return PathsOf(layout.types[bit], paths=frozendict(children))
+
+        return run(build(0))
+
+    def covers(self, other: Bitset, *, all_the_way_to_the_leaves: bool = False) -> bool:
+        """Same answer as `PathsOf.covers` on the trees"""
+        missing = other.bits & ~self.bits
+        if not missing or all_the_way_to_the_leaves:
+            return not missing
+        # Anything under our leaves is fine
+        return not missing & ~self.under_leaves
+
+    def extends(self, other: Bitset) -> bool:
+        return not other.bits & ~self.bits
+
+    def merge(self, *others: Bitset) -> Bitset:
+        """`PathsOf.merge(..., merge_wildcards=True)`"""
+        bits = self.bits
+        for other in others:
+            assert self.type == other.type, f"{self.type} != {other.type}"
+            bits |= other.bits
+        return Bitset(self.type, bits)
+
+    def extract(self, paths: Bitset, *, must_match_all: bool = True) -> Bitset:
+        """Same result as `PathsOf.extract` on the trees"""
+        assert self.type == paths.type, f"{self.type} != {paths.type}"
+        layout = self.layout
+        source, query = self.bits, paths.bits
+
+        # A wildcard in the query matches nothing if the source hasn't got one
+        unmatched = query & layout.wildcards & ~source
+        reached = query & ~_under(layout, unmatched)
+        # Explicit keys are looked up whether the source has them or not
+        missing = reached & ~source
+        if missing and must_match_all:
+            return Bitset(self.type, 1)
+        # A query leaf takes everything the source has under it
+        leaves = _leaves(layout, query) & reached & ~missing
+        return Bitset(self.type, reached | source & _under(layout, leaves))
+
+
+@property
+@cache(per_instance=True)
+def bitset[T](self: PathsOf[T]) -> Bitset:
+    """
+    `self` as a `Bitset`, `ValueError` if it isn't just part of
+    `PathsOf(self.type).full`
+    """
+    nodes = layout(self.type)
+    bits = 0
+
+    def walk(node: PathsOf[Any], bit: int) -> Steps[None]:
+        nonlocal bits
+        if node.type != nodes.types[bit] or node.sequence_length is not None:
+            raise ValueError(f"Not part of `full`:\n{node}")
+        if len(node._wildcards) > 1:
+            raise ValueError(f"More than one wildcard:\n{node}")
+        bits |= 1 << bit
+        for key, child in node.items():
+            if (child_bit := nodes.child(bit, key)) is None:
+                raise ValueError(f"{key!r} isn't in `full`:\n{node}")
+            yield walk(child, child_bit)
+
+    run(walk(self, 0))
+    return Bitset(self.type, bits)
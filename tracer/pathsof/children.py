@@ -0,0 +1,555 @@
+"""
+Persistent (immutable, structure sharing) children for wide nodes
+
+A `frozendict` is copied whole for every change, so building up a node
+with thousands of children (a big collection's wildcards, say) a child at
+a time is quadratic. From `CHILDREN_THRESHOLD` children, nodes keep them
+in `Children` instead: a hash array mapped trie from key to child, plus a
+persistent vector of the children in insertion order (`PathsOf` children
+are ordered). `set` and `delete` copy just the path down to the entry in
+each, O(log n), and share the rest with the version they started from.
+
+Hashes (for `==` and for interning) are sums over the entries, kept up to
+date as entries change, and the vector's blocks cache partial `_summary`
+results, so interning an edited node is O(log n) as well.
+"""
+
+from __future__ import annotations
+from datetime import datetime
+from functools import reduce
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ItemsView,
+    Iterable,
+    Iterator,
+    Mapping,
+    ValuesView,
+)
+
+from frozendict import frozendict
+
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+from . import columnar
+from .columnar import Columns, columns_of
+from .leaf import Leaf, is_terminal
+from .wildcard import is_wildcard
+
+
+CHILDREN_THRESHOLD = 32
+"""Nodes with fewer children than this keep a `frozendict`"""
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_NOTHING: Any = object()
+
+
+def exact_key_token(key: PathKey) -> Any:
+    """What interning tells keys apart by, which is a bit stricter than `==`"""
+    if is_wildcard(key):
+        return (type(key), id(key.subtree))
+    if isinstance(key, datetime):
+        # The same instant in different timezones is `==`
+        return (type(key), key, key.tzinfo, key.fold)
+    # `1 == True` but they aren't the same key for our purposes
+    return (type(key), key)
+
+
+def _scramble(h: int) -> int:
+    """Spreads a hash over 64 bits, so that sums of them don't cancel out"""
+    h &= _HASH_MASK
+    h = (h ^ (h >> 30)) * 0xBF58476D1CE4E5B9 & _HASH_MASK
+    h = (h ^ (h >> 27)) * 0x94D049BB133111EB & _HASH_MASK
+    return h ^ (h >> 31)
+
+
+# Trie
+
+
+type _Entry = tuple[PathKey, PathsOf[Any], int, int]
+"""Key, child, position in the order vector, hash of key"""
+
+
+class _Trie:
+    """`slots` has an entry or subtrie for each bit set in `bitmap`, in bit order"""
+
+    __slots__ = ("bitmap", "slots")
+
+    def __init__(self, bitmap: int, slots: tuple[Any, ...]):
+        self.bitmap = bitmap
+        self.slots = slots
+
+
+class _Collision:
+    """Entries whose keys' hashes are the same all the way down"""
+
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: tuple[_Entry, ...]):
+        self.entries = entries
+
+
+_EMPTY_TRIE = _Trie(0, ())
+
+
+def _same_key(entry: _Entry, key: PathKey, h: int) -> bool:
+    return entry[3] == h and (entry[0] is key or entry[0] == key)
+
+
+def _trie_get(node: Any, key: PathKey, h: int) -> _Entry | None:
+    shift = 0
+    while True:
+        if isinstance(node, _Collision):
+            for entry in node.entries:
+                if _same_key(entry, key, h):
+                    return entry
+            return None
+        bit = 1 << ((h >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return None
+        node = node.slots[(node.bitmap & (bit - 1)).bit_count()]
+        if isinstance(node, tuple):
+            return node if _same_key(node, key, h) else None
+        shift += _BITS
+
+
+def _trie_pair(a: _Entry, b: _Entry, shift: int) -> Any:
+    if shift >= _HASH_BITS:
+        return _Collision((a, b))
+    a_bits = (a[3] >> shift) & _MASK
+    b_bits = (b[3] >> shift) & _MASK
+    if a_bits == b_bits:
+        return _Trie(1 << a_bits, (_trie_pair(a, b, shift + _BITS),))
+    return _Trie((1 << a_bits) | (1 << b_bits), (a, b) if a_bits < b_bits else (b, a))
+
+
+def _trie_set(node: Any, entry: _Entry, shift: int) -> Any:
+    """`entry` replaces any entry for the same key"""
+    key, __, __, h = entry
+    if isinstance(node, _Collision):
+        entries = node.entries
+        for index, old in enumerate(entries):
+            if _same_key(old, key, h):
+                return _Collision((*entries[:index], entry, *entries[index + 1 :]))
+        return _Collision((*entries, entry))
+
+    bit = 1 << ((h >> shift) & _MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    slots = node.slots
+    if not node.bitmap & bit:
+        return _Trie(node.bitmap | bit, (*slots[:index], entry, *slots[index:]))
+    slot = slots[index]
+    if isinstance(slot, tuple):
+        slot = (
+            entry if _same_key(slot, key, h) else _trie_pair(slot, entry, shift + _BITS)
+        )
+    else:
+        slot = _trie_set(slot, entry, shift + _BITS)
+    return _Trie(node.bitmap, (*slots[:index], slot, *slots[index + 1 :]))
+
+
+def _trie_delete(node: Any, key: PathKey, h: int, shift: int) -> Any:
+    """
+    For a key that's there. Subtries left with a single entry are replaced
+    by it, so the shape only ever depends on which keys there are
+    """
+    if isinstance(node, _Collision):
+        entries = tuple(entry for entry in node.entries if not _same_key(entry, key, h))
+        return entries[0] if len(entries) == 1 else _Collision(entries)
+
+    bit = 1 << ((h >> shift) & _MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    slots = node.slots
+    slot = slots[index]
+    slot = (
+        None if isinstance(slot, tuple) else _trie_delete(slot, key, h, shift + _BITS)
+    )
+    if slot is None:
+        return _Trie(node.bitmap & ~bit, (*slots[:index], *slots[index + 1 :]))
+    if isinstance(slot, _Trie) and len(slot.slots) == 1:
+        (only,) = slot.slots
+        if isinstance(only, tuple):
+            slot = only
+    return _Trie(node.bitmap, (*slots[:index], slot, *slots[index + 1 :]))
+
+
+def _trie_build(entries: list[_Entry], shift: int) -> Any:
+    if shift >= _HASH_BITS:
+        return _Collision(tuple(entries))
+    groups: dict[int, list[_Entry]] = {}
+    for entry in entries:
+        groups.setdefault((entry[3] >> shift) & _MASK, []).append(entry)
+    bitmap = 0
+    slots = []
+    for bits in sorted(groups):
+        bitmap |= 1 << bits
+        group = groups[bits]
+        slots.append(group[0] if len(group) == 1 else _trie_build(group, shift + _BITS))
+    return _Trie(bitmap, tuple(slots))
+
+
+def _trie_equal(a: Any, b: Any) -> bool:
+    """Children compared with `==`, sharing shortcuts the rest"""
+    if a is b:
+        return True
+    if isinstance(a, tuple) or isinstance(b, tuple):
+        return (
+            isinstance(a, tuple)
+            and isinstance(b, tuple)
+            and _same_key(a, b[0], b[3])
+            and a[1] == b[1]
+        )
+    if isinstance(a, _Collision) or isinstance(b, _Collision):
+        return (
+            isinstance(a, _Collision)
+            and isinstance(b, _Collision)
+            and len(a.entries) == len(b.entries)
+            and all(
+                any(_trie_equal(entry, other) for other in b.entries)
+                for entry in a.entries
+            )
+        )
+    return a.bitmap == b.bitmap and all(map(_trie_equal, a.slots, b.slots))
+
+
+# Order vector
+
+
+class _Block:
+    """
+    `_WIDTH` blocks (or `(key, child)` items, at the bottom) of the vector,
+    `None` where there aren't any. `aggregate` caches `Children.aggregate`
+    """
+
+    __slots__ = ("items", "aggregate")
+
+    def __init__(self, items: tuple[Any, ...]):
+        self.items = items
+        self.aggregate: Any = _NOTHING
+
+
+_EMPTY_ITEMS: tuple[None, ...] = (None,) * _WIDTH
+
+
+def _block_set(block: _Block | None, shift: int, index: int, item: Any) -> _Block:
+    items = _EMPTY_ITEMS if block is None else block.items
+    position = (index >> shift) & _MASK
+    if shift:
+        item = _block_set(items[position], shift - _BITS, index, item)
+    return _Block((*items[:position], item, *items[position + 1 :]))
+
+
+def _block_items(block: _Block, shift: int) -> Iterator[tuple[PathKey, PathsOf[Any]]]:
+    if not shift:
+        return filter(None, block.items)
+    return chain.from_iterable(
+        _block_items(child, shift - _BITS) for child in block.items if child is not None
+    )
+
+
+def _blocks_build(items: list[Any]) -> tuple[_Block, int]:
+    shift = 0
+    blocks = [
+        _Block(tuple(chain(items[start : start + _WIDTH], _EMPTY_ITEMS))[:_WIDTH])
+        for start in range(0, len(items), _WIDTH)
+    ] or [_Block(_EMPTY_ITEMS)]
+    while len(blocks) > 1:
+        shift += _BITS
+        blocks = [
+            _Block(tuple(chain(blocks[start : start + _WIDTH], _EMPTY_ITEMS))[:_WIDTH])
+            for start in range(0, len(blocks), _WIDTH)
+        ]
+    return blocks[0], shift
+
+
+def _blocks_exactly(a: Any, b: Any, shift: int) -> bool:
+    """Same slots, same keys, same child objects (`False` isn't conclusive)"""
+    if a is b:
+        return True
+    if a is None or b is None:
+        return False
+    if not shift:
+        return all(
+            x is y
+            or (
+                x is not None
+                and y is not None
+                and x[1] is y[1]
+                and exact_key_token(x[0]) == exact_key_token(y[0])
+            )
+            for x, y in zip(a.items, b.items)
+        )
+    return all(_blocks_exactly(x, y, shift - _BITS) for x, y in zip(a.items, b.items))
+
+
+def _block_aggregate[A](
+    block: _Block,
+    shift: int,
+    items: Callable[[Iterable[tuple[PathKey, PathsOf[Any]]]], A],
+    combine: Callable[[A, A], A],
+) -> A | None:
+    if block.aggregate is _NOTHING:
+        if shift:
+            parts = [
+                part
+                for child in block.items
+                if child is not None
+                for part in (_block_aggregate(child, shift - _BITS, items, combine),)
+                if part is not None
+            ]
+            block.aggregate = reduce(combine, parts) if parts else None
+        else:
+            present = list(filter(None, block.items))
+            block.aggregate = items(present) if present else None
+    return block.aggregate
+
+
+# The map
+
+
+class _Items(ItemsView["PathKey", "PathsOf[Any]"]):
+    _mapping: Children
+
+    def __iter__(self) -> Iterator[tuple[PathKey, PathsOf[Any]]]:
+        return self._mapping._items()
+
+
+class _Values(ValuesView["PathsOf[Any]"]):
+    _mapping: Children
+
+    def __iter__(self) -> Iterator[PathsOf[Any]]:
+        return (child for __, child in self._mapping._items())
+
+
+class Children(Mapping["PathKey", "PathsOf[Any]"]):
+    """Insertion ordered, like `frozendict`, but changes share structure"""
+
+    __slots__ = (
+        "_trie",
+        "_order",
+        "_order_shift",
+        "_next",
+        "_length",
+        "_hash_sum",
+        "_exact_sum",
+    )
+
+    def __init__(
+        self,
+        trie: _Trie,
+        order: _Block,
+        order_shift: int,
+        next: int,
+        length: int,
+        hash_sum: int,
+        exact_sum: int,
+    ):
+        self._trie = trie
+        self._order = order
+        self._order_shift = order_shift
+        self._next = next
+        """Where the next new key goes in `_order` (deleted ones leave gaps)"""
+        self._length = length
+        self._hash_sum = hash_sum
+        self._exact_sum = exact_sum
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[PathKey, PathsOf[Any]]]) -> Children:
+        entries: dict[PathKey, _Entry] = {}
+        for key, child in items:
+            if (old := entries.get(key)) is not None:
+                entries[old[0]] = (old[0], child, old[2], old[3])
+            else:
+                entries[key] = (key, child, len(entries), hash(key))
+        order, order_shift = _blocks_build(
+            [(key, child) for key, child, __, __ in entries.values()]
+        )
+        return cls(
+            _trie_build(list(entries.values()), 0) if entries else _EMPTY_TRIE,
+            order,
+            order_shift,
+            len(entries),
+            len(entries),
+            sum(map(_hash_part, entries.values())) & _HASH_MASK,
+            sum(map(_exact_part, entries.values())) & _HASH_MASK,
+        )
+
+    def set(self, key: PathKey, child: PathsOf[Any]) -> Children:
+        h = hash(key)
+        hash_sum = self._hash_sum
+        exact_sum = self._exact_sum
+        length = self._length
+        next = self._next
+        if (old := _trie_get(self._trie, key, h)) is not None:
+            if old[1] is child:
+                return self
+            # Like a `dict`, the key that was there first stays
+            entry = (old[0], child, old[2], h)
+            hash_sum -= _hash_part(old)
+            exact_sum -= _exact_part(old)
+        else:
+            entry = (key, child, next, h)
+            length += 1
+            next += 1
+
+        order = self._order
+        order_shift = self._order_shift
+        while entry[2] >> (order_shift + _BITS):
+            order = _Block((order, *_EMPTY_ITEMS[1:]))
+            order_shift += _BITS
+
+        return Children(
+            _trie_set(self._trie, entry, 0),
+            _block_set(order, order_shift, entry[2], (entry[0], child)),
+            order_shift,
+            next,
+            length,
+            (hash_sum + _hash_part(entry)) & _HASH_MASK,
+            (exact_sum + _exact_part(entry)) & _HASH_MASK,
+        )
+
+    def delete(self, key: PathKey) -> Children:
+        h = hash(key)
+        if (old := _trie_get(self._trie, key, h)) is None:
+            raise KeyError(key)
+        return Children(
+            _trie_delete(self._trie, key, h, 0),
+            _block_set(self._order, self._order_shift, old[2], None),
+            self._order_shift,
+            self._next,
+            self._length - 1,
+            (self._hash_sum - _hash_part(old)) & _HASH_MASK,
+            (self._exact_sum - _exact_part(old)) & _HASH_MASK,
+        )
+
+    def _items(self) -> Iterator[tuple[PathKey, PathsOf[Any]]]:
+        return _block_items(self._order, self._order_shift)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[PathKey]:
+        return (key for key, __ in self._items())
+
+    def __contains__(self, key: object) -> bool:
+        return _trie_get(self._trie, key, hash(key)) is not None
+
+    def __getitem__(self, key: PathKey) -> PathsOf[Any]:
+        if (entry := _trie_get(self._trie, key, hash(key))) is None:
+            raise KeyError(key)
+        return entry[1]
+
+    def get(self, key: PathKey, default: Any = None) -> Any:
+        if (entry := _trie_get(self._trie, key, hash(key))) is None:
+            return default
+        return entry[1]
+
+    def items(self) -> _Items:
+        return _Items(self)
+
+    def values(self) -> _Values:
+        return _Values(self)
+
+    def __hash__(self) -> int:
+        return hash((self._length, self._hash_sum))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Children):
+            return (
+                self._length == other._length
+                and self._hash_sum == other._hash_sum
+                and _trie_equal(self._trie, other._trie)
+            )
+        return super().__eq__(other)
+
+    def exact_hash(self) -> int:
+        """For `_interning`: same keys (by `exact_key_token`) and child objects"""
+        return hash((self._length, self._exact_sum))
+
+    def is_exactly(self, other: Children) -> bool:
+        """...in the same order"""
+        if self._length != other._length or self._exact_sum != other._exact_sum:
+            return False
+        if (self._next, self._order_shift) == (
+            other._next,
+            other._order_shift,
+        ) and _blocks_exactly(self._order, other._order, self._order_shift):
+            return True
+        return all(
+            child is other_child and exact_key_token(key) == exact_key_token(other_key)
+            for (key, child), (other_key, other_child) in zip(
+                self._items(), other._items()
+            )
+        )
+
+    def aggregate[A](
+        self,
+        items: Callable[[Iterable[tuple[PathKey, PathsOf[Any]]]], A],
+        combine: Callable[[A, A], A],
+    ) -> A | None:
+        """
+        `items` of each block of (up to `_WIDTH`) children, `combine`d (it
+        has to be associative) in order. Cached per block, so a new version
+        only redoes the blocks it doesn't share. There's only the one cache
+        per block, so this is just for `_summary`
+        """
+        return _block_aggregate(self._order, self._order_shift, items, combine)
+
+
+def _hash_part(entry: _Entry) -> int:
+    return _scramble(hash((entry[0], entry[1])))
+
+
+def _exact_part(entry: _Entry) -> int:
+    return _scramble(hash((exact_key_token(entry[0]), id(entry[1]))))
+
+
+def with_child[V](
+    children: Mapping[PathKey, V], key: PathKey, child: V
+) -> Mapping[PathKey, V]:
+    if isinstance(children, (Children, frozendict)):
+        return children.set(key, child)
+    return frozendict({**children, key: child})
+
+
+def without_child[V](
+    children: Mapping[PathKey, V], key: PathKey
+) -> Mapping[PathKey, V]:
+    if isinstance(children, (Children, frozendict)):
+        return children.delete(key)
+    return frozendict({k: v for k, v in children.items() if k != key})
+
+
+def represent_canonically(paths: PathsOf[Any]):
+    """
+    Settles on `frozendict`, `Leaf`, `Children` or `Columns` for `paths`'
+    children, before it's interned. Only depends on what the children are,
+    so equal nodes always end up with the same
+    """
+    children = paths.paths
+    length = len(children)
+    if length >= columnar.COLUMNAR_THRESHOLD:
+        if isinstance(children, Columns):
+            return
+        if (columns := columns_of(paths)) is not None:
+            object.__setattr__(paths, "paths", columns)
+            return
+    if length >= CHILDREN_THRESHOLD:
+        if not isinstance(children, Children):
+            object.__setattr__(paths, "paths", Children.from_items(children.items()))
+    elif length == 1 and not isinstance(children, Leaf):
+        ((key, child),) = children.items()
+        if is_terminal(child) and not is_wildcard(key):
+            object.__setattr__(paths, "paths", Leaf(key, child))
+        elif not isinstance(children, frozendict):
+            object.__setattr__(paths, "paths", frozendict(children.items()))
+    elif length != 1 and not isinstance(children, frozendict):
+        object.__setattr__(paths, "paths", frozendict(children.items()))
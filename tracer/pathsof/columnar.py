@@ -0,0 +1,293 @@
+"""
+Column-wise children for big `Collection`s of dataclasses
+
+`PathsOf(Collection[R])` of a real collection has a `Wildcard(row): row`
+child per distinct element, each `row` a `PathsOf(R)` with a child per
+field. That's a lot of nodes (and dicts, and `Wildcard`s) all shaped the
+same way, so past `COLUMNAR_THRESHOLD` rows they're kept as `Columns`
+instead: `R`'s field names once, then per field a tuple of that field's
+subtree in each row.
+
+`Columns` is a read-only `Mapping` with the same keys and values the
+`frozendict` would have had (rows are made when asked for), so anything
+that just walks `paths` still works. The tree maths and (dis)assembly go
+through the cells without making rows, and only go into each distinct
+field value once. That's still a pass over the rows, so it's the work
+under them that stops growing with the number of rows, not the pass.
+`single_wildcard_subtrees` (and so tracing) gives a subtree per row, made
+as it's got to.
+
+Which one a node gets is decided by `children.represent_canonically` as
+it's made, from nothing but what's in it, so equal nodes always get the
+same one.
+"""
+
+from __future__ import annotations
+from itertools import repeat
+from operator import is_
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ItemsView,
+    Iterable,
+    Iterator,
+    Mapping,
+    ValuesView,
+)
+
+from frozendict import frozendict
+
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+from .wildcard import Wildcard, is_wildcard
+
+
+COLUMNAR_THRESHOLD = 64
+"""`Collection`s with fewer rows than this keep a `frozendict`"""
+
+type Cells = tuple[PathsOf[Any] | None, ...]
+
+
+def _signature(cells: Cells) -> tuple[Any, ...]:
+    """Equal for rows that are `==`, whatever order their fields were in"""
+    return tuple(None if cell is None else cell._eq_class for cell in cells)
+
+
+class _Items(ItemsView["PathKey", "PathsOf[Any]"]):
+    _mapping: Columns
+
+    def __iter__(self) -> Iterator[tuple[PathKey, PathsOf[Any]]]:
+        for row in self._mapping.rows():
+            yield Wildcard(row), row
+
+
+class _Values(ValuesView["PathsOf[Any]"]):
+    _mapping: Columns
+
+    def __iter__(self) -> Iterator[PathsOf[Any]]:
+        return self._mapping.rows()
+
+
+class Columns(Mapping["PathKey", "PathsOf[Any]"]):
+    """Children of a `PathsOf(Collection[R])`, `R` a dataclass, a column per field"""
+
+    __slots__ = (
+        "element_type",
+        "names",
+        "columns",
+        "_length",
+        "_index",
+        "_hash",
+        "_exact_hash",
+    )
+
+    element_type: type[Any]
+    names: tuple[str, ...]
+    columns: tuple[Cells, ...]
+    """`columns[n][i]` is field `names[n]` of row `i`, `None` if it hasn't got it"""
+
+    def __init__(
+        self,
+        element_type: type[Any],
+        names: tuple[str, ...],
+        columns: tuple[Cells, ...],
+        length: int,
+    ):
+        self.element_type = element_type
+        self.names = names
+        self.columns = columns
+        self._length = length
+        self._index: dict[tuple[Any, ...], int] | None = None
+        self._hash: int | None = None
+        self._exact_hash: int | None = None
+
+    @classmethod
+    def from_rows(
+        cls, element_type: type[Any], names: tuple[str, ...], rows: Iterable[Cells]
+    ) -> Columns:
+        """Duplicate rows are dropped, as they would be as `frozendict` keys"""
+        seen: set[tuple[Any, ...]] = set()
+        kept: list[Cells] = []
+        for cells in rows:
+            signature = _signature(cells)
+            if signature not in seen:
+                seen.add(signature)
+                kept.append(cells)
+        return cls(
+            element_type,
+            names,
+            tuple(zip(*kept)) if kept else tuple(() for _ in names),
+            len(kept),
+        )
+
+    def cells(self) -> Iterator[Cells]:
+        """Each row's fields, in `names` order"""
+        if not self.names:
+            return repeat((), self._length)
+        return zip(*self.columns)
+
+    def row(self, cells: Cells) -> PathsOf[Any]:
+        from . import PathsOf
+
+        return PathsOf(
+            self.element_type,
+            paths=frozendict(
+                {
+                    name: cell
+                    for name, cell in zip(self.names, cells)
+                    if cell is not None
+                }
+            ),
+        )
+
+    def rows(self) -> Iterator[PathsOf[Any]]:
+        return map(self.row, self.cells())
+
+    def cells_at(self, number: int) -> Cells:
+        """Row `number`'s fields, in `names` order"""
+        return tuple(column[number] for column in self.columns)
+
+    def compatible_cells(self, paths: PathsOf[Any]) -> Iterable[Cells] | None:
+        """
+        `paths`' rows as cells lined up with ours, if it's a collection of the
+        same thing (columnar or not)
+        """
+        children = paths.paths
+        if isinstance(children, Columns):
+            if (children.element_type, children.names) != (
+                self.element_type,
+                self.names,
+            ):
+                return None
+            return children.cells()
+        return _eager_cells(self.element_type, self.names, children)
+
+    def _row_number(self, key: Any) -> int | None:
+        if not is_wildcard(key) or (row := key.subtree) is None:
+            return None
+        if row.type != self.element_type or row.sequence_length is not None:
+            return None
+        children = row.paths
+        if not set(children).issubset(self.names):
+            return None
+        return self._numbers().get(
+            _signature(tuple(children.get(name) for name in self.names))
+        )
+
+    def _numbers(self) -> dict[tuple[Any, ...], int]:
+        if self._index is None:
+            self._index = {
+                _signature(cells): number for number, cells in enumerate(self.cells())
+            }
+        return self._index
+
+    def has_cells(self, cells: Cells) -> bool:
+        """Whether there's a row `==` the one with these cells"""
+        return _signature(cells) in self._numbers()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[PathKey]:
+        return map(Wildcard, self.rows())
+
+    def __contains__(self, key: object) -> bool:
+        return self._row_number(key) is not None
+
+    def __getitem__(self, key: PathKey) -> PathsOf[Any]:
+        if (number := self._row_number(key)) is None:
+            raise KeyError(key)
+        return self.row(self.cells_at(number))
+
+    def items(self) -> _Items:
+        return _Items(self)
+
+    def values(self) -> _Values:
+        return _Values(self)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(
+                (
+                    self.element_type,
+                    self.names,
+                    frozenset(map(_signature, self.cells())),
+                )
+            )
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Columns):
+            return (
+                self.element_type == other.element_type
+                and self.names == other.names
+                and self._length == other._length
+                and set(map(_signature, self.cells()))
+                == set(map(_signature, other.cells()))
+            )
+        return super().__eq__(other)
+
+    def exact_hash(self) -> int:
+        """For `_interning`: same cells, in the same order"""
+        if self._exact_hash is None:
+            self._exact_hash = hash(
+                (
+                    self.element_type,
+                    self.names,
+                    tuple(tuple(map(id, column)) for column in self.columns),
+                )
+            )
+        return self._exact_hash
+
+    def is_exactly(self, other: Columns) -> bool:
+        return (
+            self.element_type == other.element_type
+            and self.names == other.names
+            and self._length == other._length
+            and all(all(map(is_, a, b)) for a, b in zip(self.columns, other.columns))
+        )
+
+
+def _eager_cells(
+    element_type: type[Any],
+    names: tuple[str, ...],
+    children: Mapping[PathKey, PathsOf[Any]],
+) -> list[Cells] | None:
+    rows: list[Cells] = []
+    for key, row in children.items():
+        if not (
+            is_wildcard(key)
+            and key.subtree == row
+            and row.type == element_type
+            and row.sequence_length is None
+        ):
+            return None
+        row_children = row.paths
+        if not set(row_children).issubset(names):
+            return None
+        rows.append(tuple(row_children.get(name) for name in names))
+    return rows
+
+
+def columns_of(paths: PathsOf[Any]) -> Columns | None:
+    # Importing properly seems to have inevitable loop
+    from ._schema import Kind, schema_of
+
+    schema = schema_of(paths.type)
+    if schema.kind is not Kind.COLLECTION or schema.element_type is None:
+        return None
+    element_schema = schema_of(schema.element_type)
+    if element_schema.kind is not Kind.DATACLASS:
+        return None
+    names = tuple(name for name in element_schema.keys if isinstance(name, str))
+    rows = _eager_cells(schema.element_type, names, paths.paths)
+    if rows is None:
+        return None
+    return Columns(
+        schema.element_type,
+        names,
+        tuple(zip(*rows)) if rows else tuple(() for _ in names),
+        len(rows),
+    )
@@ -0,0 +1,300 @@
+"""
+`PathsOf(T).full`, every path there is, expanded only as far as something
+looks
+
+Making all of it up front is a lot of tree just to say "everything" for a
+big schema, and never finishes for a recursive one. `FullPathsOf` works
+out a node's children the first time they're asked for, and there's only
+one node per type, so a type that contains itself has its own node as a
+descendant (a back-reference) rather than a copy of it under every level.
+
+It's a `LazyPathsOf` (of no instance), so the tree maths already takes it
+anywhere a `PathsOf` goes, and it's looked out for where that would mean
+making all of it: `covers` and `extract` only go as far as the other tree
+does, and `merge` of `full` with anything it already has is `full`. The
+rest of `PathsOf` is done on `materialised`, which is the whole tree, so
+is a `ValueError` for recursive types.
+
+Wildcard children are under `_`, as there's at most one per node.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Iterator
+
+from frozendict import frozendict
+
+from ..cache import cache
+from ..stack import Steps, run
+
+from .lazy import LazyPathsOf, _Children
+from .wildcard import Wildcard, is_wildcard, _
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+
+class FullPathsOf[T](LazyPathsOf[T]):
+    __slots__ = ("_recursive",)
+
+    _recursive: bool | None
+
+    def __init__(self, t: type[T]):
+        super().__init__(t, None)  # type: ignore[arg-type]
+        self._recursive = None
+
+    @property
+    def materialised(self) -> PathsOf[T]:
+        """The whole tree, made the first time it's needed"""
+        if self._materialised is None:
+            if self.recursive:
+                raise ValueError(f"`full` of recursive {self.type!r} never ends")
+            self._materialised = run(_materialised(self))
+        return self._materialised
+
+    @property
+    def unrolled(self) -> PathsOf[T]:
+        """
+        The tree down to wherever a path comes back to a node it's already
+        been through, with an empty tree there. All of it for one that
+        isn't `recursive`, and every field of a recursive one at least once
+        """
+        return run(_unrolled(self, frozenset()))
+
+    @property
+    def recursive(self) -> bool:
+        """Whether there's a back-reference somewhere under here"""
+        if self._recursive is None:
+            self._recursive = _has_cycle(self)
+        return self._recursive
+
+    @property
+    def sequence_length(self) -> int | None:
+        return None
+
+    def children(self) -> _Children:
+        if self._children is False:
+            from ._schema import schema_of
+
+            schema = schema_of(self.type)
+            explicit: dict[PathKey, LazyPathsOf[Any]] = {}
+            wildcards: tuple[LazyPathsOf[Any], ...] = ()
+            for key in schema.keys:
+                child = full_paths_of(schema.type_at_key(key))
+                if is_wildcard(key):
+                    wildcards = (child,)
+                else:
+                    explicit[key] = child
+            self._children = explicit, wildcards
+        return self._children  # type: ignore[return-value]
+
+    @property
+    def _explicit(self) -> dict[PathKey, FullPathsOf[Any]]:
+        return self.children()[0]  # type: ignore[return-value]
+
+    @property
+    def _wildcards(self) -> dict[PathKey, FullPathsOf[Any]]:
+        return {_: child for child in self.children()[1]}  # type: ignore[misc]
+
+    def items(self) -> Iterator[tuple[PathKey, FullPathsOf[Any]]]:  # type: ignore[override]
+        explicit, wildcards = self.children()
+        yield from explicit.items()  # type: ignore[misc]
+        for child in wildcards:
+            yield _, child  # type: ignore[misc]
+
+    def __iter__(self) -> Iterator[PathKey]:
+        return (key for key, __ in self.items())
+
+    def __len__(self) -> int:
+        explicit, wildcards = self.children()
+        return len(explicit) + len(wildcards)
+
+    def __getitem__(self, key: PathKey) -> FullPathsOf[Any]:
+        explicit, wildcards = self.children()
+        if is_wildcard(key):
+            if not wildcards:
+                raise KeyError(key)
+            return wildcards[0]  # type: ignore[return-value]
+        return explicit[key]  # type: ignore[return-value]
+
+    def __contains__(self, key: object) -> bool:
+        explicit, wildcards = self.children()
+        return bool(wildcards) if is_wildcard(key) else key in explicit
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FullPathsOf):
+            return self.type == other.type
+        # (A tree that ends can't be one that doesn't)
+        return not self.recursive and super().__eq__(other)
+
+    def __hash__(self) -> int:
+        if self.recursive:
+            return hash((FullPathsOf, self.type))
+        return super().__hash__()
+
+    def __repr__(self) -> str:
+        return f"PathsOf({self.type!r}).full"
+
+    @property
+    def view(self) -> Any:
+        from .view import View
+
+        return View(self)  # type: ignore[arg-type]
+
+    def covers(
+        self,
+        other: PathsOf[T] | LazyPathsOf[T],
+        *,
+        all_the_way_to_the_leaves: bool = False,
+    ) -> bool:
+        if isinstance(other, FullPathsOf):
+            return True
+        return super().covers(
+            other, all_the_way_to_the_leaves=all_the_way_to_the_leaves
+        )
+
+    def extract(
+        self, paths: PathsOf[T] | LazyPathsOf[T], *, must_match_all: bool = True
+    ) -> PathsOf[T]:
+        if isinstance(paths, FullPathsOf):
+            return self  # type: ignore[return-value]
+        return super().extract(paths, must_match_all=must_match_all)
+
+    def merge(
+        self, *others: PathsOf[T] | LazyPathsOf[T], merge_wildcards: bool = False
+    ) -> PathsOf[T]:
+        return merged_with_full(self, others, merge_wildcards)
+
+
+@cache(maxsize=None)
+def full_paths_of[T](t: type[T]) -> FullPathsOf[T]:
+    """The one `FullPathsOf(t)`, so a type's node is its own back-reference"""
+    return FullPathsOf(t)
+
+
+def _materialised[T](node: FullPathsOf[T]) -> Steps[PathsOf[T]]:
+    from . import PathsOf
+
+    if node._materialised is not None:
+        return node._materialised
+
+    children: dict[PathKey, PathsOf[Any]] = {}
+    for key, child in node.items():
+        subtree = yield _materialised(child)
+        children[Wildcard(subtree) if is_wildcard(key) else key] = subtree
+    node._materialised = PathsOf(node.type, paths=frozendict(children))
+    return node._materialised
+
+
+def _unrolled[T](node: FullPathsOf[T], on_path: frozenset[int]) -> Steps[PathsOf[T]]:
+    from . import PathsOf
+
+    on_path |= {id(node)}
+    children: dict[PathKey, PathsOf[Any]] = {}
+    for key, child in node.items():
+        if id(child) in on_path:
+            subtree = PathsOf(child.type)
+        else:
+            subtree = yield _unrolled(child, on_path)
+        children[Wildcard(subtree) if is_wildcard(key) else key] = subtree
+    return PathsOf(node.type, paths=frozendict(children))
+
+
+def _has_cycle(node: FullPathsOf[Any]) -> bool:
+    """
+    Depth first on an explicit stack. Nodes gone all the way through are
+    marked as not recursive on the way, so later asks don't go into them
+    """
+    on_path = {id(node)}
+    stack = [(node, iter(_child_nodes(node)))]
+    while stack:
+        current, children = stack[-1]
+        if (child := next(children, None)) is None:
+            stack.pop()
+            on_path.discard(id(current))
+            current._recursive = False
+            continue
+        if id(child) in on_path or child._recursive:
+            return True
+        if child._recursive is None:
+            on_path.add(id(child))
+            stack.append((child, iter(_child_nodes(child))))
+    return False
+
+
+def _child_nodes(node: FullPathsOf[Any]) -> list[FullPathsOf[Any]]:
+    explicit, wildcards = node.children()
+    return [*explicit.values(), *wildcards]  # type: ignore[list-item]
+
+
+def within_full(full: FullPathsOf[Any], paths: PathsOf[Any]) -> bool:
+    """
+    Whether `paths` is nothing but some of `full`'s paths: no data under
+    its leaves, no sequence lengths
+    """
+    return run(_within(full, paths))
+
+
+def _within(full: FullPathsOf[Any], paths: PathsOf[Any]) -> Steps[bool]:
+    if paths.sequence_length is not None:
+        return False
+    for key, child in paths.items():
+        if key not in full or not (yield _within(full[key], child)):
+            return False
+    return True
+
+
+def merged_with_full[T](
+    full: FullPathsOf[T],
+    others: tuple[PathsOf[T] | LazyPathsOf[T], ...],
+    merge_wildcards: bool,
+) -> PathsOf[T]:
+    """
+    `full` if it already has all of `others`. Their wildcard branches
+    would be separate from `full`'s without `merge_wildcards`, but all
+    they'd add is paths `full` has anyway
+    """
+    rest = [other for other in others if not isinstance(other, FullPathsOf)]
+    if all(
+        not isinstance(other, LazyPathsOf) and within_full(full, other)
+        for other in rest
+    ):
+        return full  # type: ignore[return-value]
+    return full.materialised.merge(*rest, merge_wildcards=merge_wildcards)
+
+
+def covered_by[T](
+    paths: PathsOf[T], full: FullPathsOf[T], all_the_way_to_the_leaves: bool
+) -> bool:
+    """`paths.covers(full)`, going only as far down as `paths` does"""
+    return run(_covered_by(paths, full, all_the_way_to_the_leaves, {}))
+
+
+def _covered_by(
+    paths: PathsOf[Any],
+    full: FullPathsOf[Any],
+    all_the_way_to_the_leaves: bool,
+    memo: dict[tuple[int, int], bool],
+) -> Steps[bool]:
+    """The same walk as `tree_maths.covers._covers`"""
+    if not all_the_way_to_the_leaves and not paths.paths:
+        return True
+    if (verdict := memo.get((id(paths), id(full)))) is not None:
+        return verdict
+
+    verdict = True
+    for key, child in full.items():
+        if (
+            not is_wildcard(key)
+            and (paths_child := paths.get(key)) is not None
+            and (yield _covered_by(paths_child, child, all_the_way_to_the_leaves, memo))
+        ):
+            continue
+        for paths_child in paths._wildcards.values():
+            if (yield _covered_by(paths_child, child, all_the_way_to_the_leaves, memo)):
+                break
+        else:
+            verdict = False
+            break
+
+    memo[id(paths), id(full)] = verdict
+    return verdict
@@ -6,6 +6,8 @@ HOLE_HASH = random.randint(0, sys.maxsize)
 
 
 class Hole:
+    __slots__ = ()
+
     def __eq__(self, other: Any) -> bool:
         if is_hole(other):
             return True
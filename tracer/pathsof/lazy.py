@@ -0,0 +1,266 @@
+"""
+`PathsOf` a live instance, disassembled only as far as something looks
+
+`PathsOf(T).specifically(instance)` makes the whole tree up front, which
+for a big object that's only going to be `covers`ed by, or `extract`ed
+from with, a few fields' worth of selection is mostly wasted.
+`LazyPathsOf` keeps the instance instead, and works out a node's children
+(more `LazyPathsOf`s) the first time they're asked for. Leaves, and
+anything without a rule here, are just disassembled when they're reached.
+
+`covers` and `extract` only go down the children the other tree reaches.
+Everything else (`merge`, `==`, `hash`, the rest of `PathsOf`) is done on
+`materialised`, which is `PathsOf(T).specifically(instance)`, so answers
+are always the eager ones. The tree maths takes `LazyPathsOf` arguments
+too (see `eager`).
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Iterator, Mapping, get_args
+
+from frozendict import frozendict
+
+from ..stack import Steps, run
+
+from .wildcard import Wildcard, is_wildcard
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+
+type _Children = tuple[dict[PathKey, LazyPathsOf[Any]], tuple[LazyPathsOf[Any], ...]]
+
+
+def eager[T](paths: PathsOf[T] | LazyPathsOf[T]) -> PathsOf[T]:
+    """For taking either wherever a `PathsOf` is expected"""
+    return paths.materialised if isinstance(paths, LazyPathsOf) else paths
+
+
+class LazyPathsOf[T](Mapping["PathKey", Any]):
+    __slots__ = ("type", "instance", "_children", "_materialised")
+
+    type: type[T]
+    instance: T
+    _children: _Children | None | bool
+    """`False` until worked out"""
+    _materialised: PathsOf[T] | None
+
+    def __init__(self, t: type[T], instance: T):
+        self.type = t
+        self.instance = instance
+        self._children = False
+        self._materialised = None
+
+    @property
+    def materialised(self) -> PathsOf[T]:
+        """The whole tree, made the first time it's needed"""
+        if self._materialised is None:
+            from ._disassembly import disassembler
+
+            self._materialised = run(disassembler(self.type)(self.instance))
+        return self._materialised
+
+    @property
+    def sequence_length(self) -> int | None:
+        from ._schema import schema_of
+
+        if schema_of(self.type).is_sequence:
+            return len(self.instance)  # type: ignore[arg-type]
+        return None
+
+    def children(self) -> _Children | None:
+        """
+        The children under explicit keys, and the ones under wildcards
+        (without their keys, which are the materialised children). Only
+        ever one or the other. `None` if there's no working them out
+        without the whole tree
+        """
+        if self._children is not False:
+            return self._children  # type: ignore[return-value]
+
+        from ._schema import Kind, schema_of
+        from .mapping import MappingItem
+
+        schema = schema_of(self.type)
+        instance: Any = self.instance
+        explicit: dict[PathKey, LazyPathsOf[Any]] = {}
+        wildcards: tuple[LazyPathsOf[Any], ...] = ()
+        match schema.kind:
+            case Kind.UNION:
+                member = schema.union_member(instance)
+                explicit[member] = LazyPathsOf(member, instance)
+            # (Subclass instances can have more fields than `t` says)
+            case Kind.DATACLASS if type(instance) is schema.origin:
+                for name in schema.keys:
+                    if isinstance(name, str):
+                        value = getattr(instance, name)
+                        field_type = schema.field_type(name)
+                        # (Items of untyped `Mapping`s)
+                        if field_type is Any:
+                            field_type = type(value)
+                        explicit[name] = LazyPathsOf(field_type, value)
+            case Kind.MAPPING if schema.element_type is not None:
+                item_type: Any = schema.element_type
+                wildcards = tuple(
+                    LazyPathsOf(item_type, MappingItem(key=key, value=value))
+                    for key, value in instance.items()
+                )
+            case Kind.COLLECTION if schema.element_type is not None:
+                element_type = schema.element_type
+                typed = element_type is not object or get_args(self.type)
+                wildcards = tuple(
+                    LazyPathsOf(element_type if typed else type(element), element)
+                    for element in instance
+                )
+            case _:
+                self._children = None
+                return None
+
+        self._children = explicit, wildcards
+        return self._children
+
+    def _type_at_key(self, key: PathKey) -> type[Any]:
+        from ._schema import schema_of
+
+        return schema_of(self.type).type_at_key(key)
+
+    def __bool__(self) -> bool:
+        if (children := self.children()) is None:
+            return bool(self.materialised)
+        explicit, wildcards = children
+        return bool(explicit or wildcards)
+
+    def __len__(self) -> int:
+        return len(self.materialised)
+
+    def __iter__(self) -> Iterator[PathKey]:
+        return iter(self.materialised)
+
+    def __getitem__(self, key: PathKey) -> LazyPathsOf[Any] | PathsOf[Any]:
+        if not is_wildcard(key) and (children := self.children()) is not None:
+            return children[0][key]
+        return self.materialised[key]
+
+    def __contains__(self, key: object) -> bool:
+        if not is_wildcard(key) and (children := self.children()) is not None:
+            return key in children[0]
+        return key in self.materialised
+
+    def __eq__(self, other: object) -> bool:
+        return self.materialised == eager(other)  # type: ignore[arg-type]
+
+    def __hash__(self) -> int:
+        return hash(self.materialised)
+
+    def __getattr__(self, name: str) -> Any:
+        # The rest of `PathsOf`, on the whole tree
+        return getattr(self.materialised, name)
+
+    def __repr__(self) -> str:
+        return f"LazyPathsOf({self.type!r}, {self.instance!r})"
+
+    def covers(
+        self,
+        other: PathsOf[T] | LazyPathsOf[T],
+        *,
+        all_the_way_to_the_leaves: bool = False,
+    ) -> bool:
+        """`PathsOf.covers`, only looking at the children `other` reaches"""
+        from .full import FullPathsOf
+
+        if isinstance(other, FullPathsOf):
+            # (Which reaches all of them)
+            return self.materialised.covers(
+                other, all_the_way_to_the_leaves=all_the_way_to_the_leaves
+            )
+        return run(_covers(self, eager(other), all_the_way_to_the_leaves))
+
+    def extends(self, other: PathsOf[T] | LazyPathsOf[T]) -> bool:
+        return self.covers(other, all_the_way_to_the_leaves=True)
+
+    def extract(
+        self, paths: PathsOf[T] | LazyPathsOf[T], *, must_match_all: bool = True
+    ) -> PathsOf[T]:
+        """
+        `PathsOf.extract` from just the children `paths` reaches (the rest
+        can't make a difference to the result)
+        """
+        from .full import FullPathsOf
+        from .tree_maths.extract import extract
+
+        if isinstance(paths, FullPathsOf):
+            return extract(self.materialised, paths, must_match_all=must_match_all)
+        paths = eager(paths)
+        return extract(
+            run(_pruned(self, (paths,))), paths, must_match_all=must_match_all
+        )
+
+    def merge(
+        self, *others: PathsOf[T] | LazyPathsOf[T], merge_wildcards: bool = False
+    ) -> PathsOf[T]:
+        return self.materialised.merge(*others, merge_wildcards=merge_wildcards)
+
+
+def _covers(
+    node: LazyPathsOf[Any], other: PathsOf[Any], all_the_way_to_the_leaves: bool
+) -> Steps[bool]:
+    """The same walk as `tree_maths.covers._covers`"""
+    if (children := node.children()) is None:
+        return node.materialised.covers(
+            other, all_the_way_to_the_leaves=all_the_way_to_the_leaves
+        )
+    explicit, wildcards = children
+    if not all_the_way_to_the_leaves and not (explicit or wildcards):
+        return True
+
+    for key, paths in other.items():
+        # A wildcard key can only be found among the wildcards, which get
+        # tried anyway
+        if (
+            not is_wildcard(key)
+            and (child := explicit.get(key)) is not None
+            and (yield _covers(child, paths, all_the_way_to_the_leaves))
+        ):
+            continue
+        for child in wildcards:
+            if (yield _covers(child, paths, all_the_way_to_the_leaves)):
+                break
+        else:
+            return False
+
+    return True
+
+
+def _pruned(
+    node: LazyPathsOf[Any], queries: tuple[PathsOf[Any], ...]
+) -> Steps[PathsOf[Any]]:
+    """
+    `node` with just the children that any of `queries` reach (all of
+    what's under a query leaf), which `extract`s the same as all of `node`
+    """
+    from . import PathsOf
+
+    if not all(queries) or (children := node.children()) is None:
+        return node.materialised
+
+    under_wildcards = tuple(
+        subquery for query in queries for subquery in query._wildcards.values()
+    )
+    explicit, wildcards = children
+    pruned_children: dict[PathKey, PathsOf[Any]] = {}
+    for key, child in explicit.items():
+        reaching = under_wildcards + tuple(
+            query._explicit[key] for query in queries if key in query._explicit
+        )
+        if reaching:
+            pruned_children[key] = yield _pruned(child, reaching)
+    if under_wildcards:
+        for child in wildcards:
+            pruned = yield _pruned(child, under_wildcards)
+            pruned_children[Wildcard(pruned)] = pruned
+
+    return PathsOf(
+        node.type,
+        paths=frozendict(pruned_children),
+        sequence_length=node.sequence_length,
+    )
@@ -0,0 +1,87 @@
+"""
+Children of a leaf node: a single value with the (shared, interned)
+`PathsOf(EllipsisType)` terminal under it
+
+That's the node most of a disassembled payload is made of, one per
+distinct scalar, so rather than a `frozendict` each they get a `Leaf`,
+which is just the value and the terminal in two slots. It's a read-only
+`Mapping` like the `frozendict` would have been; `_summary` shares one
+`Summary` between all leaves with the same key fingerprint, and
+`_assembly` reads the value straight off.
+
+`children.represent_canonically` picks it for any node whose only child is
+the terminal, so equal nodes always get the same.
+"""
+
+from __future__ import annotations
+from types import EllipsisType
+from typing import TYPE_CHECKING, Any, ItemsView, Iterator, Mapping, ValuesView
+
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+
+def is_terminal(paths: PathsOf[Any]) -> bool:
+    """The empty `PathsOf(EllipsisType)`, of which there's only one"""
+    return (
+        paths.type is EllipsisType and not paths.paths and paths.sequence_length is None
+    )
+
+
+class _Items(ItemsView["PathKey", "PathsOf[Any]"]):
+    _mapping: Leaf
+
+    def __iter__(self) -> Iterator[tuple[PathKey, PathsOf[Any]]]:
+        yield self._mapping.key, self._mapping.terminal
+
+
+class _Values(ValuesView["PathsOf[Any]"]):
+    _mapping: Leaf
+
+    def __iter__(self) -> Iterator[PathsOf[Any]]:
+        yield self._mapping.terminal
+
+
+class Leaf(Mapping["PathKey", "PathsOf[Any]"]):
+    """`frozendict({key: terminal})`, in less than a third of the space"""
+
+    __slots__ = ("key", "terminal")
+
+    def __init__(self, key: PathKey, terminal: PathsOf[Any]):
+        self.key = key
+        self.terminal = terminal
+
+    def __len__(self) -> int:
+        return 1
+
+    def __iter__(self) -> Iterator[PathKey]:
+        yield self.key
+
+    def __contains__(self, key: object) -> bool:
+        return key == self.key
+
+    def __getitem__(self, key: PathKey) -> PathsOf[Any]:
+        if key == self.key:
+            return self.terminal
+        raise KeyError(key)
+
+    def get(self, key: PathKey, default: Any = None) -> Any:
+        return self.terminal if key == self.key else default
+
+    def items(self) -> _Items:
+        return _Items(self)
+
+    def values(self) -> _Values:
+        return _Values(self)
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Leaf):
+            return self.key == other.key
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"Leaf({self.key!r})"
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass, replace
-from typing import TYPE_CHECKING, Any, Mapping, Sequence, get_origin
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
 
 from frozendict import frozendict
 
@@ -8,102 +8,202 @@ if TYPE_CHECKING:
     from . import PathsOf
 
 
+from ..cache import cache
+from ..stack import Steps, run
+
 from . import PathKey
 
+from ._interning import is_mapping_type
 from .hole import Hole, is_hole
-from .tree_maths import merge
-from .wildcard import Wildcard, is_wildcard, _
+from .wildcard import Wildcard, is_wildcard
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class MappingItem[K, V]:
     key: K
     value: V
 
 
-def mapping_path[T](
-    t: type[T], path: Sequence[PathKey], *, _prefix: Sequence[PathKey] = ()
-) -> PathsOf[T]:
+@dataclass(frozen=True, slots=True)
+class MappingKey:
+    """
+    Path segment (for `PathsOf.from_paths`) for going through a `Mapping` by
+    key: the (wildcard) item with `key` as its key, then on to its value
+    """
+
+    key: Any
+
+
+def mapping_path[T](t: type[T], path: Sequence[PathKey]) -> PathsOf[T]:
     from . import PathsOf
 
-    first, *rest = path
-    next_prefix = (*_prefix, _, "value")
-    mapping_first = merge(
-        PathsOf(t).eg((*_prefix, _, "key", first)),
-        PathsOf(t).eg(next_prefix),
-        merge_wildcards=True,
-    )
+    return PathsOf(t).from_paths([[MappingKey(key) for key in path]])
+
+
+type _Entry = tuple[PathKey, PathsOf[Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class ItemIndex:
+    """A `Mapping` node's children by the mapping key they're the item for"""
+
+    items: dict[Any, tuple[_Entry, ...]]
+    """By assembled `"key"`, in order of first appearance. Read only"""
+    holes: tuple[_Entry, ...]
+    """The ones without a key"""
+
+    def with_entries(self, entries: Iterable[_Entry]) -> ItemIndex:
+        items = dict(self.items)
+        holes = list(self.holes)
+        _index(items, holes, entries)
+        return ItemIndex(items, tuple(holes))
+
+
+def _index(
+    items: dict[Any, tuple[_Entry, ...]], holes: list[_Entry], entries: Iterable[_Entry]
+):
+    for entry in entries:
+        __, item = entry
+        mapping_key = item["key"].assembled if "key" in item else Hole()
+        if is_hole(mapping_key):
+            holes.append(entry)
+        else:
+            items[mapping_key] = (*items.get(mapping_key, ()), entry)
+
+
+@cache(per_instance=True)
+def _item_index[T](self: PathsOf[T]) -> ItemIndex:
+    items: dict[Any, tuple[_Entry, ...]] = {}
+    holes: list[_Entry] = []
+    _index(items, holes, self.items())
+    return ItemIndex(items, tuple(holes))
 
-    if not rest:
-        return mapping_first
-    else:
-        return merge(
-            mapping_first,
-            mapping_path(t, rest, _prefix=next_prefix),
-            merge_wildcards=True,
-        )
+
+item_index = property(_item_index)
+"""
+`ItemIndex` of a `Mapping` node, worked out once per node, or passed on by
+`merge` and `consolidate_mapping_tree` from the nodes they start from
+"""
+
+
+def mapping_item[T](self: PathsOf[T], key: Any) -> PathsOf[Any] | None:
+    """The item for mapping key `key`, merged into one if there are several"""
+    entries = _item_index(self).items.get(key)
+    if not entries:
+        return None
+    (__, first), *rest = entries
+    return first.merge(*(item for __, item in rest))
+
+
+def merged_index[T](
+    merged: PathsOf[T], paths: PathsOf[T], others: Iterable[PathsOf[T]]
+) -> PathsOf[T]:
+    """
+    Gives `merged` (of `paths` and `others`, `Mapping`s) the index of
+    `paths` plus the new items, if `paths` has one and nothing already
+    there changed
+    """
+    if (index := _item_index.peek(paths)) is None or _item_index.peek(merged):
+        return merged
+    new: dict[PathKey, PathsOf[Any]] = {}
+    for other in others:
+        for key, item in other.items():
+            if key in paths.paths or key in new:
+                # Wildcard items that are already there are the same item,
+                # anything else could have changed
+                if not is_wildcard(key):
+                    return merged
+                continue
+            new[key] = item
+    _item_index.prime(merged, index.with_entries(new.items()))
+    return merged
+
+
+def mark_consolidated[T](paths: PathsOf[T]) -> PathsOf[T]:
+    """
+    For trees known to have nothing for `consolidate_mapping_tree` to do,
+    all the way down. It's a property of the structure, so it's fine to
+    record it on the interned node
+    """
+    object.__setattr__(paths, "_consolidated", True)
+    return paths
 
 
 def consolidate_mapping_tree[T](paths: PathsOf[T]) -> PathsOf[T]:
     """
-    Merge paths with the same (mapping) key (recursive)
+    Merge paths with the same (mapping) key (recursive, on an explicit
+    stack, see `stack`)
+
+    Only goes down subtrees that aren't already consolidated (see
+    `_interning`), and hands back the same nodes where nothing changes
     """
+    return run(_consolidated(paths))
+
+
+def _consolidated[T](paths: PathsOf[T]) -> Steps[PathsOf[T]]:
     from . import PathValue
 
-    origin = get_origin(paths.type) or paths.type
-
-    if issubclass(origin, Mapping):
-        key_trees: dict[Any, tuple[PathKey, PathValue]] = {}
-        hole_trees: list[tuple[PathKey, PathValue]] = []
-        for path_key, subpaths in paths.items():
-            mapping_key = subpaths["key"].assembled if "key" in subpaths else Hole()
-            if is_hole(mapping_key):
-                hole_trees.append((path_key, subpaths))
-            else:
-                if mapping_key in key_trees:
-                    existing_path_key, existing_key_tree = key_trees[mapping_key]
-                    new_key_tree = existing_key_tree.merge(subpaths)
-                    match (existing_path_key, path_key):
-                        case (Wildcard(), Wildcard()):
-                            new_path_key = Wildcard(new_key_tree)
-                        case (Wildcard(), new_path_key) | (new_path_key, Wildcard()):
-                            pass
-                        case (_, _):
-                            assert existing_path_key == path_key
-                            new_path_key = existing_path_key
-                    key_trees[mapping_key] = new_path_key, new_key_tree
-                else:
-                    key_trees[mapping_key] = path_key, subpaths
-
-        return replace(
-            paths,
-            paths=frozendict(
-                {
-                    **{
-                        (
-                            Wildcard(consolidated) if is_wildcard(key) else key
-                        ): consolidated
-                        for key, subpaths in key_trees.values()
-                        for consolidated in (consolidate_mapping_tree(subpaths),)
-                    },
-                    **{
-                        (
-                            Wildcard(consolidated) if is_wildcard(key) else key
-                        ): consolidated
-                        for key, subpaths in hole_trees
-                        for consolidated in (consolidate_mapping_tree(subpaths),)
-                    },
-                }
-            ),
+    if paths._consolidated:
+        return paths
+
+    changed = False
+    mapping = is_mapping_type(paths.type)
+    if mapping:
+        index = _item_index(paths)
+        children = []
+        for entries in index.items.values():
+            path_key, key_tree = entries[0]
+            for other_path_key, subpaths in entries[1:]:
+                changed = True
+                key_tree = key_tree.merge(subpaths)
+                match (path_key, other_path_key):
+                    case (Wildcard(), Wildcard()):
+                        path_key = Wildcard(key_tree)
+                    case (Wildcard(), new_path_key) | (new_path_key, Wildcard()):
+                        path_key = new_path_key
+                    case (_, _):
+                        assert path_key == other_path_key
+            children.append((path_key, key_tree))
+        children.extend(index.holes)
+        # Items with keys go before the ones without, which can move them
+        changed = changed or any(
+            item is not original
+            for (__, item), original in zip(children, paths.paths.values())
         )
     else:
-        return replace(
-            paths,
-            paths=frozendict(
+        children = list(paths.items())
+
+    consolidated_children: dict[PathKey, PathValue] = {}
+    for key, subpaths in children:
+        consolidated = yield _consolidated(subpaths)
+        changed = (
+            changed
+            or consolidated is not subpaths
+            or (is_wildcard(key) and key.subtree is not consolidated)
+        )
+        consolidated_children[Wildcard(consolidated) if is_wildcard(key) else key] = (
+            consolidated
+        )
+
+    if not changed:
+        return mark_consolidated(paths)
+    consolidated = mark_consolidated(
+        replace(paths, paths=frozendict(consolidated_children))
+    )
+    if (
+        mapping
+        and len(consolidated_children) == len(children)
+        and _item_index.peek(consolidated) is None
+    ):
+        # (Consolidating doesn't change what the keys assemble to)
+        _item_index.prime(
+            consolidated,
+            ItemIndex(
                 {
-                    Wildcard(consolidated) if is_wildcard(key) else key: consolidated
-                    for key, subpaths in paths.items()
-                    for consolidated in (consolidate_mapping_tree(subpaths),)
-                }
+                    key: (entry,)
+                    for key, entry in zip(index.items, consolidated_children.items())
+                },
+                tuple(consolidated_children.items())[len(index.items) :],
             ),
         )
+    return consolidated
@@ -0,0 +1,477 @@
+"""
+`PathsOf` as a flat, sorted set of leaf paths
+
+A selection tree (link sources and targets, loop queries) is all shape, so
+it's just as well described by the paths from its root to each of its
+leaves. `PathSet` keeps those as a sorted tuple, each path a tuple of key
+ids (small ints, see `_KeyIds`, every wildcard being `0`), so everything
+under a node is one contiguous range and finding a child is a `bisect`.
+`covers`, `extends`, `merge` and `extract` work on the ranges, without
+making any nodes. Keys only have ids for as long as there's a set with
+them.
+
+Only trees with at most one wildcard per node have a `PathSet`: wildcards
+are all the same key in a path, so there's nowhere to keep separate
+wildcard branches. For the same reason `merge` is
+`merge(merge_wildcards=True)`, and `extract` is what `extract` does with a
+source that is its own only single wildcard subtree (no node with explicit
+children next to its wildcard).
+
+Converting back (`to_paths`) gives an equal tree, children ordered by key
+id rather than as they were. Node types are worked out from the parent's
+schema, so only the ones that aren't what the schema says (and any
+sequence lengths) are stored, by path.
+
+Walks over trees and ranges recurse on an explicit stack (see `stack`).
+
+It's an encoding for code that has many selections to compare against
+each other, and isn't used by `Tracer`: the trees it gets are made as it
+goes and checked against once or twice, which is no more work than
+converting them would be, and they often have several wildcards per
+node, which a `PathSet` can't have.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
+from weakref import finalize
+
+from frozendict import frozendict
+
+from ..cache import cache
+from ..stack import Steps, run
+
+from ._schema import schema_of
+from .children import exact_key_token
+from .wildcard import Wildcard, is_wildcard
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+
+type KeyPath = tuple[int, ...]
+
+WILDCARD_ID = 0
+
+
+class _KeyIds:
+    """
+    Small int ids for the keys of the `PathSet`s there are (keys are told
+    apart by `exact_key_token`, and all wildcards are `WILDCARD_ID`)
+
+    Each set holds the ids it has, and lets go of them when it's collected.
+    Ids nothing holds are only freed (to be given to other keys) by
+    `sweep`, before a set is made, so a set's ids can't go while it's
+    being made
+    """
+
+    __slots__ = ("keys", "_ids", "_tokens", "_holders", "_free", "_released")
+
+    def __init__(self):
+        self.keys: list[PathKey | None] = [Wildcard()]
+        """The key each id is for, `None` for free ones"""
+        self._ids: dict[Any, int] = {}
+        self._tokens: list[Any] = [None]
+        self._holders = [0]
+        self._free: list[int] = []
+        self._released: list[int] = []
+
+    def hold(self, key: PathKey, token: Any) -> int:
+        """Id of `key` (`exact_key_token(key)` being `token`), held once more"""
+        if (id := self._ids.get(token)) is None:
+            if self._free:
+                id = self._free.pop()
+                self.keys[id], self._tokens[id] = key, token
+            else:
+                id = len(self.keys)
+                self.keys.append(key)
+                self._tokens.append(token)
+                self._holders.append(0)
+            self._ids[token] = id
+        self._holders[id] += 1
+        return id
+
+    def hold_ids(self, ids: Iterable[int]):
+        for id in ids:
+            self._holders[id] += 1
+
+    def release(self, ids: Iterable[int]):
+        for id in ids:
+            self._holders[id] -= 1
+            if not self._holders[id]:
+                self._released.append(id)
+
+    def sweep(self):
+        released, self._released = self._released, []
+        for id in released:
+            if not self._holders[id] and self.keys[id] is not None:
+                del self._ids[self._tokens[id]]
+                self.keys[id] = self._tokens[id] = None
+                self._free.append(id)
+
+    def __len__(self) -> int:
+        """How many keys have ids"""
+        return len(self._ids)
+
+
+_key_ids = _KeyIds()
+
+
+def _expected_type(t: type[Any] | None, key: PathKey) -> type[Any] | None:
+    if t is None:
+        return None
+    try:
+        return schema_of(t).type_at_key(key)
+    except Exception:
+        return None
+
+
+def _leaf(paths: Sequence[KeyPath], lo: int, hi: int, depth: int) -> bool:
+    """No children: the range is the one path, ending here"""
+    return hi - lo == 1 and len(paths[lo]) == depth
+
+
+def _child(
+    paths: Sequence[KeyPath], lo: int, hi: int, depth: int, id: int
+) -> tuple[int, int]:
+    """The range under key `id` of the node at `depth` (empty if none)"""
+    if lo == hi or _leaf(paths, lo, hi, depth):
+        return lo, lo
+    prefix = paths[lo][:depth]
+    start = bisect_left(paths, (*prefix, id), lo, hi)
+    return start, bisect_left(paths, (*prefix, id + 1), start, hi)
+
+
+def _missing(paths: Sequence[KeyPath], lo: int, hi: int, depth: int, id: int) -> bool:
+    child_lo, child_hi = _child(paths, lo, hi, depth, id)
+    return child_lo == child_hi
+
+
+def _children(
+    paths: Sequence[KeyPath], lo: int, hi: int, depth: int
+) -> Iterator[tuple[int, int, int]]:
+    """`(id, lo, hi)` for each child of the node at `depth`, by id"""
+    if lo == hi or _leaf(paths, lo, hi, depth):
+        return
+    prefix = paths[lo][:depth]
+    while lo < hi:
+        id = paths[lo][depth]
+        end = bisect_left(paths, (*prefix, id + 1), lo, hi)
+        yield id, lo, end
+        lo = end
+
+
+def _covers_path(
+    paths: Sequence[KeyPath], path: KeyPath, all_the_way_to_the_leaves: bool
+) -> bool:
+    """
+    `PathSet.covers` when `other` is just the one path, which can only go
+    down one branch: follow it down every branch of `paths` it matches at
+    once
+    """
+    ranges = [(0, len(paths))]
+    for depth, id in enumerate(path):
+        matches = []
+        for lo, hi in ranges:
+            if _leaf(paths, lo, hi, depth):
+                if not all_the_way_to_the_leaves:
+                    return True
+                continue
+            prefix = paths[lo][:depth]
+            for match in (id, WILDCARD_ID) if id != WILDCARD_ID else (id,):
+                start = bisect_left(paths, (*prefix, match), lo, hi)
+                end = bisect_left(paths, (*prefix, match + 1), start, hi)
+                if start < end:
+                    matches.append((start, end))
+        if not matches:
+            return False
+        ranges = matches
+    return True
+
+
+def _has_node(paths: Sequence[KeyPath], prefix: KeyPath) -> bool:
+    """Whether a path of `paths` goes through (or ends at) `prefix`"""
+    at = bisect_left(paths, prefix)
+    return at < len(paths) and paths[at][: len(prefix)] == prefix
+
+
+def _normalised(paths: Iterable[KeyPath]) -> tuple[KeyPath, ...]:
+    """Sorted, without duplicates or paths that are prefixes of others"""
+    ordered = sorted(set(paths))
+    return tuple(
+        path
+        for path, next in zip(ordered, (*ordered[1:], None))
+        if next is None or next[: len(path)] != path
+    )
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class PathSet:
+    type: type[Any]
+    paths: tuple[KeyPath, ...]
+    """Sorted, each the key ids from the root to a leaf"""
+    types: frozendict[KeyPath, type[Any]]
+    """Types of the nodes (by path) that aren't the type their schema says"""
+    lengths: frozendict[KeyPath, int]
+    """Sequence lengths of the nodes (by path) that have one"""
+    held: tuple[int, ...] = field(repr=False, compare=False)
+    """
+    The key ids it has (but `WILDCARD_ID`), already held for it (see
+    `_KeyIds`), to let go of when it goes
+    """
+
+    def __post_init__(self):
+        finalize(self, _key_ids.release, self.held)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self) -> Iterator[tuple[PathKey, ...]]:
+        """The leaf paths, as keys"""
+        for path in self.paths:
+            yield tuple(_key_ids.keys[id] for id in path)
+
+    def to_paths(self) -> PathsOf[Any]:
+        return run(_built(self, 0, len(self.paths), 0, self.type))
+
+    def covers(
+        self, other: PathSet, *, all_the_way_to_the_leaves: bool = False
+    ) -> bool:
+        """Same answer as `PathsOf.covers` on the trees"""
+        a, b = self.paths, other.paths
+        if len(b) == 1:
+            return _covers_path(a, b[0], all_the_way_to_the_leaves)
+        return run(_covers(a, b, 0, len(a), 0, len(b), 0, all_the_way_to_the_leaves))
+
+    def extends(self, other: PathSet) -> bool:
+        return self.covers(other, all_the_way_to_the_leaves=True)
+
+    def merge(self, *others: PathSet) -> PathSet:
+        """`PathsOf.merge(..., merge_wildcards=True)`"""
+        for other in others:
+            assert self.type == other.type, f"{self.type} != {other.type}"
+        types = dict(self.types)
+        lengths = dict(self.lengths)
+        for other in others:
+            types.update(other.types)
+            for path, length in other.lengths.items():
+                lengths[path] = max(length, lengths.get(path, length))
+        return _made(
+            self.type,
+            _normalised(path for paths in (self, *others) for path in paths.paths),
+            frozendict(types),
+            frozendict(lengths),
+        )
+
+    def extract(self, paths: PathSet, *, must_match_all: bool = True) -> PathSet:
+        """
+        `PathsOf.extract`, for `self`s with no explicit keys next to
+        wildcards. Where a node of `paths` has both an explicit key and a
+        wildcard for the same key of `self`, the tree version keeps
+        whichever of the two comes later in `paths`, this the explicit one
+        """
+        assert self.type == paths.type, f"{self.type} != {paths.type}"
+        source, query = self.paths, paths.paths
+
+        extracted = run(
+            _extract(
+                source, query, 0, len(source), 0, len(query), 0, (), must_match_all
+            )
+        )
+        result = _normalised(extracted if extracted is not None else [()])
+        return _made(
+            self.type,
+            result,
+            frozendict((p, t) for p, t in self.types.items() if _has_node(result, p)),
+            frozendict((p, n) for p, n in self.lengths.items() if _has_node(result, p)),
+        )
+
+
+def _made(
+    t: type[Any],
+    paths: tuple[KeyPath, ...],
+    types: frozendict[KeyPath, type[Any]],
+    lengths: frozendict[KeyPath, int],
+) -> PathSet:
+    """
+    A `PathSet` of ids that other sets (still around) have, holding them
+    for it too
+    """
+    held = tuple({id for path in paths for id in path if id != WILDCARD_ID})
+    _key_ids.hold_ids(held)
+    return PathSet(t, paths, types, lengths, held)
+
+
+def _built(
+    path_set: PathSet, lo: int, hi: int, depth: int, t: type[Any] | None
+) -> Steps[PathsOf[Any]]:
+    from . import PathsOf
+
+    paths = path_set.paths
+    prefix = paths[lo][:depth]
+    t = path_set.types.get(prefix, t)
+    assert t is not None
+    children: dict[PathKey, PathsOf[Any]] = {}
+    for id, child_lo, child_hi in _children(paths, lo, hi, depth):
+        key = _key_ids.keys[id]
+        child = yield _built(
+            path_set, child_lo, child_hi, depth + 1, _expected_type(t, key)
+        )
+        children[Wildcard(child) if id == WILDCARD_ID else key] = child
+    return PathsOf(
+        t,
+        paths=frozendict(children),
+        sequence_length=path_set.lengths.get(prefix),
+    )
+
+
+def _covers(
+    a: Sequence[KeyPath],
+    b: Sequence[KeyPath],
+    lo: int,
+    hi: int,
+    other_lo: int,
+    other_hi: int,
+    depth: int,
+    all_the_way_to_the_leaves: bool,
+) -> Steps[bool]:
+    if not all_the_way_to_the_leaves and _leaf(a, lo, hi, depth):
+        return True
+    if _leaf(b, other_lo, other_hi, depth):
+        return True
+    wildcard_lo, wildcard_hi = _child(a, lo, hi, depth, WILDCARD_ID)
+    for id, child_lo, child_hi in _children(b, other_lo, other_hi, depth):
+        own_lo, own_hi = _child(a, lo, hi, depth, id)
+        if own_lo < own_hi and (
+            yield _covers(
+                a,
+                b,
+                own_lo,
+                own_hi,
+                child_lo,
+                child_hi,
+                depth + 1,
+                all_the_way_to_the_leaves,
+            )
+        ):
+            continue
+        # (For a wildcard, that was the wildcard)
+        if (
+            id != WILDCARD_ID
+            and wildcard_lo < wildcard_hi
+            and (
+                yield _covers(
+                    a,
+                    b,
+                    wildcard_lo,
+                    wildcard_hi,
+                    child_lo,
+                    child_hi,
+                    depth + 1,
+                    all_the_way_to_the_leaves,
+                )
+            )
+        ):
+            continue
+        return False
+    return True
+
+
+def _extract(
+    source: Sequence[KeyPath],
+    query: Sequence[KeyPath],
+    lo: int,
+    hi: int,
+    query_lo: int,
+    query_hi: int,
+    depth: int,
+    prefix: KeyPath,
+    must_match_all: bool,
+) -> Steps[list[KeyPath] | None]:
+    # `lo == hi` is a node `source` hasn't got, as an empty one
+    if _leaf(query, query_lo, query_hi, depth):
+        return list(source[lo:hi]) if lo < hi else [prefix]
+
+    query_children = list(_children(query, query_lo, query_hi, depth))
+    if must_match_all and any(
+        id != WILDCARD_ID and _missing(source, lo, hi, depth, id)
+        for id, __, __ in query_children
+    ):
+        return None
+
+    extracted: dict[int, list[KeyPath]] = {}
+    wildcard: list[KeyPath] = []
+    for id, child_query_lo, child_query_hi in query_children:
+        if id == WILDCARD_ID:
+            pairs = list(_children(source, lo, hi, depth))
+        else:
+            pairs = [(id, *_child(source, lo, hi, depth, id))]
+        for source_id, child_lo, child_hi in pairs:
+            child = yield _extract(
+                source,
+                query,
+                child_lo,
+                child_hi,
+                child_query_lo,
+                child_query_hi,
+                depth + 1,
+                (*prefix, source_id),
+                must_match_all,
+            )
+            if child is None:
+                return None
+            if source_id == WILDCARD_ID:
+                wildcard.extend(child)
+            else:
+                extracted[source_id] = child
+    return [
+        *(path for child in extracted.values() for path in child),
+        *wildcard,
+    ] or [prefix]
+
+
+@property
+@cache(per_instance=True)
+def path_set[T](self: PathsOf[T]) -> PathSet:
+    """
+    `self` as a `PathSet`, `ValueError` if it has a node with more than
+    one wildcard
+    """
+    _key_ids.sweep()
+    ids: dict[Any, int] = {}
+    paths: list[KeyPath] = []
+    types: dict[KeyPath, type[Any]] = {}
+    lengths: dict[KeyPath, int] = {}
+
+    def walk(
+        node: PathsOf[Any], prefix: KeyPath, expected: type[Any] | None
+    ) -> Steps[None]:
+        if node.type != expected:
+            types[prefix] = node.type
+        if node.sequence_length is not None:
+            lengths[prefix] = node.sequence_length
+        if not node.paths:
+            paths.append(prefix)
+            return
+        if len(node._wildcards) > 1:
+            raise ValueError(f"More than one wildcard under {prefix}:\n{node}")
+        for key, child in node.items():
+            if is_wildcard(key):
+                id = WILDCARD_ID
+            elif (id := ids.get(token := exact_key_token(key))) is None:
+                id = ids[token] = _key_ids.hold(key, token)
+            yield walk(child, (*prefix, id), _expected_type(node.type, key))
+
+    try:
+        run(walk(self, (), self.type))
+    except ValueError:
+        _key_ids.release(ids.values())
+        raise
+    return PathSet(
+        self.type,
+        _normalised(paths),
+        frozendict(types),
+        frozendict(lengths),
+        tuple(ids.values()),
+    )
@@ -1,7 +1,8 @@
 from .covers import covers as covers, extends as extends
 from .extract import extract as extract
-from .merge import merge as merge
+from .merge import merge as merge, merge_all as merge_all
 from .remove_lowest_level import (
+    lowest_levels_removed as lowest_levels_removed,
     remove_lowest_level as remove_lowest_level,
     remove_lowest_level_or_none as remove_lowest_level_or_none,
 )
@@ -1,11 +1,17 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Mapping
 
 
 if TYPE_CHECKING:
-    from .. import PathsOf
+    from .. import PathsOf, PathKey
 
-from ..wildcard import is_wildcard
+from ...cache import cache
+from ...stack import Steps
+
+from .._summary import cannot_cover
+from ..columnar import Columns
+from ..full import FullPathsOf, covered_by
+from ..lazy import eager
 
 
 def covers[T](
@@ -17,28 +23,112 @@ def covers[T](
     `all_the_way_to_the_leaves` means what it says, if it's False then `other`
     can extend past `self`'s leaves as long as it's on subtrees of those leaves
 
+    Memoised on the `(self, other, all_the_way_to_the_leaves)` triple, and
+    the recursion goes back through the memo, so shared subtrees (across
+    `disjunction` members, or coherence check levels) only get walked once.
+    The recursion is on an explicit stack (see `stack`), so any depth is
+    fine
+
     FIXME good report
     """
+    if isinstance(other, FullPathsOf):
+        return covered_by(self, other, all_the_way_to_the_leaves)
+    return _covers(self, eager(other), all_the_way_to_the_leaves)
+
+
+@cache(maxsize=2**14, steps=True)
+def _covers[T](
+    self: PathsOf[T], other: PathsOf[T], all_the_way_to_the_leaves: bool
+) -> Steps[bool]:
     if not all_the_way_to_the_leaves and not self.paths:
         return True
 
+    if cannot_cover(self, other, all_the_way_to_the_leaves):
+        return False
+
+    if isinstance(self.paths, Columns):
+        # All wildcards, so having the same key doesn't add anything
+        columns = self.paths
+        if (
+            isinstance(other.paths, Columns)
+            and (rows := columns.compatible_cells(other)) is not None
+        ):
+            # Straight from the cells, and rows we have too cover themselves
+            # (which is worth indexing ours for when there are this many)
+            for cells in rows:
+                if columns.has_cells(cells):
+                    continue
+                fields = {
+                    name: cell
+                    for name, cell in zip(columns.names, cells)
+                    if cell is not None
+                }
+                if not (
+                    yield _some_row_covers(columns, fields, all_the_way_to_the_leaves)
+                ):
+                    return False
+            return True
+        for paths in other.values():
+            if not (
+                yield _some_row_covers(columns, paths.paths, all_the_way_to_the_leaves)
+            ):
+                return False
+        return True
+
     for key, paths in other.items():
-        if key in self and self[key].covers(
-            paths, all_the_way_to_the_leaves=all_the_way_to_the_leaves
+        if (self_paths := self.paths.get(key)) is not None and (
+            yield _covers.steps(self_paths, paths, all_the_way_to_the_leaves)
         ):
             continue
 
-        for self_key, self_paths in self.items():
-            if is_wildcard(self_key):
-                if self_paths.covers(
-                    paths, all_the_way_to_the_leaves=all_the_way_to_the_leaves
-                ):
-                    break
+        for self_paths in self._wildcards.values():
+            if (yield _covers.steps(self_paths, paths, all_the_way_to_the_leaves)):
+                break
         else:
             return False
 
     return True
 
 
+def _some_row_covers(
+    columns: Columns,
+    fields: Mapping[PathKey, PathsOf[Any]],
+    all_the_way_to_the_leaves: bool,
+) -> Steps[bool]:
+    """
+    Whether any row covers a tree with children `fields`, asking about each
+    distinct field value once. Rows only have field name keys, so that's
+    all it can have, unless the row is empty and that's good enough
+    """
+    if not fields:
+        return len(columns) > 0
+
+    positions = {name: position for position, name in enumerate(columns.names)}
+    wanted: list[tuple[int, PathsOf[Any], dict[PathsOf[Any], bool]]] | None = []
+    for key, paths in fields.items():
+        if (position := positions.get(key)) is None:
+            wanted = None
+            break
+        wanted.append((position, paths, {}))
+
+    for cells in columns.cells():
+        if wanted is not None:
+            for position, paths, verdicts in wanted:
+                if (cell := cells[position]) is None:
+                    break
+                if (verdict := verdicts.get(cell)) is None:
+                    verdict = verdicts[cell] = yield _covers.steps(
+                        cell, paths, all_the_way_to_the_leaves
+                    )
+                if not verdict:
+                    break
+            else:
+                return True
+        if not all_the_way_to_the_leaves and all(cell is None for cell in cells):
+            return True
+
+    return False
+
+
 def extends[T](self: PathsOf[T], other: PathsOf[T]) -> bool:
     return self.covers(other, all_the_way_to_the_leaves=True)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import replace
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterator
 
 from frozendict import frozendict
 
@@ -8,87 +8,320 @@ from frozendict import frozendict
 if TYPE_CHECKING:
     from .. import PathsOf
 
+from ...stack import Steps, run
+
 from .. import PathKey, PathValue
 
+from .._interning import is_mapping_type
+from .._summary import cannot_extract_all
+from ..columnar import Cells, Columns
+from ..full import FullPathsOf
+from ..lazy import eager
 from ..wildcard import Wildcard, is_wildcard
 
+from .merge import merge_all
 from .single_wildcard_subtrees import single_wildcard_subtrees
 
 
 def extract[T](
     self: PathsOf[T], paths: PathsOf[T], *, must_match_all: bool = True
 ) -> PathsOf[T]:
-    extracted = replace(self, paths=frozendict())
+    if not isinstance(paths, FullPathsOf):
+        # (Which only gets gone into as far as `self` goes)
+        paths = eager(paths)
+    if (
+        isinstance(self.paths, Columns)
+        and (extracted_columns := _extract_from_columns(self, paths, must_match_all))
+        is not None
+    ):
+        return extracted_columns
+
+    extracted = [replace(self, paths=frozendict())]
+
+    if must_match_all:
+        if not isinstance(paths, FullPathsOf) and cannot_extract_all(self, paths):
+            # (Nor can any of its single wildcard subtrees)
+            return extracted[0]
+        self = run(_narrowed(self, paths))
 
-    for subtree in single_wildcard_subtrees(self):
+    memo: _Memo = {}
+    for subtree in single_wildcard_subtrees(run(_reached(self, (paths,)))):
         if (
-            single_extracted := _extract_single_wildcards(
-                subtree, paths, must_match_all=must_match_all
-            )
+            single_extracted := run(_extract(subtree, paths, must_match_all, memo))
         ) is not None:
-            extracted = extracted.merge(single_extracted)
+            extracted.append(single_extracted)
 
-    return extracted
+    return merge_all(extracted)
+
+
+type _Memo = dict[tuple[int, int], tuple[Any, Any, Any]]
+"""
+`_extract` results by source and query node, for the nodes that the
+single wildcard subtrees of one source share (most of them). The nodes
+are kept too, so that their ids aren't reused
+"""
 
 
 def _extract_single_wildcards[T](
     source: PathsOf[T], paths: PathsOf[T], *, must_match_all: bool
 ) -> PathsOf[T] | None:
+    return run(_extract(source, paths, must_match_all, {}))
+
+
+def _extract[T](
+    source: PathsOf[T], paths: PathsOf[T], must_match_all: bool, memo: _Memo
+) -> Steps[PathsOf[T] | None]:
+    key = id(source), id(paths)
+    if (memoised := memo.get(key)) is not None:
+        return memoised[2]
+    extracted = yield _extracted(source, paths, must_match_all, memo)
+    memo[key] = source, paths, extracted
+    return extracted
+
+
+def _extracted[T](
+    source: PathsOf[T], paths: PathsOf[T], must_match_all: bool, memo: _Memo
+) -> Steps[PathsOf[T] | None]:
+    """
+    `_extract_single_wildcards`, recursing on an explicit stack (see
+    `stack`)
+    """
     from .. import PathsOf
 
     if not paths:
         return source
 
     if must_match_all:
-        if any(not is_wildcard(key) and key not in source for key in paths):
+        if not isinstance(paths, FullPathsOf) and cannot_extract_all(source, paths):
+            return None
+        if any(key not in source.paths for key in paths._explicit):
             # Revisit for sums?
             # Also is silent omission the way to go about this vs exception?
             # And a complete discrepancy report would be better than giving up
             # part of the way through
             return None
+    elif not source.paths and isinstance(paths, FullPathsOf) and paths.recursive:
+        # Empty trees for all of the keys under here would never end, so
+        # this is as far as they go
+        return source
 
-    extracted_paths_unmerged: dict[PathKey, PathValue] = {}
+    # Wildcards are recombined as they come (`paths` can have multiple,
+    # `source` can't)
+    # TODO probably faster if this happened at the top of the tree only
+    #      but then need a merge_wildcards function
+    extracted_paths: dict[PathKey, PathValue] = {}
+    wc_subpaths = None
     for key, subpaths in paths.items():
         if is_wildcard(key):
-            for source_key, source_subpaths in source.items():
-                extracted = _extract_single_wildcards(
-                    source_subpaths, subpaths, must_match_all=must_match_all
+            # I'm kind of hoping this (explicit `source` keys under a
+            # wildcard) isn't necessary when I get strict about wildcards
+            # only being for collections (and collections only using
+            # wildcards, ...)
+            for source_key, source_subpaths in source._explicit.items():
+                extracted = yield _extract(
+                    source_subpaths, subpaths, must_match_all, memo
+                )
+                if extracted is None:
+                    return None
+                extracted_paths[source_key] = extracted
+            for source_subpaths in source._wildcards.values():
+                extracted = yield _extract(
+                    source_subpaths, subpaths, must_match_all, memo
                 )
                 if extracted is None:
                     return None
-                # I'm kind of hoping this conditional (and for
-                # loop) isn't necessary when I get strict about
-                # wildcards only being for collections (and
-                # collections only using wildcards, ...)
-                if is_wildcard(source_key):
-                    source_key = Wildcard(extracted)
-                extracted_paths_unmerged[source_key] = extracted
+                if wc_subpaths is None:
+                    wc_subpaths = extracted
+                else:
+                    wc_subpaths = wc_subpaths.merge(extracted, merge_wildcards=True)
         else:
-            extracted = _extract_single_wildcards(
+            extracted = yield _extract(
                 source.get(key, PathsOf(source._type_at_key(key))),
                 subpaths,
-                must_match_all=must_match_all,
+                must_match_all,
+                memo,
             )
             if extracted is None:
                 return None
-            extracted_paths_unmerged[key] = extracted
-
-    # Recombine wildcards (`paths` can have multiple, `source` can't)
-    # TODO probably faster if this happened at the top of the tree only
-    #      but then need a merge_wildcards function
-    wc_subpaths = None
-    non_wc_extracted_paths: dict[PathKey, PathValue] = {}
-    for key, subpaths in extracted_paths_unmerged.items():
-        if is_wildcard(key):
-            if wc_subpaths is None:
-                wc_subpaths = subpaths
-            else:
-                wc_subpaths = wc_subpaths.merge(subpaths, merge_wildcards=True)
-        else:
-            non_wc_extracted_paths[key] = subpaths
+            extracted_paths[key] = extracted
 
-    extracted_paths = non_wc_extracted_paths
     if wc_subpaths is not None:
         extracted_paths[Wildcard(wc_subpaths)] = wc_subpaths
 
     return replace(source, paths=frozendict(extracted_paths))
+
+
+def _reached[T](
+    source: PathsOf[T], queries: tuple[PathsOf[T], ...]
+) -> Steps[PathsOf[T]]:
+    """
+    `source` without the branches that none of `queries` go down. They
+    can't make a difference to what's extracted, but do multiply the
+    single wildcard subtrees it's split into. Only goes as far down as
+    there are wildcards
+    """
+    if (
+        not all(queries)
+        or source._summary.deepest_wildcard < 0
+        or isinstance(source.paths, Columns)
+    ):
+        return source
+
+    under_wildcards = tuple(
+        subquery for query in queries for subquery in query._wildcards.values()
+    )
+    children: dict[PathKey, PathValue] = {}
+    changed = False
+    for key, child in source.items():
+        reaching = under_wildcards
+        if not is_wildcard(key):
+            reaching += tuple(
+                query._explicit[key] for query in queries if key in query._explicit
+            )
+        if not reaching:
+            changed = True
+            continue
+        reached = yield _reached(child, reaching)
+        if reached is not child:
+            changed = True
+            if is_wildcard(key):
+                key = Wildcard(reached)
+        children[key] = reached
+
+    return replace(source, paths=frozendict(children)) if changed else source
+
+
+def _narrowed[T](source: PathsOf[T], paths: PathsOf[T]) -> Steps[PathsOf[T]]:
+    """
+    `source` without the `Mapping` items that `paths` asks for particular
+    keys of and that have other keys, looked up in the item index (see
+    `mapping.item_index`) rather than each tried in turn. With
+    `must_match_all` those would only fail
+
+    Goes down `paths`'s explicit keys, and into the items kept when all of
+    them are asked for the same way
+    """
+    children: dict[PathKey, PathValue] | None = None
+    wildcard_queries = tuple(paths._wildcards.values())
+    if (
+        wildcard_queries
+        and is_mapping_type(source.type)
+        and (keys := _pinned_keys(wildcard_queries)) is not None
+    ):
+        index = source.item_index
+        children = dict(source._explicit)
+        for key in keys:
+            for path_key, item in index.items.get(key, ()):
+                if len(wildcard_queries) == 1 and is_wildcard(path_key):
+                    item = yield _narrowed(item, wildcard_queries[0])
+                    path_key = Wildcard(item)
+                children[path_key] = item
+        if source._wildcards and len(children) == len(source._explicit):
+            # Keep one to fail, or this would be a match with no items
+            key, item = next(iter(source._wildcards.items()))
+            children[key] = item
+
+    for key, subpaths in paths._explicit.items():
+        if (child := source.get(key)) is None:
+            continue
+        narrowed = yield _narrowed(child, subpaths)
+        if narrowed is not child:
+            if children is None:
+                children = dict(source.items())
+            children[key] = narrowed
+
+    return source if children is None else replace(source, paths=frozendict(children))
+
+
+def _pinned_keys(queries: tuple[PathsOf[Any], ...]) -> list[Any] | None:
+    """
+    The mapping keys `queries` (of items) ask for, if each asks for one
+    particular leaf key
+    """
+    from .._schema import Kind, schema_of
+
+    keys = []
+    for query in queries:
+        key_query = query.get("key")
+        if (
+            key_query is None
+            or schema_of(key_query.type).kind is not Kind.LEAF
+            or len(key_query) != 1
+        ):
+            return None
+        (key,) = key_query
+        if is_wildcard(key):
+            return None
+        keys.append(key)
+    return keys
+
+
+def _extract_from_columns[T](
+    self: PathsOf[T], paths: PathsOf[T], must_match_all: bool
+) -> PathsOf[T] | None:
+    """
+    `extract` a field at a time, for each distinct value once, when the rows
+    are each their own single wildcard subtree (nothing under them has
+    wildcards) and `paths` just picks fields of rows. `None` when it doesn't
+    """
+    from .. import PathsOf
+    from .._schema import schema_of
+
+    columns = self.paths
+    assert isinstance(columns, Columns)
+
+    if self._summary.deepest_wildcard != 0:
+        return None
+    if not paths:
+        return self
+
+    positions = {name: position for position, name in enumerate(columns.names)}
+    element_schema = schema_of(columns.element_type)
+    queries: list[list[tuple[int, PathsOf[Any], dict[PathsOf[Any], Any]]]] = []
+    for key, query in paths.items():
+        if not is_wildcard(key) or not set(query).issubset(positions):
+            return None
+        queries.append(
+            [(positions[name], subquery, {}) for name, subquery in query.items()]
+        )
+
+    def extract_row(
+        cells: Cells, query: list[tuple[int, PathsOf[Any], dict[PathsOf[Any], Any]]]
+    ) -> Cells | None:
+        if not query:
+            return cells
+        extracted: list[PathsOf[Any] | None] = [None] * len(cells)
+        for position, subquery, memo in query:
+            cell = cells[position]
+            if cell is None:
+                if must_match_all:
+                    return None
+                cell = PathsOf(element_schema.field_type(columns.names[position]))
+            if cell in memo:
+                extracted_cell = memo[cell]
+            else:
+                extracted_cell = memo[cell] = _extract_single_wildcards(
+                    cell, subquery, must_match_all=must_match_all
+                )
+            if extracted_cell is None:
+                return None
+            extracted[position] = extracted_cell
+        return tuple(extracted)
+
+    def extracted_rows() -> Iterator[Cells]:
+        for cells in columns.cells():
+            extracted = [extract_row(cells, query) for query in queries]
+            if any(row is None for row in extracted):
+                continue
+            if len(extracted) == 1:
+                yield extracted[0]
+            else:
+                first, *rest = map(columns.row, extracted)
+                merged = first.merge(*rest, merge_wildcards=True)
+                yield tuple(merged.paths.get(name) for name in columns.names)
+
+    return PathsOf(
+        self.type,
+        paths=Columns.from_rows(columns.element_type, columns.names, extracted_rows()),
+        sequence_length=self.sequence_length,
+    )
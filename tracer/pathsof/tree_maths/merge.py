@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import replace
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from frozendict import frozendict
 
@@ -8,7 +8,15 @@ from frozendict import frozendict
 if TYPE_CHECKING:
     from .. import PathsOf
 
-from ..wildcard import Wildcard, is_wildcard
+from ...stack import Steps, run
+
+from .._interning import is_mapping_type
+from ..children import Children
+from ..columnar import Columns
+from ..full import FullPathsOf, merged_with_full
+from ..lazy import eager
+from ..mapping import merged_index
+from ..wildcard import Wildcard
 
 from .. import PathKey, PathValue
 
@@ -16,6 +24,28 @@ from .. import PathKey, PathValue
 def merge[T](
     self: PathsOf[T], *others: PathsOf[T], merge_wildcards: bool = False
 ) -> PathsOf[T]:
+    trees = (self, *others)
+    if full := next((tree for tree in trees if isinstance(tree, FullPathsOf)), None):
+        return merged_with_full(full, trees, merge_wildcards)
+    return run(_merge(eager(self), tuple(map(eager, others)), merge_wildcards))
+
+
+def merge_all[T](
+    trees: Iterable[PathsOf[T]], *, merge_wildcards: bool = False
+) -> PathsOf[T]:
+    """
+    `merge` of all of `trees` (at least one) at once, each node of the
+    result made the once rather than after every tree, as folding `merge`
+    over them would
+    """
+    first, *rest = trees
+    return merge(first, *rest, merge_wildcards=merge_wildcards)
+
+
+def _merge[T](
+    self: PathsOf[T], others: tuple[PathsOf[T], ...], merge_wildcards: bool
+) -> Steps[PathsOf[T]]:
+    """`merge`, recursing on an explicit stack (see `stack`)"""
     for other in others:
         assert self.type == other.type, f"{self.type} != {other.type}"
 
@@ -38,50 +68,128 @@ def merge[T](
     # Importing properly seems to have inevitable loop
     from .. import PathsOf
 
-    def merge_key(key: PathKey, paths: PathValue):
-        if key in new_explicit_paths:
-            new_explicit_paths[key] = new_explicit_paths[key].merge(
-                paths, merge_wildcards=merge_wildcards
-            )
-        else:
-            new_explicit_paths[key] = paths
+    if not merge_wildcards and (columns := _merged_columns(self, others)) is not None:
+        return PathsOf(self.type, paths=columns, sequence_length=sequence_length)
 
     if merge_wildcards:
-        new_explicit_paths = {
-            key: paths for key, paths in self.items() if not is_wildcard(key)
-        }
-        match [paths for key, paths in self.items() if is_wildcard(key)]:
-            case (wc_subtree,):
-                pass
-            case ():
-                wc_subtree = None
-            case _:
-                raise Exception(
-                    "For `merge_wildcards=True`, the source paths are"
-                    " currently expected to only have one wildcard:\n"
-                    f"{self}"
-                )
-
+        grouped = _grouped(self._explicit.items(), others, explicit_only=True)
+        wildcard_subtrees = list(self._wildcards.values())
+        if len(wildcard_subtrees) > 1:
+            raise Exception(
+                "For `merge_wildcards=True`, the source paths are"
+                " currently expected to only have one wildcard:\n"
+                f"{self}"
+            )
         for other in others:
-            for key, paths in other.items():
-                if is_wildcard(key):
-                    if wc_subtree is not None:
-                        wc_subtree = wc_subtree.merge(paths, merge_wildcards=True)
-                    else:
-                        wc_subtree = paths
-                else:
-                    merge_key(key, paths)
-
-        if wc_subtree is not None:
-            merge_key(Wildcard(wc_subtree), wc_subtree)
+            wildcard_subtrees.extend((yield _collapsed_wildcards(other)))
+        if wildcard_subtrees:
+            first, *rest = wildcard_subtrees
+            wc_subtree = yield _merge(first, tuple(rest), True)
+            grouped.setdefault(Wildcard(wc_subtree), []).append(wc_subtree)
+    elif isinstance(self.paths, Children):
+        # Just the changed keys, the rest is shared with `self`
+        children = self.paths
+        for key, group in _grouped((), others).items():
+            existing = children.get(key)
+            if existing is not None:
+                merged_child = yield _merge(existing, tuple(group), merge_wildcards)
+            elif len(group) > 1:
+                merged_child = yield _merge(group[0], tuple(group[1:]), merge_wildcards)
+            else:
+                merged_child = group[0]
+            children = children.set(key, merged_child)
+        return _indexed(
+            PathsOf(self.type, paths=children, sequence_length=sequence_length),
+            self,
+            others,
+        )
     else:
-        new_explicit_paths = dict(self)
-        for other in others:
-            for key, paths in other.items():
-                merge_key(key, paths)
+        grouped = _grouped(self.items(), others)
 
-    return PathsOf(
+    new_paths: dict[PathKey, PathValue] = {}
+    for key, group in grouped.items():
+        if len(group) > 1:
+            new_paths[key] = yield _merge(group[0], tuple(group[1:]), merge_wildcards)
+        else:
+            new_paths[key] = group[0]
+
+    merged = PathsOf(
         self.type,
-        paths=frozendict(new_explicit_paths),
+        paths=frozendict(new_paths),
         sequence_length=sequence_length,
     )
+    return merged if merge_wildcards else _indexed(merged, self, others)
+
+
+def _grouped[T](
+    first: Iterable[tuple[PathKey, PathValue]],
+    others: tuple[PathsOf[T], ...],
+    *,
+    explicit_only: bool = False,
+) -> dict[PathKey, list[PathValue]]:
+    """
+    The children under each key, in order, so that each merged child is
+    made in one go however many of the trees have it
+    """
+    grouped: dict[PathKey, list[PathValue]] = {}
+    for key, paths in first:
+        grouped[key] = [paths]
+    for other in others:
+        for key, paths in other._explicit.items() if explicit_only else other.items():
+            if (group := grouped.get(key)) is None:
+                grouped[key] = [paths]
+            else:
+                group.append(paths)
+    return grouped
+
+
+def _indexed[T](
+    merged: PathsOf[T], self: PathsOf[T], others: tuple[PathsOf[T], ...]
+) -> PathsOf[T]:
+    """Passes on `self`'s `Mapping` item index (see `mapping.item_index`)"""
+    if is_mapping_type(self.type):
+        return merged_index(merged, self, others)
+    return merged
+
+
+def _merged_columns[T](
+    self: PathsOf[T], others: tuple[PathsOf[T], ...]
+) -> Columns | None:
+    """
+    All the rows, without going through them as nodes, if any of the
+    collections are columnar and all of them could be
+    """
+    template = next(
+        (paths.paths for paths in (self, *others) if isinstance(paths.paths, Columns)),
+        None,
+    )
+    if template is None:
+        return None
+
+    rows = []
+    for paths in (self, *others):
+        if (cells := template.compatible_cells(paths)) is None:
+            return None
+        rows.append(cells)
+
+    return Columns.from_rows(
+        template.element_type, template.names, (cells for row in rows for cells in row)
+    )
+
+
+def _collapsed_wildcards[T](paths: PathsOf[T]) -> Steps[Iterable[PathValue]]:
+    """
+    `paths`' wildcard children, but with the rows of columnar `paths`
+    already merged into one, a field at a time
+    """
+    if not isinstance(columns := paths.paths, Columns):
+        return paths._wildcards.values()
+
+    from .. import PathsOf
+
+    merged: dict[PathKey, PathValue] = {}
+    for name, column in zip(columns.names, columns.columns):
+        cells = [cell for cell in dict.fromkeys(column) if cell is not None]
+        if cells:
+            merged[name] = yield _merge(cells[0], tuple(cells[1:]), True)
+    return (PathsOf(columns.element_type, paths=frozendict(merged)),)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import replace
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 from frozendict import frozendict
 
@@ -8,51 +8,50 @@ from frozendict import frozendict
 if TYPE_CHECKING:
     from .. import PathsOf
 
+from ...stack import Steps, run
 
-def _remove_lowest_level[T](
-    self: PathsOf[T], depth: int = 0
-) -> tuple[PathsOf[T], int] | None:
-    if not self.paths:
-        return None
+from ..children import Children
+
+
+def _truncated[T](self: PathsOf[T], depth: int) -> Steps[PathsOf[T]]:
+    """
+    `self` without anything more than `depth` levels down, sharing the
+    subtrees that don't go that far
+    """
+    if self._summary.depth <= depth:
+        return self
+    if depth == 0:
+        return replace(self, paths=frozendict())
+
+    if isinstance(self.paths, Children):
+        # Just the changed keys, the rest is shared with `self`
+        shared = self.paths
+        for key, child in self.items():
+            if child._summary.depth >= depth:
+                shared = shared.set(key, (yield _truncated(child, depth - 1)))
+        return replace(self, paths=shared)
 
-    reduced = tuple(
-        (key, reduced_child, reduced_child_depth)
-        for key, child in self.items()
-        for reduced_child_pair in (_remove_lowest_level(child, depth + 1),)
-        if reduced_child_pair is not None
-        for reduced_child, reduced_child_depth in (reduced_child_pair,)
-    )
-
-    if not reduced:
-        return replace(self, paths=frozendict()), depth
-
-    reduced_child_keys, reduced_children, reduced_child_depths = zip(*reduced)
-
-    max_reduced_child_depth = max(reduced_child_depths)
-
-    return (
-        replace(
-            self,
-            paths=frozendict(
-                {
-                    **self,
-                    **{
-                        key: reduced_child
-                        for key, reduced_child, reduced_child_depth in zip(
-                            reduced_child_keys, reduced_children, reduced_child_depths
-                        )
-                        if reduced_child_depth == max_reduced_child_depth
-                    },
-                }
-            ),
-        ),
-        max_reduced_child_depth,
-    )
+    children = {}
+    for key, child in self.items():
+        children[key] = yield _truncated(child, depth - 1)
+    return replace(self, paths=frozendict(children))
+
+
+def lowest_levels_removed[T](self: PathsOf[T]) -> Iterator[PathsOf[T]]:
+    """
+    What `remove_lowest_level_or_none` gives over and over until it's
+    `None`, each worked out from `self` directly (the lowest level is
+    always all of the deepest one, so it's `self` cut down to one level
+    less each time) rather than by walking the last one
+    """
+    for depth in reversed(range(self._summary.depth)):
+        yield run(_truncated(self, depth))
 
 
 def remove_lowest_level_or_none[T](self: PathsOf[T]) -> PathsOf[T] | None:
-    removed = _remove_lowest_level(self)
-    return removed[0] if removed else None
+    if not self.paths:
+        return None
+    return run(_truncated(self, self._summary.depth - 1))
 
 
 def remove_lowest_level[T](self: PathsOf[T]) -> PathsOf[T]:
@@ -1,37 +1,127 @@
 from __future__ import annotations
+from bisect import bisect_right
 from dataclasses import replace
-from itertools import product
-from typing import TYPE_CHECKING, Iterator
+from itertools import accumulate
+from math import prod
+from typing import TYPE_CHECKING, Any, Iterator
 
 from frozendict import frozendict
 
 
 if TYPE_CHECKING:
-    from .. import PathsOf
+    from .. import PathsOf, PathKey
 
-from ..wildcard import is_wildcard
+from ...stack import Steps, run
+
+from ..columnar import Columns
+from ..wildcard import Wildcard
 
 
 def single_wildcard_subtrees[T](paths: PathsOf[T]) -> Iterator[PathsOf[T]]:
-    if any(map(is_wildcard, paths)):
-        # Basically if there are any wildcards, we'll also proceed
-        # through the non-wildcard branches one at a time.
-        #
-        # An argument could be made for doing the non-wildcards all
-        # at once, or in contiguous blocks, but this is it for now
-        #
-        # So in presence of wildcards you can't have a mapping
-        # straddling multiple branches (e.g. list elements) (but
-        # without wildcards you can)
-
-        for key, subpaths in paths.items():
-            for subtree in single_wildcard_subtrees(subpaths):
-                yield replace(paths, paths=frozendict({key: subtree}))
+    """
+    One at a time, in the order the nested generators this used to be
+    gave them. What they're made from (`_Choices`) is worked out up front,
+    a node at a time, and each subtree is then made from that by number,
+    so neither takes a frame per level, and there's only ever one of them
+    around unless the caller keeps it
+    """
+    choices = run(_choices(paths))
+    for number in range(choices.count):
+        yield run(_subtree(choices, number))
+
+
+class _Choices:
+    """
+    The single wildcard subtrees of one node, without making them: either
+    one of its children's (a node with wildcards, one child at a time) or
+    one of each of them (without). No `children` is just `paths` itself,
+    unless it has `columns`, which are one row at a time
+    """
+
+    __slots__ = (
+        "paths",
+        "children",
+        "one_of",
+        "columns",
+        "count",
+        "_starts",
+        "_last",
+    )
+
+    def __init__(
+        self,
+        paths: PathsOf[Any],
+        children: tuple[tuple[PathKey, _Choices], ...] = (),
+        *,
+        one_of: bool = False,
+        columns: Columns | None = None,
+    ):
+        self.paths = paths
+        self.children = children
+        self.one_of = one_of
+        self.columns = columns
+        counts = [child.count for __, child in children]
+        if columns is not None:
+            self.count = len(columns)
+        else:
+            self.count = sum(counts) if one_of else prod(counts)
+        self._starts = list(accumulate(counts, initial=0)) if one_of else None
+        # The last one made, which is all that's needed again when they're
+        # made in order (only the last few children change each time)
+        self._last: tuple[int, PathsOf[Any]] | None = None
+
+
+def _choices(paths: PathsOf[Any]) -> Steps[_Choices]:
+    if paths._summary.deepest_wildcard < 0:
+        # Already is one, and however deep it is there's no need to go down
+        # it to find that out
+        return _Choices(paths)
+
+    if isinstance(paths.paths, Columns) and paths._summary.deepest_wildcard == 0:
+        # Nothing under the rows to split up, so they're only made one at a
+        # time, from the cells
+        return _Choices(paths, columns=paths.paths)
+
+    # Basically if there are any wildcards, we'll also proceed through the
+    # non-wildcard branches one at a time.
+    #
+    # An argument could be made for doing the non-wildcards all at once, or
+    # in contiguous blocks, but this is it for now
+    #
+    # So in presence of wildcards you can't have a mapping straddling
+    # multiple branches (e.g. list elements) (but without wildcards you can)
+    children = []
+    for key, subpaths in paths.items():
+        children.append((key, (yield _choices(subpaths))))
+    return _Choices(paths, tuple(children), one_of=bool(paths._wildcards))
+
+
+def _subtree(choices: _Choices, number: int) -> Steps[PathsOf[Any]]:
+    if (columns := choices.columns) is not None:
+        row = columns.row(columns.cells_at(number))
+        return replace(choices.paths, paths=frozendict({Wildcard(row): row}))
+    if not choices.children:
+        return choices.paths
+    if choices._last is not None and choices._last[0] == number:
+        return choices._last[1]
+
+    if choices.one_of:
+        assert choices._starts is not None
+        position = bisect_right(choices._starts, number) - 1
+        key, child = choices.children[position]
+        subtree = yield _subtree(child, number - choices._starts[position])
+        subpaths: dict[PathKey, PathsOf[Any]] = {key: subtree}
     else:
-        for subtrees in product(*map(single_wildcard_subtrees, paths.values())):
-            yield replace(
-                paths,
-                paths=frozendict(
-                    {key: subtree for key, subtree in zip(paths.keys(), subtrees)}
-                ),
-            )
+        # Mixed radix, the last child changing fastest (as with `product`)
+        digits = []
+        remaining = number
+        for __, child in reversed(choices.children):
+            remaining, digit = divmod(remaining, child.count)
+            digits.append(digit)
+        subpaths = {}
+        for (key, child), digit in zip(choices.children, reversed(digits)):
+            subpaths[key] = yield _subtree(child, digit)
+
+    made = replace(choices.paths, paths=frozendict(subpaths))
+    choices._last = number, made
+    return made
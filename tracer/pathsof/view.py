@@ -0,0 +1,214 @@
+"""
+Read-only views of `PathsOf` trees, for looking without building
+
+`extract` and `snip_off` make new trees, which is a waste when all that's
+wanted is a look at a few of their nodes. A `View` is a cursor on a node
+of an existing tree, and `extracting` / `snipping` give views of the tree
+as it would be after those, worked out a node at a time as they're
+navigated (`[key]`, `at`, iterating, `wildcards`). Nothing is made until
+`materialised`.
+
+An `extracting` view is of `extract(query, must_match_all=False)`, except
+that the source's wildcard children are kept apart rather than recombined
+into one (which would mean going through all of them first). For sources
+with at most one wildcard per node that's no difference at all. There's
+no view of `extract(query, must_match_all=True)`: whether anything is
+extracted there depends on the whole of each single wildcard subtree, so
+it can't be worked out a node at a time.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Sequence
+
+from frozendict import frozendict
+
+from ..stack import Steps, run
+
+from .lazy import eager
+from .wildcard import Wildcard, is_wildcard
+
+if TYPE_CHECKING:
+    from . import PathsOf, PathKey
+
+
+class View[T](Mapping["PathKey", "View[Any]"]):
+    __slots__ = ("tree", "_queries", "_snipped")
+
+    tree: PathsOf[T]
+    """The node looked at, as it is in the original tree"""
+    _queries: tuple[PathsOf[T], ...] | None
+    """What's being extracted at this node, `None` for all of it"""
+    _snipped: tuple[tuple[PathKey, ...], ...]
+    """The rest of each `snipping` path that's got this far"""
+
+    def __init__(
+        self,
+        tree: PathsOf[T],
+        queries: tuple[PathsOf[T], ...] | None = None,
+        snipped: tuple[tuple[PathKey, ...], ...] = (),
+    ):
+        self.tree = tree
+        self._queries = queries
+        self._snipped = snipped
+
+    @property
+    def type(self) -> type[T]:
+        return self.tree.type
+
+    def extracting(self, query: PathsOf[T], *, must_match_all: bool = False) -> View[T]:
+        """
+        The view of `extract(query, must_match_all=False)`. `must_match_all`
+        is only there to say no to (see above)
+        """
+        if must_match_all:
+            raise ValueError("Views can't extract with `must_match_all`")
+        if self._queries is not None:
+            raise ValueError("Already extracting")
+        return View(self.tree, (query,) if query else None, self._snipped)
+
+    def snipping(self, path: Sequence[PathKey]) -> View[T]:
+        """The view of `snip_off(path)` (after any `extracting`)"""
+        return View(self.tree, self._queries, (*self._snipped, tuple(path)))
+
+    def _child(self, key: PathKey, subtree: PathsOf[Any]) -> View[Any] | None:
+        """`None` if the view hasn't got it"""
+        queries = None
+        if self._queries is not None:
+            reaching = tuple(
+                subquery
+                for query in self._queries
+                for subquery in query._wildcards.values()
+            )
+            if not is_wildcard(key):
+                reaching += tuple(
+                    query._explicit[key]
+                    for query in self._queries
+                    if key in query._explicit
+                )
+            if not reaching:
+                return None
+            if all(reaching):
+                queries = reaching
+
+        snipped: list[tuple[PathKey, ...]] = []
+        for first, *rest in self._snipped:
+            if is_wildcard(first) or key == first:
+                if not rest:
+                    return None
+                snipped.append(tuple(rest))
+
+        return View(subtree, queries, tuple(snipped))
+
+    def _missing(self) -> Iterator[PathKey]:
+        """
+        Keys being extracted that the tree hasn't got, which `extract` puts
+        empty trees under
+        """
+        if self._queries is None:
+            return
+        seen: set[PathKey] = set()
+        for query in self._queries:
+            for key in query._explicit:
+                if key not in self.tree and key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def items(self) -> Iterator[tuple[PathKey, View[Any]]]:  # type: ignore[override]
+        from . import PathsOf
+
+        for key, subtree in self.tree.items():
+            if (child := self._child(key, subtree)) is not None:
+                yield key, child
+        for key in self._missing():
+            if (
+                child := self._child(key, PathsOf(self.tree._type_at_key(key)))
+            ) is not None:
+                yield key, child
+
+    def __iter__(self) -> Iterator[PathKey]:
+        return (key for key, __ in self.items())
+
+    def __len__(self) -> int:
+        return sum(1 for __ in self.items())
+
+    def __getitem__(self, key: PathKey) -> View[Any]:
+        from . import PathsOf
+
+        if key in self.tree:
+            child = self._child(key, self.tree[key])
+        elif key in set(self._missing()):
+            child = self._child(key, PathsOf(self.tree._type_at_key(key)))
+        else:
+            child = None
+        if child is None:
+            raise KeyError(key)
+        return child
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def at(self, path: Sequence[PathKey]) -> View[Any]:
+        """The view of the node at the end of `path` (no wildcards)"""
+        view: View[Any] = self
+        for key in path:
+            view = view[key]
+        return view
+
+    def wildcards(
+        self, where: Callable[[View[Any]], bool] | None = None
+    ) -> Iterator[View[Any]]:
+        """The children under wildcard keys, just the ones `where` if given"""
+        for key, subtree in self.tree._wildcards.items():
+            if (child := self._child(key, subtree)) is not None and (
+                where is None or where(child)
+            ):
+                yield child
+
+    def materialised(self) -> PathsOf[T]:
+        """
+        The tree the view shows, sharing every node with the original that
+        it doesn't change
+        """
+        return run(_materialised(self))
+
+    def __repr__(self) -> str:
+        return f"View({self.tree!r}, {self._queries!r}, {self._snipped!r})"
+
+
+def _materialised[T](view: View[T]) -> Steps[PathsOf[T]]:
+    from . import PathsOf
+
+    if view._queries is None and not view._snipped:
+        return view.tree
+
+    children: dict[PathKey, PathsOf[Any]] = {}
+    for key, child in view.items():
+        # (Unchanged subtrees of a lazy tree, like `full`, made after all)
+        subtree = eager((yield _materialised(child)))
+        if is_wildcard(key) and view._queries is not None:
+            # The keys are as `extract` leaves them, and `snip_off` after it
+            # keeps them
+            if child._snipped:
+                key = Wildcard(
+                    eager((yield _materialised(View(child.tree, child._queries))))
+                )
+            else:
+                key = Wildcard(subtree)
+        elif is_wildcard(key) and key.subtree is None:
+            # (`full`'s `_`, which is its materialised child's key)
+            key = Wildcard(eager(child.tree))
+        children[key] = subtree
+    return PathsOf(
+        view.tree.type,
+        paths=frozendict(children),
+        sequence_length=view.tree.sequence_length,
+    )
+
+
+@property
+def view[T](self: PathsOf[T]) -> View[T]:
+    return View(self)
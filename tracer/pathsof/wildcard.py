@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
 import sys
 from typing import TYPE_CHECKING, Any, Mapping
 
@@ -10,14 +10,39 @@ else:
 
 from frozendict import frozendict
 
+from ..stack import Steps, run
 
 if TYPE_CHECKING:
     from . import PathsOf, PathKey
 
 
-@dataclass(frozen=True)
+_set = object.__setattr__
+
+
+@dataclass(frozen=True, slots=True, eq=False, init=False)
 class Wildcard:
-    subtree: PathsOf[Any] | None = None
+    """
+    Wildcards with different (not `==`) subtrees are different keys, so
+    different branches. `subtree` is interned, so that's O(1), and the hash
+    is worked out once here as dicts of children ask for it a lot
+    """
+
+    subtree: PathsOf[Any] | None
+    _hash: int = field(init=False, repr=False)
+
+    def __init__(self, subtree: PathsOf[Any] | None = None):
+        _set(self, "subtree", subtree)
+        _set(self, "_hash", hash(subtree))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        return self is other or (
+            type(other) is Wildcard
+            and self._hash == other._hash
+            and (self.subtree is other.subtree or self.subtree == other.subtree)
+        )
 
 
 _ = Wildcard()
@@ -30,9 +55,19 @@ def is_wildcard(x: Any) -> TypeIs[Wildcard]:
 def populate_wildcards(
     paths: Mapping[PathKey, PathsOf[Any]],
 ) -> frozendict[PathKey, PathsOf[Any]]:
+    return run(_populated(paths))
+
+
+def _populated(
+    paths: Mapping[PathKey, PathsOf[Any]],
+) -> Steps[frozendict[PathKey, PathsOf[Any]]]:
     populated: dict[PathKey, PathsOf[Any]] = {}
     for key, subpaths in paths.items():
-        populated_paths = replace(subpaths, paths=populate_wildcards(subpaths))
+        populated_paths = (
+            replace(subpaths, paths=(yield _populated(subpaths)))
+            if subpaths.paths
+            else subpaths
+        )
         populated_key = (
             Wildcard(populated_paths)
             if is_wildcard(key) and key.subtree is None
@@ -0,0 +1,52 @@
+"""
+Recursion over trees on an explicit stack rather than Python's
+
+The recursive tree functions are written as generators ("steps") that
+`yield` each recursive call instead of making it, and get its result sent
+back. `run` keeps the generators on a list, so how deep a tree can be is
+only limited by memory (not `sys.getrecursionlimit()`, or the C stack).
+
+Anything yielded that isn't a generator is taken to be the result already
+and sent straight back, so memo hits, leaves and the like needn't make a
+generator just to return something.
+"""
+
+from __future__ import annotations
+from types import GeneratorType
+from typing import Any, Generator
+
+
+type Steps[R] = Generator[Any, Any, R]
+
+
+def run[R](steps: Steps[R] | R) -> R:
+    """The result of `steps`, recursive calls and all"""
+    if type(steps) is not GeneratorType:
+        return steps  # type: ignore
+
+    stack: list[Steps[Any]] = [steps]
+    value: Any = None
+    error: BaseException | None = None
+    while True:
+        try:
+            if error is None:
+                call = stack[-1].send(value)
+            else:
+                call, error = stack[-1].throw(error), None
+        except StopIteration as done:
+            stack.pop()
+            if not stack:
+                return done.value
+            value = done.value
+        except BaseException as raised:
+            # To the caller, as if it were a normal call
+            stack.pop()
+            if not stack:
+                raise
+            error = raised
+        else:
+            if type(call) is GeneratorType:
+                stack.append(call)
+                value = None
+            else:
+                value = call
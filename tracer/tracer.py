@@ -8,7 +8,10 @@ from frozendict import frozendict
 
 from .cache import cache
 from .pathsof import PathKey, PathsOf
+from .pathsof.full import FullPathsOf
+from .pathsof.lazy import eager
 from .pathsof.mapping import consolidate_mapping_tree
+from .pathsof.tree_maths.merge import merge_all
 from .pathsof.tree_maths.single_wildcard_subtrees import single_wildcard_subtrees
 from .pathsof.wildcard import Wildcard, is_wildcard
 
@@ -25,11 +28,7 @@ def _get_identical_leaf_subtree[T](
         key: (
             (
                 *((selection[key],) if key in selection else ()),
-                *(
-                    subtree
-                    for selection_key, subtree in selection.items()
-                    if is_wildcard(selection_key)
-                ),
+                *selection._wildcards.values(),
             )
             or (PathsOf(selection._type_at_key(key)),)
         )
@@ -61,7 +60,12 @@ def _get_identical_leaf_subtree[T](
 def _place_leaf_subtree[T](
     paths_of_target: PathsOf[T], subtree: PathsOf[Any]
 ) -> PathsOf[T]:
-    """FIXME typecheckinggg"""
+    """
+    FIXME typecheckinggg
+
+    `subtree` is only made eager (see `lazy`) when it goes under something,
+    so a recursive `full` can still be linked from root to root
+    """
     if not paths_of_target:
         return subtree
 
@@ -71,7 +75,7 @@ def _place_leaf_subtree[T](
             {
                 Wildcard(placed_paths) if is_wildcard(key) else key: placed_paths
                 for key, paths in paths_of_target.items()
-                for placed_paths in (_place_leaf_subtree(paths, subtree),)
+                for placed_paths in (eager(_place_leaf_subtree(paths, subtree)),)
             }
         ),
     )
@@ -163,26 +167,25 @@ def _forward_through_multiple[S, T](
     """
 
     def single_subtree_forward(subtree: PathsOf[S]) -> PathsOf[T]:
-        first, *rest = forwards
-        result = first(subtree)
-
-        if _conjunction and not result:
-            return result
-
-        for forward in rest:
+        results = []
+        for forward in forwards:
             forwarded = forward(subtree)
 
             if _conjunction and not forwarded:
                 return forwarded
 
-            result = result.merge(forwarded, merge_wildcards=True)
+            results.append(forwarded)
 
-        return result
+        return merge_all(results, merge_wildcards=True)
 
-    subtrees_iter = single_wildcard_subtrees(paths)
-    result = single_subtree_forward(next(subtrees_iter))
-    for subtree in subtrees_iter:
-        result = result.merge(single_subtree_forward(subtree))
+    # `full` has at most one wildcard per node already, and splitting it
+    # would go through all of it. Anything else lazy is split up whole
+    subtrees = (
+        (paths,)
+        if isinstance(paths, FullPathsOf)
+        else single_wildcard_subtrees(eager(paths))
+    )
+    result = merge_all(map(single_subtree_forward, subtrees))
 
     return consolidate_mapping_tree(result)
 
@@ -250,36 +253,40 @@ class Tracer[S, T]:
         logger.debug(f"Backward again: {s_}")
         assert s_.extends(s), f"{s_} via {t} does not extend {s}"
 
-    def _check_coherence(
-        self,
-        s: PathsOf[S] | None,
-        t0: PathsOf[T],
-        skip_target_check: bool = True,
-    ):
-        if s is None:
-            return
-
-        t = self.forward(s)
+    def _check_coherence(self, s: PathsOf[S], t0: PathsOf[T]):
+        """`t0` being `forward(s)`"""
+        self._check_roundtripping(s, t0)
 
-        if not skip_target_check:
+        for lower in s.lowest_levels_removed():
+            t = self.forward(lower)
             assert t.covers(t0), f"{t} does not cover {t0}"
-
-        self._check_roundtripping(s, t)
-
-        self._check_coherence(s.remove_lowest_level_or_none(), t0, False)
+            self._check_roundtripping(lower, t)
 
     def trace(self, s: PathsOf[S]) -> PathsOf[T]:
         t = self.forward(s)
         if self.fully_specified:
-            self._check_coherence(s, t)
+            if isinstance(s, FullPathsOf) and s.recursive:
+                # The checks go through all of `s`, and there's no end to a
+                # recursive `full`, so they're of it as far as it goes
+                # before repeating itself instead
+                unrolled = s.unrolled
+                self._check_coherence(unrolled, self.forward(unrolled))
+            else:
+                self._check_coherence(s, t)
         return t
 
     def __call__(self, s: S) -> T:
-        # Assumes that result of `trace` is assemblable (should be)
-        return self.trace(PathsOf.an(s)).assembled
+        # Lazily, so `forward` only disassembles as much of `s` as it looks
+        # at. The coherence checks go through all of it
+        lazy = PathsOf(type(s)).lazily(s)
+        t = self.forward(lazy)
+        if self.fully_specified:
+            self._check_coherence(lazy.materialised, t)
+        # Assumes that `t` is assemblable (should be)
+        return t.assembled
 
     @property
-    @cache
+    @cache(per_instance=True)
     def reverse(self):
         return Tracer(
             forward=self.backward,